@@ -0,0 +1,23 @@
+"""BatchLicenseProcessor end-to-end throughput"""
+import logging
+
+from benchmarks.datagen import write_batch_csv
+from encryption.key_management import KeyManager
+from tools.batch_processor import BatchLicenseProcessor
+
+def run(runner, context):
+    logging.getLogger('tools.batch_processor').setLevel(logging.WARNING)
+    csv_path = write_batch_csv(context.work_dir / 'batch.csv', context.licenses, context.seed)
+
+    for key_size in context.key_sizes:
+        key_manager = KeyManager(context.key_dir(key_size))
+        processor = BatchLicenseProcessor(context.work_dir / 'no_config.json',
+                                          context.work_dir / f"batch_out_{key_size}",
+                                          key_manager=key_manager)
+        processor.output_dir.mkdir(parents=True, exist_ok=True)
+
+        for workers in (1, 4):
+            runner.bench('batch.process_csv',
+                         lambda: processor.process_csv(csv_path, max_workers=workers),
+                         {'key_size': key_size, 'licenses': context.licenses, 'workers': workers},
+                         items=context.licenses, iterations=1)
@@ -0,0 +1,11 @@
+"""Host fingerprinting"""
+import logging
+
+from utils.host_identifier import HostIdentifier
+
+def run(runner, context):
+    # Missing tools (udevadm, wmic) log an error on every call
+    logging.getLogger('utils.host_identifier').setLevel(logging.CRITICAL)
+    runner.bench('host.get_host_identifiers', HostIdentifier.get_host_identifiers)
+    runner.bench('host.get_mac_address', HostIdentifier.get_mac_address)
+    runner.bench('host.get_cpu_info', HostIdentifier.get_cpu_info)
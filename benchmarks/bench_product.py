@@ -0,0 +1,28 @@
+"""Product (de)serialization time and memory per product"""
+import random
+import tracemalloc
+
+from benchmarks.datagen import make_products
+from core.product import Product
+
+def run(runner, context):
+    count = max(1000, context.licenses * 50)
+    rng = random.Random(context.seed)
+    data = make_products(rng, count)
+    for entry in data[::2]:
+        entry['expiration_date'] = f"2027-0{rng.randint(1, 9)}-01T00:00:00"
+    params = {'products': count}
+
+    runner.bench('product.from_dict', lambda: [Product.from_dict(entry) for entry in data], params, items=count)
+
+    products = [Product.from_dict(entry) for entry in data]
+
+    runner.bench('product.to_dict', lambda: [product.to_dict() for product in products], params, items=count)
+
+    if runner.selected('product.memory'):
+        del products
+        tracemalloc.start()
+        products = [Product.from_dict(entry) for entry in data]
+        size, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {'product.memory':<58} {size / count:10.1f} bytes/product", flush=True)
@@ -0,0 +1,25 @@
+"""RevocationManager lookups and updates over M revoked licenses"""
+import itertools
+
+from benchmarks.datagen import populate_revocations
+
+def run(runner, context):
+    manager = populate_revocations(context.work_dir / 'revocations.db', context.revocations, context.seed)
+    params = {'revocations': context.revocations}
+
+    # Revoked IDs are the even license numbers, so these alternate hit/miss
+    ids = itertools.cycle(f"LIC{i:07d}" for i in range(0, context.revocations * 2, 7))
+    runner.bench('revocation.is_revoked', lambda: manager.is_revoked(next(ids)), params)
+    runner.bench('revocation.get_revocation_info',
+                 lambda: manager.get_revocation_info(next(ids)), params)
+    runner.bench('revocation.get_revoked_ids', manager.get_revoked_ids, params,
+                 items=context.revocations)
+
+    # Set lookup after one bulk load, as the verification service does
+    revoked = manager.get_revoked_ids()
+    runner.bench('revocation.set_lookup', lambda: next(ids) in revoked, params)
+
+    counter = itertools.count(context.revocations * 2 + 1, 2)
+    runner.bench('revocation.revoke_license',
+                 lambda: manager.revoke_license(f"LIC{next(counter):07d}", 'CUST', 'benchmark'),
+                 params)
@@ -0,0 +1,35 @@
+"""Signing and verification across key sizes and license formats"""
+import copy
+import itertools
+
+from benchmarks.datagen import make_license_data
+from utils.validation import LicenseVerifier
+
+def run(runner, context):
+    licenses = make_license_data(context.licenses, context.seed)
+
+    for key_size in context.key_sizes:
+        signer = context.signer(key_size)
+        signer.warm_up()
+
+        for license_format in ('json', 'binary'):
+            params = {'key_size': key_size, 'format': license_format}
+            data = itertools.cycle(licenses)
+            runner.bench('signing.sign',
+                         lambda: signer.sign_license_data(copy.deepcopy(next(data)), license_format),
+                         params)
+
+            signed = [signer.sign_license_data(copy.deepcopy(license), license_format)
+                      for license in licenses[:50]]
+            raw = itertools.cycle([s.encode('utf-8') if isinstance(s, str) else s for s in signed])
+            runner.bench('signing.verify', lambda: signer.verify_license_bytes(next(raw)), params)
+
+            # Full file verification as launchers do it: new signer, key load, checks
+            path = context.work_dir / f"verify_{key_size}.{license_format}.lic"
+            path.write_bytes(next(raw))
+            public_key = str(context.key_dir(key_size) / 'public_key.pem')
+            runner.bench('signing.verify_license_file',
+                         lambda: LicenseVerifier.verify_license_file(str(path), public_key), params)
+
+        runner.bench('signing.key_load', lambda: context.signer(key_size).warm_up(),
+                     {'key_size': key_size})
@@ -0,0 +1,30 @@
+"""UsageTracker ingestion and report generation over K usage events"""
+import itertools
+
+from benchmarks.datagen import make_usage_events, populate_usage
+
+def run(runner, context):
+    tracker = populate_usage(context.work_dir / 'usage.db', context.usage_events, seed=context.seed)
+    params = {'usage_events': context.usage_events}
+
+    events = itertools.cycle(list(make_usage_events(1000, seed=context.seed + 1)))
+
+    def record():
+        event = next(events)
+        tracker.record_usage(event['license_id'], event['customer_id'], event['product_id'],
+                             event['feature_id'], event['host_info'], event['usage_data'])
+
+    runner.bench('usage.record_usage', record, params)
+
+    def end_session():
+        event = next(events)
+        tracker.end_usage_session(event['license_id'], event['product_id'], event['feature_id'])
+
+    runner.bench('usage.end_usage_session', end_session, params)
+    runner.bench('usage.record_metric',
+                 lambda: tracker.record_metric(next(events)['license_id'], 'cpu_seconds', 1.5), params)
+
+    # 100 licenses share the events, so each report covers ~K/100 sessions
+    license_ids = itertools.cycle(f"LIC{i:07d}" for i in range(100))
+    runner.bench('usage.get_usage_report', lambda: tracker.get_usage_report(next(license_ids)), params,
+                 items=max(1, context.usage_events // 100))
@@ -0,0 +1,58 @@
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from core.key_manager import KeyManager
+from encryption.license_signing import LicenseSigner
+
+@dataclass
+class BenchmarkContext:
+    """Sizes and scratch space shared by all benchmark suites"""
+    licenses: int = 200          # N synthetic licenses
+    revocations: int = 10000     # M revoked licenses
+    usage_events: int = 20000    # K usage events
+    key_sizes: List[int] = field(default_factory=lambda: [2048, 4096])
+    seed: int = 1
+    work_dir: Path = None
+    _key_dirs: Dict[int, Path] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.work_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix='license_bench_')
+            self.work_dir = Path(self._tmp.name)
+
+    def key_dir(self, key_size: int) -> Path:
+        """Directory with a freshly generated key pair of the given size (generated once per run)"""
+        key_dir = self._key_dirs.get(key_size)
+        if key_dir is None:
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.asymmetric import rsa
+            key_dir = self.work_dir / f"keys_{key_size}"
+            key_dir.mkdir(parents=True, exist_ok=True)
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+            (key_dir / 'private_key.pem').write_bytes(private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            ))
+            (key_dir / 'public_key.pem').write_bytes(private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            ))
+            # Key managers look for security settings next to the keys
+            shutil.copy('config/security_settings.json', key_dir / 'security_settings.json')
+            self._key_dirs[key_size] = key_dir
+        return key_dir
+
+    def key_manager(self, key_size: int) -> KeyManager:
+        key_dir = self.key_dir(key_size)
+        return KeyManager(key_dir / 'private_key.pem', key_dir / 'public_key.pem')
+
+    def signer(self, key_size: int) -> LicenseSigner:
+        return LicenseSigner(self.key_manager(key_size))
+
+    def cleanup(self):
+        if getattr(self, '_tmp', None) is not None:
+            self._tmp.cleanup()
@@ -0,0 +1,114 @@
+"""Synthetic data for the benchmarks (deterministic for a given seed)"""
+import csv
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from core.revocation_manager import RevocationManager
+from core.usage_tracker import UsageTracker
+
+LICENSE_TYPES = ['node_locked', 'floating', 'custom_server', 'sql']
+PLATFORMS = ['Windows', 'Linux', 'macOS']
+
+def make_products(rng: random.Random, count: int) -> List[Dict]:
+    """Product dictionaries with a few features each"""
+    return [
+        {
+            'name': f"Product{rng.randrange(1000)}",
+            'version': f"{rng.randint(1, 9)}.{rng.randint(0, 9)}",
+            'quantity': rng.randint(1, 50),
+            'features': [{'name': f"feature_{j}", 'value': 'on', 'quantity': 1, 'enabled': True}
+                         for j in range(rng.randint(1, 5))],
+            'expiration_date': None,
+            'maintenance_date': None
+        }
+        for _ in range(count)
+    ]
+
+def make_license_data(count: int, seed: int = 1) -> List[Dict]:
+    """License data dictionaries shaped like the generators' output"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    licenses = []
+    for i in range(count):
+        licenses.append({
+            'type': rng.choice(LICENSE_TYPES),
+            'license_id': f"LIC{i:07d}",
+            'customer': {
+                'name': f"Customer {i}",
+                'id': f"CUST{i:06d}",
+                'email': f"customer{i}@example.com"
+            },
+            'license': {
+                'license_type': 'Floating License',
+                'expiration_date': (now + timedelta(days=rng.randint(30, 730))).isoformat(),
+                'maintenance_date': (now + timedelta(days=rng.randint(30, 365))).isoformat(),
+                'platforms': rng.sample(PLATFORMS, rng.randint(1, 3))
+            },
+            'products': make_products(rng, rng.randint(1, 4)),
+            'host': {'hostid': 'ANY'}
+        })
+    return licenses
+
+def populate_revocations(db_path: Path, count: int, seed: int = 1) -> RevocationManager:
+    """Revocation database holding count revoked licenses (LIC0000000, LIC0000002, ...)"""
+    manager = RevocationManager(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO revoked_licenses (license_id, customer_id, revocation_date, reason, metadata) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((f"LIC{i * 2:07d}", f"CUST{i * 2:06d}", datetime.now().isoformat(), 'benchmark', '{}')
+             for i in range(count))
+        )
+    return manager
+
+def make_usage_events(count: int, licenses: int = 100, seed: int = 1) -> Iterator[Dict]:
+    """Usage events spread over a number of licenses"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        license_number = rng.randrange(licenses)
+        yield {
+            'license_id': f"LIC{license_number:07d}",
+            'customer_id': f"CUST{license_number:06d}",
+            'product_id': f"Product{rng.randrange(20)}",
+            'feature_id': f"feature_{rng.randrange(5)}",
+            'host_info': {'hostname': f"host{rng.randrange(50)}", 'os': 'Linux'},
+            'usage_data': {'duration': rng.randint(1, 3600), 'seats': rng.randint(1, 10)}
+        }
+
+def populate_usage(db_path: Path, count: int, licenses: int = 100, seed: int = 1) -> UsageTracker:
+    """Usage database holding count events"""
+    tracker = UsageTracker(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO license_usage (license_id, customer_id, product_id, feature_id, start_time, "
+            "host_info, usage_data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((event['license_id'], event['customer_id'], event['product_id'], event['feature_id'],
+              datetime.now().isoformat(), json.dumps(event['host_info']), json.dumps(event['usage_data']))
+             for event in make_usage_events(count, licenses, seed))
+        )
+    return tracker
+
+def write_batch_csv(path: Path, count: int, seed: int = 1) -> Path:
+    """CSV in the format BatchLicenseProcessor.process_csv reads"""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['customer_name', 'customer_id', 'email', 'validity_days',
+                                               'maintenance_days', 'platforms', 'products',
+                                               'license_system'])
+        writer.writeheader()
+        for i in range(count):
+            writer.writerow({
+                'customer_name': f"Customer {i}",
+                'customer_id': f"CUST{i:06d}",
+                'email': f"customer{i}@example.com",
+                'validity_days': 365,
+                'maintenance_days': 90,
+                'platforms': ",".join(rng.sample(PLATFORMS, 2)),
+                'products': json.dumps(make_products(rng, 2)),
+                'license_system': 'nodelock'
+            })
+    return path
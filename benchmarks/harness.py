@@ -0,0 +1,164 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Bump when the result JSON layout changes
+RESULTS_SCHEMA_VERSION = 1
+
+@dataclass
+class BenchmarkResult:
+    """Timing of one benchmark; times are seconds per operation"""
+    name: str
+    params: Dict = field(default_factory=dict)
+    iterations: int = 0
+    rounds: int = 0
+    items_per_op: int = 1
+    min: float = 0.0
+    max: float = 0.0
+    mean: float = 0.0
+    median: float = 0.0
+    stdev: float = 0.0
+    ops_per_sec: float = 0.0
+    items_per_sec: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match results across runs"""
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]" if params else self.name
+
+class Runner:
+    """
+    Minimal benchmark runner
+
+    Each benchmark is calibrated so one round lasts at least min_time, then
+    timed for a number of rounds; statistics are per operation across rounds.
+    """
+
+    def __init__(self, rounds: int = 5, min_time: float = 0.2, name_filter: Optional[str] = None,
+                 quick: bool = False):
+        self.rounds = 2 if quick else rounds
+        self.min_time = 0.02 if quick else min_time
+        self.name_filter = name_filter
+        self.results: List[BenchmarkResult] = []
+
+    def selected(self, name: str) -> bool:
+        return not self.name_filter or self.name_filter in name
+
+    def bench(self, name: str, fn: Callable[[], object], params: Dict = None,
+              items: int = 1, iterations: int = None) -> Optional[BenchmarkResult]:
+        """
+        Time fn()
+
+        Args:
+            name: Benchmark name (dotted, e.g. 'signing.sign')
+            fn: Operation to time
+            params: Parameters identifying this variant (key size, data size...)
+            items: Work items handled per call, for items/s (e.g. licenses per batch)
+            iterations: Fixed calls per round (calibrated when not given)
+        """
+        if not self.selected(name):
+            return None
+
+        fn()  # warm-up
+        if iterations is None:
+            iterations = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    fn()
+                if time.perf_counter() - start >= self.min_time or iterations >= 1_000_000:
+                    break
+                iterations *= 2
+
+        per_op = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            per_op.append((time.perf_counter() - start) / iterations)
+
+        mean = statistics.mean(per_op)
+        result = BenchmarkResult(
+            name=name,
+            params=params or {},
+            iterations=iterations,
+            rounds=self.rounds,
+            items_per_op=items,
+            min=min(per_op),
+            max=max(per_op),
+            mean=mean,
+            median=statistics.median(per_op),
+            stdev=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            ops_per_sec=1 / mean if mean else 0.0,
+            items_per_sec=items / mean if mean else 0.0
+        )
+        self.results.append(result)
+        print(f"  {result.key:<58} {result.median * 1000:10.3f} ms/op "
+              f"{result.items_per_sec:12.1f} items/s", flush=True)
+        return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict:
+    """Machine and code version the results were produced on"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+def write_results(path: Path, results: List[BenchmarkResult], params: Dict):
+    """Write results as JSON"""
+    document = {
+        'schema_version': RESULTS_SCHEMA_VERSION,
+        'environment': environment(),
+        'params': params,
+        'results': [dict(asdict(result), key=result.key) for result in results]
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+def compare(results: List[BenchmarkResult], baseline_path: Path, threshold: float = 0.10) -> int:
+    """
+    Print the change in median time against a previous results file
+
+    Returns:
+        Number of benchmarks slower than the baseline by more than threshold
+    """
+    with open(baseline_path) as f:
+        baseline = {entry['key']: entry for entry in json.load(f)['results']}
+
+    regressions = 0
+    print(f"\nComparison with {baseline_path} (median time, +/-{threshold:.0%} flagged):")
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None or not previous['median']:
+            print(f"  {result.key:<58} (new)")
+            continue
+        change = result.median / previous['median'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  SLOWER'
+            regressions += 1
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"  {result.key:<58} {change:+8.1%}{flag}")
+    return regressions
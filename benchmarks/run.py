@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the license system hot paths
+
+Run from the repository root:
+    python -m benchmarks.run --quick
+    python -m benchmarks.run --output bench.json --compare baseline.json
+"""
+import argparse
+import importlib
+import logging
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.context import BenchmarkContext
+from benchmarks.harness import Runner, compare, write_results
+
+SUITES = ['signing', 'revocation', 'usage', 'batch', 'host', 'product']
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark signing, verification, revocation and usage')
+    parser.add_argument('--licenses', type=int, default=200, help='Synthetic licenses (N)')
+    parser.add_argument('--revocations', type=int, default=10000, help='Revoked licenses (M)')
+    parser.add_argument('--usage-events', type=int, default=20000, help='Usage events (K)')
+    parser.add_argument('--key-sizes', default='2048,4096', help='Comma separated RSA key sizes')
+    parser.add_argument('--suites', default=','.join(SUITES), help='Comma separated suites to run')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per round')
+    parser.add_argument('--quick', action='store_true', help='Small data and short rounds (smoke test)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.quick:
+        args.licenses = min(args.licenses, 20)
+        args.revocations = min(args.revocations, 1000)
+        args.usage_events = min(args.usage_events, 1000)
+
+    context = BenchmarkContext(
+        licenses=args.licenses,
+        revocations=args.revocations,
+        usage_events=args.usage_events,
+        key_sizes=[int(size) for size in args.key_sizes.split(',')],
+        seed=args.seed
+    )
+    runner = Runner(rounds=args.rounds, min_time=args.min_time, name_filter=args.filter, quick=args.quick)
+
+    started = time.time()
+    try:
+        for suite in args.suites.split(','):
+            print(f"[{suite}]", flush=True)
+            module = importlib.import_module(f"benchmarks.bench_{suite}")
+            module.run(runner, context)
+    finally:
+        context.cleanup()
+    print(f"\n{len(runner.results)} benchmarks in {time.time() - started:.1f}s")
+
+    params = {
+        'licenses': args.licenses,
+        'revocations': args.revocations,
+        'usage_events': args.usage_events,
+        'key_sizes': context.key_sizes,
+        'seed': args.seed,
+        'quick': args.quick
+    }
+    if args.output:
+        write_results(Path(args.output), runner.results, params)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(runner.results, Path(args.compare), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,26 +5,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled validators by schema identity (schemas are module-level constants)
+_validators: Dict[int, Any] = {}
+
+# Describes config/config.json as the application writes it. Only "paths" is
+# required (main.py fills it in); security settings live in security_settings.json,
+# so "security" is optional here.
 CONFIG_SCHEMA = {
     "type": "object",
-    "required": ["license_systems", "paths", "security"],
+    "required": ["paths"],
     "properties": {
         "license_systems": {
             "type": "object",
             "patternProperties": {
                 "^[a-zA-Z0-9_]+$": {
                     "type": "object",
-                    "required": ["name", "enabled", "system_type"],
+                    # system_type defaults to "network" when missing (see CommonSettingsDialog)
+                    "required": ["name", "enabled"],
                     "properties": {
                         "name": {"type": "string"},
                         "enabled": {"type": "boolean"},
                         "system_type": {
                             "type": "string",
-                            "enum": ["file", "database", "network"]
+                            "enum": ["file", "database", "network", "custom"]
                         },
                         "install_path": {"type": "string"},
                         "default_port": {"type": "integer"},
                         "description": {"type": "string"},
+                        "license_format": {
+                            "type": "string",
+                            "enum": ["json", "binary"]
+                        },
                         "database_config": {
                             "type": "object",
                             "properties": {
@@ -44,11 +55,18 @@ CONFIG_SCHEMA = {
         },
         "paths": {
             "type": "object",
-            "required": ["config", "keys", "licenses"],
             "properties": {
                 "config": {"type": "string"},
-                "keys": {"type": "string"},
-                "licenses": {"type": "string"}
+                "keys": {
+                    "type": "object",
+                    "properties": {
+                        "private_key_path": {"type": "string"},
+                        "public_key_path": {"type": "string"}
+                    }
+                },
+                "licenses": {"type": "string"},
+                "default_save": {"type": "string"},
+                "customer_base": {"type": "string"}
             }
         },
         "security": {
@@ -74,6 +92,22 @@ CONFIG_SCHEMA = {
     }
 }
 
+def get_validator(schema: Dict[str, Any] = None):
+    """Return a validator for the schema, checking and compiling it only once
+    
+    Args:
+        schema: JSON schema (default: CONFIG_SCHEMA)
+    """
+    schema = CONFIG_SCHEMA if schema is None else schema
+    validator = _validators.get(id(schema))
+    if validator is None:
+        from jsonschema.validators import validator_for
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        _validators[id(schema)] = validator
+    return validator
+
 def validate_config_file(config_path: Path) -> Dict[str, Any]:
     """Validate and load configuration file
     
@@ -90,9 +124,8 @@ def validate_config_file(config_path: Path) -> Dict[str, Any]:
         with open(config_path) as f:
             config = json.load(f)
             
-        # Validate against schema
-        from jsonschema import validate
-        validate(instance=config, schema=CONFIG_SCHEMA)
+        # Validate against schema (validator is compiled once per process)
+        get_validator(CONFIG_SCHEMA).validate(config)
         
         logger.info(f"Configuration validated successfully: {config_path}")
         return config
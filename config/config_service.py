@@ -0,0 +1,190 @@
+from pathlib import Path
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.file_operations import atomic_write
+from utils.file_watcher import FileWatcher
+
+logger = logging.getLogger(__name__)
+
+ConfigCallback = Callable[[Dict[str, Any]], None]
+
+# One service per config file, shared by the GUI and tools in a process
+_services: Dict[Path, 'ConfigService'] = {}
+_services_lock = threading.Lock()
+
+class ConfigService:
+    """
+    Cached access to a JSON configuration file
+
+    The file is parsed (and validated, when a schema is given) once and then
+    served from memory: get() is a plain attribute read. The cache is keyed by
+    the file's mtime and size; refresh() re-reads it only when those changed,
+    and a file watcher (inotify, or polling) calls refresh() so subscribers are
+    notified when the file is edited outside the application.
+    """
+
+    def __init__(self, path: Path, schema: Optional[Dict] = None):
+        """
+        Args:
+            path: JSON configuration file
+            schema: Optional JSON schema; loads and saves are validated against it
+
+        Raises:
+            Exception: If the file exists but can't be parsed or fails validation
+                       (there is no good configuration to fall back on yet)
+        """
+        self.path = Path(path)
+        self.schema = schema
+        self._validator_missing = False
+        self._config: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._subscribers: List[ConfigCallback] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[FileWatcher] = None
+        self._loaded = False
+        self.refresh()
+        self._loaded = True
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _validate(self, config: Dict[str, Any]) -> None:
+        if self.schema is None or self._validator_missing:
+            return
+        from config.config_schema import get_validator
+        try:
+            validator = get_validator(self.schema)
+        except ImportError:
+            # jsonschema is optional; without it the configuration is used unvalidated
+            logger.warning(f"jsonschema is not installed; {self.path} is not validated")
+            self._validator_missing = True
+            return
+        validator.validate(config)
+
+    def get(self) -> Dict[str, Any]:
+        """The current configuration (shared dict - call save() after changing it)"""
+        return self._config
+
+    def refresh(self) -> bool:
+        """
+        Re-read the file if it changed since it was last loaded
+
+        Returns:
+            True if a new configuration was loaded (subscribers have been notified)
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            if stamp is None:
+                config = {}
+            else:
+                try:
+                    with open(self.path, 'r') as f:
+                        config = json.load(f)
+                    self._validate(config)
+                except Exception as e:
+                    logger.error(f"Failed to load configuration {self.path}: {e}")
+                    if not self._loaded:
+                        # Serving {} instead would let the next save() overwrite the user's file
+                        raise
+                    # Keep serving the last good configuration (e.g. file caught mid-edit)
+                    self._stamp = stamp
+                    return False
+            self._config = config
+            self._stamp = stamp
+        if self._loaded:
+            logger.info(f"Configuration reloaded: {self.path}")
+            self._notify(config)
+        return True
+
+    def save(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Validate and write the configuration, then notify subscribers
+
+        Args:
+            config: New configuration; defaults to the (modified) current one
+        """
+        with self._lock:
+            config = self._config if config is None else config
+            self._validate(config)
+            atomic_write(self.path, json.dumps(config, indent=4))
+            self._config = config
+            # Our own write shouldn't come back as an external change
+            self._stamp = self._file_stamp()
+        self._notify(config)
+
+    def mark_written(self, config: Any) -> None:
+        """
+        Record that the application wrote the file itself (e.g. ProductCatalog.export_json),
+        so the watcher doesn't reload it as an outside change
+
+        Args:
+            config: The contents that were written
+        """
+        with self._lock:
+            self._config = config
+            self._stamp = self._file_stamp()
+
+    def subscribe(self, callback: ConfigCallback) -> None:
+        """Call callback(config) after every reload or save (from the thread that saw the change)"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ConfigCallback) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, config: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(config)
+            except Exception as e:
+                logger.error(f"Configuration subscriber failed: {e}")
+
+    def start_watching(self, interval: float = 1.0) -> None:
+        """
+        Reload the file when it changes, from a background thread
+
+        Args:
+            interval: Poll interval in seconds where inotify is unavailable
+        """
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = FileWatcher([self.path], lambda changed: self.refresh(), poll_interval=interval)
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+def get_config_service(path: Path = Path('config/config.json'),
+                       schema: Optional[Dict] = None) -> ConfigService:
+    """Return the shared ConfigService for a file, creating it on first use
+
+    Raises:
+        Exception: If the file can't be loaded the first time (see ConfigService)
+    """
+    key = Path(path).resolve()
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = ConfigService(path, schema)
+            _services[key] = service
+        elif schema is not None and service.schema is None:
+            # Created without a schema by an earlier caller; validate from now on
+            service.schema = schema
+        return service
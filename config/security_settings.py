@@ -28,6 +28,12 @@ DEFAULT_SECURITY_SETTINGS = {
         'enforce_key_length': True,
         'minimum_key_length': 2048,
         'require_password': False
+    },
+    # Background pool of pre-generated keys used by key generation (see encryption/key_pool.py)
+    'key_pool': {
+        'enabled': False,
+        'directory': 'config/keys/pool',
+        'size': 4
     }
 }
 
@@ -0,0 +1,132 @@
+# Standard library imports
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import copy
+import logging
+
+# Local imports
+from .license_generator import LicenseGeneratorFactory
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CatalogDiff:
+    """Entries added, removed and changed between two versions of a catalog section"""
+    added: Dict[Any, Dict] = field(default_factory=dict)
+    removed: Dict[Any, Dict] = field(default_factory=dict)
+    changed: Dict[Any, Dict] = field(default_factory=dict)  # key -> new entry
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return f"+{len(self.added)} -{len(self.removed)} ~{len(self.changed)}"
+
+@dataclass
+class CatalogChange:
+    """Differences in products and license systems after a configuration reload"""
+    products: CatalogDiff = field(default_factory=CatalogDiff)
+    license_systems: CatalogDiff = field(default_factory=CatalogDiff)
+
+    def __bool__(self) -> bool:
+        return bool(self.products or self.license_systems)
+
+def product_key(product: Dict) -> Tuple[str, str]:
+    """Identity of a product entry: the same name may exist in several versions"""
+    return (product.get('name', ''), str(product.get('version', '')))
+
+def index_products(products: Optional[Iterable[Dict]]) -> Dict[Tuple[str, str], Dict]:
+    """Products keyed by product_key (later duplicates win)"""
+    if not isinstance(products, list):
+        return {}
+    return {product_key(product): product for product in products if isinstance(product, dict)}
+
+def diff_entries(old: Dict[Any, Dict], new: Dict[Any, Dict]) -> CatalogDiff:
+    """Compare two keyed catalogs"""
+    diff = CatalogDiff()
+    for key, entry in new.items():
+        if key not in old:
+            diff.added[key] = entry
+        elif old[key] != entry:
+            diff.changed[key] = entry
+    for key, entry in old.items():
+        if key not in new:
+            diff.removed[key] = entry
+    return diff
+
+def apply_license_systems_to_factory(diff: CatalogDiff) -> None:
+    """Update LicenseGeneratorFactory's per-system license formats for changed systems only"""
+    for system_id, system in {**diff.added, **diff.changed}.items():
+        try:
+            LicenseGeneratorFactory.set_license_format(system_id, system.get('license_format', 'json'))
+        except ValueError as e:
+            logger.error(f"License system {system_id}: {e}")
+    for system_id in diff.removed:
+        LicenseGeneratorFactory.remove_license_format(system_id)
+
+class CatalogWatcher:
+    """
+    Turns reloads of config.json and products.json into product / license system diffs
+
+    Subscribes to the two ConfigServices (which watch their files) and keeps a
+    snapshot of the last seen catalog; each reload is compared against it and
+    subscribers get a CatalogChange with only the entries that differ, so they
+    can update in place instead of rebuilding everything.
+    """
+
+    def __init__(self, config_service, products_service=None, update_factory: bool = True):
+        """
+        Args:
+            config_service: ConfigService for config.json (its 'license_systems' section)
+            products_service: ConfigService for products.json (a list of products)
+            update_factory: Apply license system changes to LicenseGeneratorFactory
+        """
+        self.config_service = config_service
+        self.products_service = products_service
+        self._subscribers: List[Callable[[CatalogChange], None]] = []
+        self._systems = copy.deepcopy(config_service.get().get('license_systems', {}))
+        self._products = copy.deepcopy(index_products(products_service.get() if products_service else None))
+        if update_factory:
+            self.subscribe(lambda change: apply_license_systems_to_factory(change.license_systems))
+        config_service.subscribe(self._on_config)
+        if products_service is not None:
+            products_service.subscribe(self._on_products)
+
+    def subscribe(self, callback: Callable[[CatalogChange], None]) -> None:
+        """Call callback(change) whenever products or license systems change"""
+        self._subscribers.append(callback)
+
+    def start(self) -> None:
+        """Start watching both files"""
+        self.config_service.start_watching()
+        if self.products_service is not None:
+            self.products_service.start_watching()
+
+    def stop(self) -> None:
+        self.config_service.stop_watching()
+        if self.products_service is not None:
+            self.products_service.stop_watching()
+
+    def _on_config(self, config: Dict) -> None:
+        systems = config.get('license_systems', {}) if isinstance(config, dict) else {}
+        diff = diff_entries(self._systems, systems)
+        self._systems = copy.deepcopy(systems)
+        self._publish(CatalogChange(license_systems=diff))
+
+    def _on_products(self, products) -> None:
+        indexed = index_products(products)
+        diff = diff_entries(self._products, indexed)
+        self._products = copy.deepcopy(indexed)
+        self._publish(CatalogChange(products=diff))
+
+    def _publish(self, change: CatalogChange) -> None:
+        if not change:
+            return
+        logger.info(f"Catalog changed: products {change.products.summary()}, "
+                    f"license systems {change.license_systems.summary()}")
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"Catalog subscriber failed: {e}")
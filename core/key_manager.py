@@ -1,5 +1,3 @@
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
 from pathlib import Path
 import logging
 
@@ -20,6 +18,9 @@ class KeyManager:
         if not self.private_key_path:
             raise ValueError("Private key path is not set")
         
+        # Imported on first use so the GUI doesn't load cryptography at startup
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.backends import default_backend
         try:
             with open(self.private_key_path, 'rb') as key_file:
                 private_key = serialization.load_pem_private_key(
@@ -38,6 +39,8 @@ class KeyManager:
         if not self.public_key_path:
             raise ValueError("Public key path is not set")
         
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.backends import default_backend
         try:
             with open(self.public_key_path, 'rb') as key_file:
                 public_key = serialization.load_pem_public_key(
@@ -52,6 +55,8 @@ class KeyManager:
 
     def validate_key(self, key_path: Path) -> bool:
         """Validate a key file"""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.backends import default_backend
         try:
             with open(key_path, 'rb') as key_file:
                 key_data = key_file.read()
@@ -1,6 +1,6 @@
 # Standard library imports
 from datetime import datetime
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 import json
 import logging
@@ -9,6 +9,8 @@ from enum import Enum
 # Local imports
 from .product import Product
 from encryption.license_signing import LicenseSigner
+from encryption.license_format import LICENSE_FORMATS
+from utils import tracing
 from config.license_systems import DatabaseConfig
 
 # Configure logger for this module
@@ -28,11 +30,45 @@ class LicenseType(Enum):
 class LicenseGeneratorFactory:
     """Factory to create appropriate license generator based on type"""
     
-    @staticmethod
-    def create_generator(license_type: Union[str, LicenseType], signer: LicenseSigner) -> 'BaseLicenseGenerator':
+    # License file format per license system ('json' or 'binary'); systems not listed use 'json'
+    license_formats: Dict[str, str] = {}
+    
+    @classmethod
+    def set_license_format(cls, license_system: str, license_format: str) -> None:
+        """Select the license file format written for a license system"""
+        if license_format not in LICENSE_FORMATS:
+            raise ValueError(f"Unsupported license format: {license_format}")
+        cls.license_formats[license_system.lower()] = license_format
+    
+    @classmethod
+    def remove_license_format(cls, license_system: str) -> None:
+        """Forget the format of a license system that is no longer configured"""
+        cls.license_formats.pop(license_system.lower(), None)
+    
+    @classmethod
+    def load_license_formats(cls, license_systems: Dict[str, Dict]) -> None:
+        """Read the optional 'license_format' of each configured license system"""
+        for system_id, system in license_systems.items():
+            cls.set_license_format(system_id, system.get('license_format', 'json'))
+    
+    @classmethod
+    def get_license_format(cls, license_type: Union[str, LicenseType]) -> str:
+        """Return the license file format for a license system"""
+        if isinstance(license_type, str):
+            return cls.license_formats.get(license_type.lower(), 'json')
+        return 'json'
+    
+    @classmethod
+    def create_generator(cls, license_type: Union[str, LicenseType], signer: LicenseSigner,
+                         license_format: Optional[str] = None) -> 'BaseLicenseGenerator':
         """
         Create appropriate generator based on license system type
         Supports both string-based types and LicenseType enum
+        
+        Args:
+            license_type: License system ID or LicenseType
+            signer: Signer used by the generator
+            license_format: 'json' or 'binary'; defaults to the format configured for the system
         """
         # Map both enum types and string IDs to generators
         generator_map = {
@@ -62,15 +98,16 @@ class LicenseGeneratorFactory:
             
         generator_class = generator_map.get(license_type)
         if generator_class:
-            return generator_class(signer)
+            return generator_class(signer, license_format or cls.get_license_format(license_type))
         else:
             raise ValueError(f"Unsupported license system: {license_type}")
 
 class BaseLicenseGenerator:
     """Base class for all license generators"""
     
-    def __init__(self, signer: LicenseSigner):
+    def __init__(self, signer: LicenseSigner, license_format: str = 'json'):
         self.signer = signer
+        self.license_format = license_format
     
     def generate_license(self, customer_info: Dict, license_info: Dict, 
                         products: List[Product], host_info: Dict) -> str:
@@ -88,12 +125,18 @@ class BaseLicenseGenerator:
         if not all(field in license_info for field in required_license_fields):
             raise ValueError("Missing required license information")
         
-        return self._generate_specific_license(customer_info, license_info, products, host_info)
+        with tracing.span('license.generate', generator=type(self).__name__,
+                          customer_id=customer_info['id'], products=len(products)):
+            return self._generate_specific_license(customer_info, license_info, products, host_info)
     
     def _generate_specific_license(self, customer_info: Dict, license_info: Dict, 
                                  products: List[Product], host_info: Dict) -> str:
         """To be implemented by specific generators"""
         raise NotImplementedError()
+    
+    def _sign(self, license_data: Dict) -> Union[str, bytes]:
+        """Sign license data in this generator's license format"""
+        return self.signer.sign_license_data(license_data, license_format=self.license_format)
 
 class FlexLMGenerator(BaseLicenseGenerator):
     def _generate_specific_license(self, customer_info: Dict, license_info: Dict, 
@@ -142,7 +185,7 @@ class CustomServerGenerator(BaseLicenseGenerator):
             "products": [p.to_dict() for p in products],
             "host": host_info
         }
-        return self.signer.sign_license_data(license_data)
+        return self._sign(license_data)
 
 class NodeLockedGenerator(BaseLicenseGenerator):
     def _generate_specific_license(self, customer_info: Dict, license_info: Dict, 
@@ -155,7 +198,7 @@ class NodeLockedGenerator(BaseLicenseGenerator):
             "host": host_info,
             "machine_id": host_info.get('machine_id', '')
         }
-        return self.signer.sign_license_data(license_data)
+        return self._sign(license_data)
 
 class FloatingLicenseGenerator(BaseLicenseGenerator):
     def _generate_specific_license(self, customer_info: Dict, license_info: Dict, 
@@ -168,7 +211,7 @@ class FloatingLicenseGenerator(BaseLicenseGenerator):
             "host": host_info,
             "concurrent_users": license_info.get('concurrent_users', 1)
         }
-        return self.signer.sign_license_data(license_data)
+        return self._sign(license_data)
 
 # Add other generator implementations After Matt shows me how to do it
 
@@ -185,7 +228,7 @@ class SQLLicenseGenerator(BaseLicenseGenerator):
             "host": host_info,
             "database_config": license_info.get('database_config', {})
         }
-        return self.signer.sign_license_data(license_data)
+        return self._sign(license_data)
 
     def save_license(self, license_data: str, db_config: DatabaseConfig):
         """Save license to SQL database"""
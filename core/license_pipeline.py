@@ -0,0 +1,114 @@
+# Standard library imports
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import contextvars
+import time
+import logging
+
+# Local imports
+from .product import Product
+from .license_generator import LicenseGeneratorFactory
+from encryption.license_signing import LicenseSigner
+from utils import tracing
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+@dataclass
+class LicenseJob:
+    """A single license to generate: everything the generator needs, with no GUI state"""
+    license_system: str
+    customer_info: Dict
+    license_info: Dict
+    products: List[Product]
+    host_info: Dict = field(default_factory=dict)
+    job_id: str = ''
+
+@dataclass
+class JobResult:
+    """Outcome of processing a LicenseJob"""
+    job: LicenseJob
+    success: bool
+    output_path: Optional[Path] = None
+    error: str = ''
+    elapsed: float = 0.0
+
+class LicensePipeline:
+    """
+    Generates, signs and saves licenses using one shared, warm signer.
+    Used by the GUI generation queue and the batch processor.
+    """
+
+    def __init__(self, signer: LicenseSigner, saver: Callable[[LicenseJob, Union[str, bytes]], Path]):
+        """
+        Args:
+            signer: Signer shared by all jobs (its keys are loaded once)
+            saver: Callable that persists the signed license for a job and returns its path
+        """
+        self.signer = signer
+        self.saver = saver
+        # Generators are stateless apart from the signer, so one per system is enough
+        self._generators = {}
+
+    def warm_up(self) -> None:
+        """Load the signing key before the first job"""
+        self.signer.warm_up()
+
+    def _get_generator(self, license_system: str):
+        # Keyed by format too, so a changed per-system license format takes effect
+        key = (license_system, LicenseGeneratorFactory.get_license_format(license_system))
+        generator = self._generators.get(key)
+        if generator is None:
+            generator = LicenseGeneratorFactory.create_generator(license_system, self.signer)
+            self._generators[key] = generator
+        return generator
+
+    def generate(self, job: LicenseJob) -> Union[str, bytes]:
+        """Generate and sign the license for a job without saving it"""
+        generator = self._get_generator(job.license_system)
+        return generator.generate_license(
+            job.customer_info,
+            job.license_info,
+            job.products,
+            job.host_info
+        )
+
+    def process(self, job: LicenseJob) -> JobResult:
+        """Generate, sign and save a single job; errors are captured in the result"""
+        start = time.perf_counter()
+        try:
+            with tracing.span('pipeline.job', job_id=job.job_id, license_system=job.license_system):
+                license_data = self.generate(job)
+                output_path = self.saver(job, license_data)
+            return JobResult(job, True, output_path, elapsed=time.perf_counter() - start)
+        except Exception as e:
+            logger.error(f"Failed to process license job {job.job_id or job.customer_info.get('id')}: {e}")
+            return JobResult(job, False, error=str(e), elapsed=time.perf_counter() - start)
+
+    def process_many(self, jobs: Iterable[LicenseJob], max_workers: int = 4,
+                     max_pending: Optional[int] = None) -> Iterator[JobResult]:
+        """
+        Process jobs concurrently, yielding results as they complete
+
+        Jobs are taken from the iterable as workers free up, so a generator of
+        any length (e.g. customers streamed from a file) is never held in memory.
+
+        Args:
+            jobs: Jobs to process
+            max_workers: Number of worker threads
+            max_pending: Jobs submitted but not yet finished (default: 4 per worker)
+        """
+        max_pending = max_pending or max_workers * 4
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for job in jobs:
+                # Each job runs in a copy of the caller's context so its spans nest under the caller's span
+                pending.add(executor.submit(contextvars.copy_context().run, self.process, job))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
@@ -1,9 +1,17 @@
 # Standard library imports for data structures and typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime
+import sys
 
-@dataclass
+# Catalogs repeat the same few dates (release/maintenance cut-offs) across many
+# products; datetimes are immutable, so parsed values can be shared
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+@dataclass(slots=True)
 class ProductFeature:
     """Represents a feature or capability of a software product"""
     name: str        # Name of the feature
@@ -11,6 +19,11 @@ class ProductFeature:
     quantity: int = 1    # Number of instances/licenses for this feature
     enabled: bool = True # Whether the feature is currently enabled
 
+    def __post_init__(self):
+        # The same few feature names appear in every product - share one string each
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+
     def enable(self):
         """Enable the feature"""
         self.enabled = True
@@ -19,10 +32,27 @@ class ProductFeature:
         """Disable the feature"""
         self.enabled = False
 
-@dataclass
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "value": self.value,
+            "quantity": self.quantity,
+            "enabled": self.enabled
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProductFeature':
+        return cls(data["name"], data["value"], data.get("quantity", 1), data.get("enabled", True))
+
+@dataclass(slots=True)
 class Product:
     """
     Represents a software product with its features and licensing information
+
+    Slotted (no per-instance __dict__) since the batch processor and license
+    indexes hold very many of these. to_dict() builds a new dict on every call
+    (products and their features are mutable); only the ISO date strings are
+    cached, for as long as the date fields hold the same datetime objects.
     """
     name: str        # Name of the product
     version: str     # Version string of the product
@@ -31,6 +61,7 @@ class Product:
     expiration_date: Optional[datetime] = None     # When the product license expires
     maintenance_date: Optional[datetime] = None    # When maintenance support ends
     enabled: bool = False  # Whether the product is currently enabled
+    _dates: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)  # Cached ISO dates
 
     def enable(self):
         """Enable the product and its features"""
@@ -47,47 +78,46 @@ class Product:
     def to_dict(self) -> Dict:
         """
         Convert product to dictionary format for serialization
-        
+
         Returns:
             Dict containing all product information in a serializable format
         """
+        # (expiration, maintenance, expiration ISO, maintenance ISO) - reformatted
+        # only when a date field is assigned a different datetime
+        dates = self._dates
+        if dates is None or dates[0] is not self.expiration_date or dates[1] is not self.maintenance_date:
+            expiration, maintenance = self.expiration_date, self.maintenance_date
+            dates = self._dates = (expiration, maintenance,
+                                   expiration.isoformat() if expiration else None,
+                                   maintenance.isoformat() if maintenance else None)
         return {
             "name": self.name,
             "version": self.version,
             "quantity": self.quantity,
-            "features": [
-                {
-                    "name": f.name,
-                    "value": f.value,
-                    "quantity": f.quantity,
-                    "enabled": f.enabled
-                }
-                for f in self.features
-            ],
-            "expiration_date": self.expiration_date.isoformat() if self.expiration_date else None,
-            "maintenance_date": self.maintenance_date.isoformat() if self.maintenance_date else None
+            "features": [f.to_dict() for f in self.features],
+            "expiration_date": dates[2],
+            "maintenance_date": dates[3]
         }
-    
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'Product':
         """
         Create product instance from dictionary format
-        
+
         Args:
             data: Dictionary containing product information
-            
+
         Returns:
             New Product instance with data from dictionary
         """
-        features = [
-            ProductFeature(**f) for f in data.get("features", [])
-        ]
-        
+        feature_from_dict = ProductFeature.from_dict
+        expiration = data.get("expiration_date")
+        maintenance = data.get("maintenance_date")
         return cls(
-            name=data["name"],
-            version=data["version"],
-            features=features,
-            quantity=data.get("quantity", 1),
-            expiration_date=datetime.fromisoformat(data["expiration_date"]) if data.get("expiration_date") else None,
-            maintenance_date=datetime.fromisoformat(data["maintenance_date"]) if data.get("maintenance_date") else None
+            data["name"],
+            data["version"],
+            [feature_from_dict(f) for f in data.get("features", ())],
+            data.get("quantity", 1),
+            _parse_date(expiration) if expiration else None,
+            _parse_date(maintenance) if maintenance else None
         )
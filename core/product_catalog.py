@@ -0,0 +1,281 @@
+# Standard library imports
+from pathlib import Path
+import copy
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+# Local imports
+from .product import Product
+from .catalog import CatalogDiff, diff_entries, index_products, product_key
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+ProductKey = Tuple[str, str]
+
+class ProductCatalog:
+    """
+    Product catalog stored in SQLite, one row per (name, version)
+
+    All rows are read once into an in-memory index, so lookups by name and
+    version are dictionary reads. Changes are written per product (only the
+    rows that changed), and Product objects are built once per product and
+    cached until that product changes. Cached Products are shared - treat
+    them as read-only.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the catalog
+        Args:
+            db_path: Path to the SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._index: Dict[ProductKey, Dict] = {}
+        self._products: Dict[ProductKey, Product] = {}
+        self.init_db()
+        self._load()
+
+    def init_db(self):
+        """Initialize the catalog database with required tables"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    name TEXT NOT NULL,       -- Product name
+                    version TEXT NOT NULL,    -- Product version (as text)
+                    position INTEGER,         -- Display order
+                    data TEXT NOT NULL,       -- Product dictionary as JSON
+                    updated TEXT,             -- When the row was last written
+                    PRIMARY KEY (name, version)
+                )
+            """)
+            # products.json as the catalog last imported or exported it, so edits
+            # made to the file while the application was closed can be diffed
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS json_sync (
+                    path TEXT PRIMARY KEY,    -- products.json file (resolved path)
+                    mtime_ns INTEGER,         -- File modification time when last synced
+                    size INTEGER,             -- File size when last synced
+                    data TEXT NOT NULL        -- Product list as last synced
+                )
+            """)
+
+    def _load(self):
+        """Read every product into the in-memory index (once, at startup)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("SELECT name, version, data FROM products ORDER BY position, rowid")
+            self._index = {(name, version): json.loads(data) for name, version, data in cursor}
+        logger.info(f"Loaded {len(self._index)} products from {self.db_path}")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: ProductKey) -> bool:
+        return key in self._index
+
+    # Lookups
+
+    def get_data(self, name: str, version: str) -> Optional[Dict]:
+        """Product dictionary for a name and version, or None"""
+        return self._index.get((name, str(version)))
+
+    def get(self, name: str, version: str) -> Optional[Product]:
+        """Product for a name and version (cached), or None"""
+        key = (name, str(version))
+        product = self._products.get(key)
+        if product is None:
+            data = self._index.get(key)
+            if data is None:
+                return None
+            product = Product.from_dict(data)
+            self._products[key] = product
+        return product
+
+    def find(self, name: str) -> List[Product]:
+        """All versions of a product"""
+        return [self.get(*key) for key in self._index if key[0] == name]
+
+    def product_for(self, data: Dict) -> Product:
+        """Cached Product for a product dictionary, if it matches the catalog; otherwise a new one"""
+        key = product_key(data)
+        if self._index.get(key) == data:
+            return self.get(*key)
+        return Product.from_dict(data)
+
+    def all_data(self) -> List[Dict]:
+        """Copies of all product dictionaries in catalog order (safe to edit)"""
+        return copy.deepcopy(list(self._index.values()))
+
+    def all_products(self) -> List[Product]:
+        return [self.get(*key) for key in self._index]
+
+    # Changes - each writes only the affected rows
+
+    def upsert(self, product_data: Dict):
+        """Add or replace a single product"""
+        self.upsert_many([product_data])
+
+    def upsert_many(self, products: Iterable[Dict]):
+        """Add or replace products in one transaction"""
+        # Keep private copies so later edits to the caller's dicts show up as changes
+        products = copy.deepcopy(list(products))
+        if not products:
+            return
+        now = datetime.now().isoformat()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            position = len(self._index)
+            rows = []
+            for data in products:
+                key = product_key(data)
+                if key not in self._index:
+                    position += 1
+                rows.append((key[0], key[1], position, json.dumps(data), now))
+            conn.executemany(
+                "INSERT INTO products (name, version, position, data, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name, version) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                rows
+            )
+            for data in products:
+                key = product_key(data)
+                self._index[key] = data
+                self._products.pop(key, None)
+
+    def remove(self, name: str, version: str):
+        """Remove a single product"""
+        self.remove_many([(name, str(version))])
+
+    def remove_many(self, keys: Iterable[ProductKey]):
+        """Remove products in one transaction"""
+        keys = [key for key in keys if key in self._index]
+        if not keys:
+            return
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany("DELETE FROM products WHERE name = ? AND version = ?", keys)
+            for key in keys:
+                self._index.pop(key, None)
+                self._products.pop(key, None)
+
+    def apply_diff(self, diff: CatalogDiff):
+        """Apply a CatalogDiff of products (e.g. from a products.json hot reload)"""
+        with self._lock:
+            self.upsert_many(list(diff.added.values()) + list(diff.changed.values()))
+            self.remove_many(diff.removed.keys())
+
+    def apply_changed(self, products: List[Dict], keys: Iterable[ProductKey]) -> CatalogDiff:
+        """
+        Write only the given products from a full product list (e.g. the ones
+        edited in the product manager); a key missing from the list is removed
+
+        Args:
+            products: The full product list
+            keys: (name, version) keys of the products that were added, edited or deleted
+
+        Returns:
+            The differences that were written
+        """
+        keys = set(keys)
+        if not keys:
+            return CatalogDiff()
+        latest = {}
+        for product in products:
+            key = product_key(product)
+            if key in keys:
+                latest[key] = product  # Later duplicates win, as in index_products
+        with self._lock:
+            diff = diff_entries({key: self._index[key] for key in keys if key in self._index}, latest)
+            self.apply_diff(diff)
+        if diff:
+            logger.info(f"Product catalog updated: {diff.summary()}")
+        return diff
+
+    def apply_products(self, products: List[Dict]) -> CatalogDiff:
+        """
+        Make the catalog match a full product list, writing only what differs
+
+        Returns:
+            The differences that were written
+        """
+        with self._lock:
+            diff = diff_entries(self._index, index_products(products))
+            self.apply_diff(diff)
+        if diff:
+            logger.info(f"Product catalog updated: {diff.summary()}")
+        return diff
+
+    # products.json import / export
+
+    def _synced_json(self, json_path: Path) -> Optional[Tuple[int, int, str]]:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT mtime_ns, size, data FROM json_sync WHERE path = ?",
+                                (str(Path(json_path).resolve()),)).fetchone()
+
+    def record_json_sync(self, json_path: Path, products: List[Dict], content: str = None):
+        """
+        Remember the products.json contents the catalog is now in step with
+
+        Args:
+            json_path: products.json path
+            products: The product list in the file
+            content: The file's JSON text, if already serialized
+        """
+        json_path = Path(json_path)
+        try:
+            stat = json_path.stat()
+        except FileNotFoundError:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO json_sync (path, mtime_ns, size, data) VALUES (?, ?, ?, ?)",
+                (str(json_path.resolve()), stat.st_mtime_ns, stat.st_size,
+                 content if content is not None else json.dumps(products))
+            )
+
+    def sync_from_json(self, json_path: Path, products: List[Dict]) -> CatalogDiff:
+        """
+        Apply edits made to products.json since the catalog last synced with it
+
+        Only products that differ from the last imported or exported version of
+        the file are written, so products edited in the application since then
+        are kept. A file the catalog has never synced with is applied as a whole.
+
+        Args:
+            json_path: products.json path (for its modification time)
+            products: The parsed product list from the file
+
+        Returns:
+            The differences that were written
+        """
+        json_path = Path(json_path)
+        if not isinstance(products, list) or not json_path.exists():
+            return CatalogDiff()
+        synced = self._synced_json(json_path)
+        stat = json_path.stat()
+        if synced is not None and (synced[0], synced[1]) == (stat.st_mtime_ns, stat.st_size):
+            return CatalogDiff()
+
+        if synced is None:
+            diff = self.apply_products(products)
+        else:
+            with self._lock:
+                diff = diff_entries(index_products(json.loads(synced[2])), index_products(products))
+                self.apply_diff(diff)
+            if diff:
+                logger.info(f"Applied edits to {json_path}: {diff.summary()}")
+        self.record_json_sync(json_path, products)
+        return diff
+
+    def export_json(self, json_path: Path) -> Path:
+        """Write the whole catalog as a products.json list"""
+        from utils.file_operations import atomic_write
+        with self._lock:
+            products = list(self._index.values())
+            content = json.dumps(products, indent=4)
+        path = atomic_write(json_path, content)
+        self.record_json_sync(json_path, products, content)
+        return path
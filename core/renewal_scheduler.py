@@ -0,0 +1,343 @@
+# Standard library imports
+from dataclasses import dataclass, field
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import json
+import os
+import sqlite3
+import time
+import logging
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+DATE_FIELDS = ('expiration_date', 'maintenance_date')
+
+def _normalize_date(value) -> Optional[str]:
+    """ISO date string in one format, so dates compare correctly as text in SQLite"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).replace(tzinfo=None).isoformat()
+    except ValueError:
+        return None
+
+@dataclass(order=True)
+class DueRenewal:
+    """A license whose expiration (or maintenance) date falls inside the renewal window"""
+    due: str                                   # ISO date the license expires
+    path: str = field(compare=False)           # License file
+    customer_id: Optional[str] = field(default=None, compare=False)
+
+class ExpirationIndex:
+    """
+    SQLite index of license files and their expiration / maintenance dates
+
+    sync() only lists directories whose mtime changed since the last sync
+    (licenses are written by atomic rename, which updates the directory) and
+    only reads licenses that are new or changed. Each directory's
+    subdirectories are stored with it, so an unchanged directory is descended
+    from the index - a daily sync over a large, mostly unchanged tree is one
+    stat per directory.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the expiration index
+        Args:
+            db_path: Path to the SQLite index file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.init_db()
+
+    def init_db(self):
+        """Initialize the index database with required tables"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS licenses (
+                    path TEXT PRIMARY KEY,        -- License file
+                    directory TEXT,               -- Directory containing the file
+                    customer_id TEXT,             -- Customer the license was issued to
+                    expiration_date TEXT,         -- License expiration (normalized ISO)
+                    maintenance_date TEXT,        -- Maintenance end (normalized ISO)
+                    mtime_ns INTEGER,             -- File modification time when indexed
+                    size INTEGER,                 -- File size when indexed
+                    renewed_to TEXT,              -- Renewed license replacing this one
+                    failed_at TEXT,               -- Last failed renewal attempt
+                    error TEXT                    -- Reason of the last failure
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS directories (
+                    path TEXT PRIMARY KEY,        -- Directory in the license tree
+                    mtime_ns INTEGER,             -- Directory modification time when last listed
+                    subdirs TEXT                  -- JSON list of its subdirectories when last listed
+                )
+            """)
+            # Indexes created before subdirectories were stored
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(directories)")]
+            if 'subdirs' not in columns:
+                conn.execute("ALTER TABLE directories ADD COLUMN subdirs TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_licenses_directory ON licenses(directory)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_licenses_expiration ON licenses(expiration_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_licenses_maintenance ON licenses(maintenance_date)")
+
+    @staticmethod
+    def read_dates(path: Path) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """(customer_id, expiration_date, maintenance_date) of a license file, without verifying it"""
+        from encryption.license_signing import read_license_data
+        try:
+            data = read_license_data(Path(path).read_bytes())
+            license_info = data.get('license', {})
+            return (data.get('customer', {}).get('id'),
+                    _normalize_date(license_info.get('expiration_date')),
+                    _normalize_date(license_info.get('maintenance_date')))
+        except Exception as e:
+            # Not a JSON/binary envelope (e.g. a FlexLM text license) - indexed without dates
+            logger.debug(f"No dates in {path}: {e}")
+            return None, None, None
+
+    def _row(self, path: str, stat: os.stat_result) -> Tuple:
+        customer_id, expiration, maintenance = self.read_dates(path)
+        return (path, os.path.dirname(path), customer_id, expiration, maintenance,
+                stat.st_mtime_ns, stat.st_size)
+
+    def add_files(self, paths: Iterable[Path]):
+        """Index (or re-index) specific license files, e.g. ones just written by a renewal"""
+        rows = []
+        for path in paths:
+            path = str(path)
+            rows.append(self._row(path, os.stat(path)))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO licenses (path, directory, customer_id, expiration_date, "
+                "maintenance_date, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def sync(self, root: Path, extensions: Tuple[str, ...] = ('.lic',)) -> Dict[str, int]:
+        """
+        Bring the index up to date with a license tree
+
+        Args:
+            root: Top of the license tree (e.g. the customers directory)
+            extensions: License file extensions to index
+
+        Returns:
+            Counts of directories listed and licenses added/updated/removed
+        """
+        counts = {'directories': 0, 'listed': 0, 'indexed': 0, 'removed': 0}
+        with sqlite3.connect(self.db_path) as conn:
+            known_dirs = {path: (mtime_ns, subdirs) for path, mtime_ns, subdirs in conn.execute(
+                "SELECT path, mtime_ns, subdirs FROM directories")}
+            seen_dirs = set()
+            stack = [str(root)]
+            while stack:
+                directory = stack.pop()
+                try:
+                    dir_mtime = os.stat(directory).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                seen_dirs.add(directory)
+                counts['directories'] += 1
+                known_mtime, known_subdirs = known_dirs.get(directory, (None, None))
+                if known_mtime == dir_mtime and known_subdirs is not None:
+                    # Nothing was added, removed or renamed here - descend without listing
+                    stack.extend(json.loads(known_subdirs))
+                    continue
+
+                try:
+                    with os.scandir(directory) as scan:
+                        entries = list(scan)
+                except FileNotFoundError:
+                    seen_dirs.discard(directory)
+                    continue
+                subdirs = []
+                files = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(extensions):
+                        files.append(entry)
+                stack.extend(subdirs)
+
+                # Reconcile this directory's files with the index
+                counts['listed'] += 1
+                indexed = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute(
+                    "SELECT path, mtime_ns, size FROM licenses WHERE directory = ?", (directory,))}
+                rows = []
+                for entry in files:
+                    stat = entry.stat()
+                    if indexed.pop(entry.path, None) != (stat.st_mtime_ns, stat.st_size):
+                        rows.append(self._row(entry.path, stat))
+                # Replacing a row keeps its renewal state only if the file is unchanged, which is
+                # the point: a rewritten license is a new license
+                conn.executemany(
+                    "INSERT OR REPLACE INTO licenses (path, directory, customer_id, expiration_date, "
+                    "maintenance_date, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.executemany("DELETE FROM licenses WHERE path = ?", [(path,) for path in indexed])
+                conn.execute("INSERT OR REPLACE INTO directories (path, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                             (directory, dir_mtime, json.dumps(subdirs)))
+                counts['indexed'] += len(rows)
+                counts['removed'] += len(indexed)
+
+            # Directories that disappeared take their licenses with them
+            gone = [(directory,) for directory in known_dirs if directory not in seen_dirs]
+            if gone:
+                counts['removed'] += sum(conn.execute(
+                    "SELECT COUNT(*) FROM licenses WHERE directory = ?", row).fetchone()[0] for row in gone)
+                conn.executemany("DELETE FROM licenses WHERE directory = ?", gone)
+                conn.executemany("DELETE FROM directories WHERE path = ?", gone)
+        logger.info(f"Expiration index synced: {counts}")
+        return counts
+
+    def upcoming(self, before: datetime, date_field: str = 'expiration_date',
+                 retry_after: timedelta = timedelta(days=7)) -> List[DueRenewal]:
+        """
+        Licenses whose date is before a cut-off and that still need renewing
+
+        Licenses that have already expired are left out: renewal refuses them
+        (see expired()).
+
+        Args:
+            before: Cut-off date
+            date_field: 'expiration_date' or 'maintenance_date'
+            retry_after: Skip licenses whose renewal failed more recently than this
+        """
+        if date_field not in DATE_FIELDS:
+            raise ValueError(f"Unsupported date field: {date_field}")
+        now = datetime.now()
+        retry_cutoff = (now - retry_after).isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT {date_field}, path, customer_id FROM licenses "
+                f"WHERE {date_field} IS NOT NULL AND {date_field} <= ? AND renewed_to IS NULL "
+                f"AND (expiration_date IS NULL OR expiration_date > ?) "
+                f"AND (failed_at IS NULL OR failed_at < ?)",
+                (before.isoformat(), now.isoformat(), retry_cutoff)
+            )
+            return [DueRenewal(due, path, customer_id) for due, path, customer_id in rows]
+
+    def expired(self, now: Optional[datetime] = None) -> List[DueRenewal]:
+        """
+        Licenses that expired without being renewed, earliest first
+
+        These can't be renewed (renewal verifies the license first) and need a
+        new license issued instead.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT expiration_date, path, customer_id FROM licenses "
+                "WHERE expiration_date IS NOT NULL AND expiration_date <= ? AND renewed_to IS NULL "
+                "ORDER BY expiration_date",
+                ((now or datetime.now()).isoformat(),)
+            )
+            return [DueRenewal(due, path, customer_id) for due, path, customer_id in rows]
+
+    def mark_renewed(self, results: List[Dict]):
+        """Record renewal results (license_renewal manifest entries) in the index"""
+        now = datetime.now().isoformat()
+        renewed = [r for r in results if r.get('success')]
+        failed = [r for r in results if not r.get('success')]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("UPDATE licenses SET renewed_to = ?, failed_at = NULL, error = NULL WHERE path = ?",
+                             [(r['renewed_license'], r['license']) for r in renewed])
+            conn.executemany("UPDATE licenses SET failed_at = ?, error = ? WHERE path = ?",
+                             [(now, r.get('error'), r['license']) for r in failed])
+        # Renewed licenses are new licenses with their own (later) dates
+        self.add_files(r['renewed_license'] for r in renewed if os.path.exists(r['renewed_license']))
+
+class RenewalScheduler:
+    """
+    Emits due renewals in time order and renews them in rate-limited batches
+
+    Upcoming expirations within the lookahead are kept in a min-heap built from
+    the ExpirationIndex; pop_due() takes the ones inside the renewal lead time,
+    earliest first, so licenses closest to expiring are renewed first.
+    """
+
+    def __init__(self, index: ExpirationIndex, lead_days: int = 30, date_field: str = 'expiration_date',
+                 lookahead_days: int = 7):
+        """
+        Args:
+            index: Expiration index to read from and record results in
+            lead_days: Renew licenses this many days before their date
+            date_field: 'expiration_date' or 'maintenance_date'
+            lookahead_days: Extra days of upcoming renewals kept in the heap (for long-running use)
+        """
+        self.index = index
+        self.lead = timedelta(days=lead_days)
+        self.date_field = date_field
+        self.lookahead = timedelta(days=lookahead_days)
+        self._heap: List[DueRenewal] = []
+
+    def refresh(self, now: Optional[datetime] = None) -> int:
+        """Rebuild the heap from the index; returns the number of upcoming renewals"""
+        now = now or datetime.now()
+        self._heap = self.index.upcoming(now + self.lead + self.lookahead, self.date_field)
+        heapq.heapify(self._heap)
+        return len(self._heap)
+
+    def next_due(self) -> Optional[datetime]:
+        """When the earliest upcoming renewal becomes due, or None"""
+        if not self._heap:
+            return None
+        return datetime.fromisoformat(self._heap[0].due) - self.lead
+
+    def pop_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[DueRenewal]:
+        """Remove and return renewals that are due now, earliest first"""
+        cutoff = ((now or datetime.now()) + self.lead).isoformat()
+        due = []
+        while self._heap and self._heap[0].due <= cutoff and (limit is None or len(due) < limit):
+            due.append(heapq.heappop(self._heap))
+        return due
+
+    def run(self, renew_batch: Callable[[List[str]], Iterable[Dict]], batch_size: int = 500,
+            rate: Optional[float] = None, max_renewals: Optional[int] = None,
+            on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, int]:
+        """
+        Renew everything that is due, in batches
+
+        Args:
+            renew_batch: Renews a list of license paths, yielding manifest entries
+                         (tools/license_renewal.renew_many)
+            batch_size: Licenses per batch
+            rate: Maximum licenses per second across batches (None = unlimited)
+            max_renewals: Stop after this many licenses (one wave)
+            on_result: Called with every manifest entry
+
+        Returns:
+            Counts of renewed and failed licenses and batches run
+        """
+        counts = {'renewed': 0, 'failed': 0, 'batches': 0}
+        if not self._heap:
+            self.refresh()
+        started = time.monotonic()
+        done = 0
+        while max_renewals is None or done < max_renewals:
+            size = batch_size if max_renewals is None else min(batch_size, max_renewals - done)
+            batch = self.pop_due(limit=size)
+            if not batch:
+                break
+            results = []
+            for entry in renew_batch([renewal.path for renewal in batch]):
+                results.append(entry)
+                counts['renewed' if entry.get('success') else 'failed'] += 1
+                if on_result is not None:
+                    on_result(entry)
+            self.index.mark_renewed(results)
+            done += len(batch)
+            counts['batches'] += 1
+            logger.info(f"Renewal batch {counts['batches']}: {len(batch)} licenses "
+                        f"(due {batch[0].due} .. {batch[-1].due})")
+            if rate:
+                # Stay under the rate: wait until the licenses done so far are "allowed"
+                wait = done / rate - (time.monotonic() - started)
+                if wait > 0:
+                    time.sleep(wait)
+        return counts
@@ -3,12 +3,17 @@ from pathlib import Path
 import json
 import sqlite3
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 import logging
+from utils import metrics
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+LOOKUP_SECONDS = metrics.histogram('revocation_lookup_seconds', 'Time to check one license for revocation')
+LOOKUPS_TOTAL = metrics.counter('revocation_lookups_total',
+                                'Revocation checks by result (hit = license is revoked)', ['result'])
+
 class RevocationManager:
     """Manages the revocation of software licenses and maintains a revocation database"""
     
@@ -72,12 +77,25 @@ class RevocationManager:
         Returns:
             bool: True if license is revoked, False otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with LOOKUP_SECONDS.time(), sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM revoked_licenses WHERE license_id = ?",
                 (license_id,)
             )
-            return cursor.fetchone() is not None
+            revoked = cursor.fetchone() is not None
+        LOOKUPS_TOTAL.labels('hit' if revoked else 'miss').inc()
+        return revoked
+            
+    def get_revoked_ids(self) -> Set[str]:
+        """
+        Get the IDs of all revoked licenses
+        
+        Returns:
+            Set of revoked license IDs, for callers that check many licenses
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("SELECT license_id FROM revoked_licenses")
+            return {row[0] for row in cursor.fetchall()}
             
     def get_revocation_info(self, license_id: str) -> Optional[Dict]:
         """
@@ -0,0 +1,123 @@
+# Standard library imports
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+import csv
+import json
+import logging
+
+# Local imports
+from .product import Product, ProductFeature
+from .template_manager import LicenseTemplate
+from .license_pipeline import JobResult, LicenseJob, LicensePipeline
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+def template_products(template: LicenseTemplate) -> List[Product]:
+    """
+    Products a template licenses
+
+    Uses the product dictionaries in the template's metadata['products'] when
+    present; otherwise the template itself is one product (named after the
+    template) carrying the template's features.
+    """
+    products = template.metadata.get('products')
+    if products:
+        return [Product.from_dict(p) for p in products]
+    features = [
+        ProductFeature(
+            name=f['name'],
+            value=str(f.get('value', '')),
+            quantity=f.get('quantity', 1),
+            enabled=f.get('enabled', True)
+        ) if isinstance(f, dict) else ProductFeature(name=str(f), value='')
+        for f in template.features
+    ]
+    return [Product(name=template.name, version=str(template.metadata.get('version', '1.0')),
+                    features=features)]
+
+def template_license_info(template: LicenseTemplate, issue_date: Optional[datetime] = None) -> Dict:
+    """License settings (type, dates, platforms) for licenses issued from a template"""
+    issue_date = issue_date or datetime.now()
+    return {
+        'license_type': template.type,
+        'expiration_date': (issue_date + timedelta(days=template.validity_days)).isoformat(),
+        'maintenance_date': (issue_date + timedelta(days=template.maintenance_days)).isoformat(),
+        'platforms': list(template.platforms)
+    }
+
+def customer_info(row: Dict) -> Dict:
+    """Customer dictionary from a customers file row (batch CSV or JSON style keys)"""
+    customer_id = row.get('customer_id') or row.get('id')
+    if not customer_id:
+        raise ValueError("Customer has no id")
+    return {
+        'name': row.get('customer_name') or row.get('name', ''),
+        'id': str(customer_id),
+        'email': row.get('email', '')
+    }
+
+def read_customers(path: Path) -> Iterator[Dict]:
+    """
+    Stream customers from a CSV file (customer_id, customer_name, email columns,
+    as for the batch processor) or a JSON lines file, one row at a time
+    """
+    with open(path, 'r', newline='') as f:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+def generate_from_template(template: LicenseTemplate, customers: Iterable[Dict],
+                           pipeline: LicensePipeline, license_system: Optional[str] = None,
+                           max_workers: int = 4) -> Iterator[JobResult]:
+    """
+    Issue a license from a template to each customer
+
+    Products and license settings are built once and shared by every job, and
+    customers are read lazily, so any number of customers streams through the
+    pipeline with bounded memory. Rows that aren't valid customers are yielded
+    as failed results.
+
+    Args:
+        template: Template to instantiate
+        customers: Customer rows (see customer_info)
+        pipeline: Pipeline that signs and saves each license
+        license_system: License system to generate for
+                        (default: the template's metadata['license_system'] or 'nodelock')
+        max_workers: Number of worker threads
+
+    Returns:
+        Iterator of JobResults in completion order
+    """
+    license_system = license_system or template.metadata.get('license_system', 'nodelock')
+    products = template_products(template)
+    license_info = template_license_info(template)
+    invalid = []
+
+    def jobs() -> Iterator[LicenseJob]:
+        for row in customers:
+            try:
+                info = customer_info(row)
+            except (ValueError, AttributeError) as e:
+                invalid.append(JobResult(LicenseJob(license_system, {'id': None}, license_info, products),
+                                         False, error=f"Invalid customer {row!r}: {e}"))
+                continue
+            yield LicenseJob(
+                license_system=license_system,
+                customer_info=info,
+                license_info=license_info,
+                products=products,
+                job_id=info['id']
+            )
+
+    pipeline.warm_up()
+    for result in pipeline.process_many(jobs(), max_workers=max_workers):
+        while invalid:
+            yield invalid.pop()
+        yield result
+    while invalid:
+        yield invalid.pop()
@@ -1,13 +1,18 @@
 from pathlib import Path
 import json
+import os
+import sqlite3
 import yaml
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader is several times faster than the pure-Python one
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 @dataclass
 class LicenseTemplate:
     name: str
@@ -19,10 +24,176 @@ class LicenseTemplate:
     features: List[Dict]
     metadata: Dict
 
+def _feature_names(features: List) -> List[str]:
+    return [f.get('name', '') if isinstance(f, dict) else str(f) for f in features or []]
+
+def _like_pattern(text: str) -> str:
+    """Substring LIKE pattern matching text literally (used with ESCAPE '\\')"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+class TemplateIndex:
+    """
+    SQLite index of template summaries (name, type, platforms, feature names,
+    validity) so templates can be listed and filtered without parsing YAML.
+    Each row remembers the file's mtime and size; sync() only re-reads files
+    whose stamp changed.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the template index
+        Args:
+            db_path: Path to the SQLite index file
+        """
+        self.db_path = db_path
+        self.init_db()
+
+    def init_db(self):
+        """Initialize the index database with required tables"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS templates (
+                    name TEXT PRIMARY KEY,        -- Template file name (without .yaml)
+                    type TEXT,                    -- License type
+                    description TEXT,             -- Template description
+                    platforms TEXT,               -- JSON array of platforms
+                    features TEXT,                -- JSON array of feature names
+                    validity_days INTEGER,        -- License validity period
+                    maintenance_days INTEGER,     -- Maintenance period
+                    mtime_ns INTEGER,             -- File modification time when indexed
+                    size INTEGER                  -- File size when indexed
+                )
+            """)
+            # One row per platform / feature so filters use an index instead of scanning JSON
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS template_platforms (
+                    name TEXT,                    -- Template name
+                    platform TEXT COLLATE NOCASE  -- Supported platform
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS template_features (
+                    name TEXT,                    -- Template name
+                    feature TEXT COLLATE NOCASE   -- Feature name
+                )
+            """)
+            # Files that failed to parse, skipped by sync until their stamp changes
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS template_errors (
+                    name TEXT PRIMARY KEY,        -- Template file name (without .yaml)
+                    mtime_ns INTEGER,             -- File modification time when it failed
+                    size INTEGER,                 -- File size when it failed
+                    error TEXT                    -- Parse error message
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_templates_type ON templates(type COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_template_platforms ON template_platforms(platform, name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_template_features ON template_features(feature, name)")
+
+    def stamps(self) -> Dict[str, Tuple[int, int]]:
+        """Indexed template names with the file stamp they were indexed at"""
+        with sqlite3.connect(self.db_path) as conn:
+            return {name: (mtime_ns, size) for name, mtime_ns, size
+                    in conn.execute("SELECT name, mtime_ns, size FROM templates")}
+
+    def failed_stamps(self) -> Dict[str, Tuple[int, int]]:
+        """Names of template files that failed to parse, with the file stamp they failed at"""
+        with sqlite3.connect(self.db_path) as conn:
+            return {name: (mtime_ns, size) for name, mtime_ns, size
+                    in conn.execute("SELECT name, mtime_ns, size FROM template_errors")}
+
+    def mark_failed(self, entries: List[Tuple[str, Tuple[int, int], str]]):
+        """Record (name, file stamp, error) for files that failed to parse, dropping their index rows"""
+        if not entries:
+            return
+        self.remove([name for name, _, _ in entries])
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("INSERT OR REPLACE INTO template_errors VALUES (?, ?, ?, ?)",
+                             [(name, stamp[0], stamp[1], error) for name, stamp, error in entries])
+
+    def update(self, entries: List[Tuple[str, LicenseTemplate, Tuple[int, int]]]):
+        """Add or replace index rows for (name, template, file stamp) entries in one transaction"""
+        if not entries:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            for name, template, stamp in entries:
+                features = _feature_names(template.features)
+                conn.execute(
+                    "INSERT OR REPLACE INTO templates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, template.type, template.description, json.dumps(template.platforms),
+                     json.dumps(features), template.validity_days, template.maintenance_days,
+                     stamp[0], stamp[1])
+                )
+                conn.execute("DELETE FROM template_platforms WHERE name = ?", (name,))
+                conn.execute("DELETE FROM template_features WHERE name = ?", (name,))
+                conn.execute("DELETE FROM template_errors WHERE name = ?", (name,))
+                conn.executemany("INSERT INTO template_platforms VALUES (?, ?)",
+                                 [(name, platform) for platform in template.platforms or []])
+                conn.executemany("INSERT INTO template_features VALUES (?, ?)",
+                                 [(name, feature) for feature in features])
+
+    def remove(self, names: List[str]):
+        """Drop templates from the index"""
+        if not names:
+            return
+        rows = [(name,) for name in names]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("DELETE FROM templates WHERE name = ?", rows)
+            conn.executemany("DELETE FROM template_platforms WHERE name = ?", rows)
+            conn.executemany("DELETE FROM template_features WHERE name = ?", rows)
+            conn.executemany("DELETE FROM template_errors WHERE name = ?", rows)
+
+    def find(self, license_type: Optional[str] = None, platform: Optional[str] = None,
+             feature: Optional[str] = None, text: Optional[str] = None) -> List[Dict]:
+        """
+        Template summaries matching all given filters, ordered by name
+
+        Args:
+            license_type: Exact license type (case-insensitive)
+            platform: Templates supporting this platform
+            feature: Templates including a feature with this name
+            text: Substring of the name or description (% and _ match literally)
+        """
+        query = ("SELECT name, type, description, platforms, features, validity_days, maintenance_days "
+                 "FROM templates t WHERE 1 = 1")
+        params = []
+        if license_type:
+            query += " AND type = ? COLLATE NOCASE"
+            params.append(license_type)
+        if platform:
+            query += " AND name IN (SELECT name FROM template_platforms WHERE platform = ?)"
+            params.append(platform)
+        if feature:
+            query += " AND name IN (SELECT name FROM template_features WHERE feature = ?)"
+            params.append(feature)
+        if text:
+            query += " AND (name LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')"
+            params.extend([_like_pattern(text)] * 2)
+        query += " ORDER BY name"
+        with sqlite3.connect(self.db_path) as conn:
+            return [
+                {
+                    'name': name,
+                    'type': license_type,
+                    'description': description,
+                    'platforms': json.loads(platforms),
+                    'features': json.loads(features),
+                    'validity_days': validity_days,
+                    'maintenance_days': maintenance_days
+                }
+                for name, license_type, description, platforms, features, validity_days, maintenance_days
+                in conn.execute(query, params)
+            ]
+
 class TemplateManager:
     def __init__(self, template_dir: Path):
         self.template_dir = template_dir
         self.template_dir.mkdir(parents=True, exist_ok=True)
+        # name -> ((mtime_ns, size), template); re-parsed only when the file changes
+        self._cache: Dict[str, Tuple[Tuple[int, int], LicenseTemplate]] = {}
+        # Summaries for listing and filtering, kept next to the templates
+        self.index = TemplateIndex(self.template_dir / 'templates.db')
         
     def create_template(self, template_data: Dict) -> LicenseTemplate:
         """Create a new license template"""
@@ -61,24 +232,92 @@ class TemplateManager:
         
         with open(path, 'w') as f:
             yaml.dump(template_data, f, default_flow_style=False)
+        path = Path(path)
+        self._cache.pop(path.stem, None)
+        if path.parent.resolve() == self.template_dir.resolve():
+            stat = path.stat()
+            self.index.update([(path.stem, template, (stat.st_mtime_ns, stat.st_size))])
             
     def load_template(self, name: str) -> LicenseTemplate:
-        """Load a template by name"""
+        """
+        Load a template by name
+
+        Parsed templates are cached and re-read only when the file's mtime or
+        size changes, so the returned template is shared - don't modify it.
+        """
         template_path = self.template_dir / f"{name}.yaml"
-        if not template_path.exists():
+        try:
+            stat = template_path.stat()
+        except FileNotFoundError:
+            self._cache.pop(name, None)
             raise ValueError(f"Template {name} not found")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
             
         with open(template_path, 'r') as f:
-            template_data = yaml.safe_load(f)
+            template_data = yaml.load(f, Loader=YamlLoader)
             
-        return LicenseTemplate(**template_data)
+        template = LicenseTemplate(**template_data)
+        self._cache[name] = (stamp, template)
+        return template
     
+    def sync_index(self) -> int:
+        """
+        Bring the index up to date with the template directory
+
+        Only files that are new or whose mtime/size changed are parsed, and
+        templates whose files are gone are dropped. A file that fails to parse
+        is logged once and skipped until it changes.
+
+        Returns:
+            Number of templates (re)indexed or removed
+        """
+        on_disk = {}
+        with os.scandir(self.template_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.yaml') and entry.is_file():
+                    stat = entry.stat()
+                    on_disk[entry.name[:-len('.yaml')]] = (stat.st_mtime_ns, stat.st_size)
+
+        indexed = self.index.stamps()
+        failed_before = self.index.failed_stamps()
+        removed = [name for name in indexed if name not in on_disk]
+        updated = []
+        failed = []
+        for name, stamp in on_disk.items():
+            if indexed.get(name) == stamp or failed_before.get(name) == stamp:
+                continue
+            try:
+                updated.append((name, self.load_template(name), stamp))
+            except Exception as e:
+                logger.error(f"Cannot index template {name}: {e}")
+                failed.append((name, stamp, str(e)))
+        self.index.update(updated)
+        self.index.mark_failed(failed)
+        self.index.remove(removed + [name for name in failed_before if name not in on_disk])
+        # A previously indexed template that no longer parses counts as removed
+        removed += [name for name, _, _ in failed if name in indexed]
+        if updated or removed:
+            logger.info(f"Template index: {len(updated)} updated, {len(removed)} removed")
+        return len(updated) + len(removed)
+
     def list_templates(self) -> List[str]:
         """List all available templates"""
-        return [p.stem for p in self.template_dir.glob("*.yaml")]
+        return [entry['name'] for entry in self.find_templates()]
+
+    def find_templates(self, license_type: Optional[str] = None, platform: Optional[str] = None,
+                       feature: Optional[str] = None, text: Optional[str] = None) -> List[Dict]:
+        """Summaries of templates matching the filters (see TemplateIndex.find), from the index"""
+        self.sync_index()
+        return self.index.find(license_type, platform, feature, text)
     
     def delete_template(self, name: str):
         """Delete a template"""
         template_path = self.template_dir / f"{name}.yaml"
         if template_path.exists():
             template_path.unlink()
+        self._cache.pop(name, None)
+        self.index.remove([name])
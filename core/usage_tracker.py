@@ -2,11 +2,17 @@ from pathlib import Path
 import sqlite3
 from datetime import datetime
 import json
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 import logging
+from utils import metrics
 
 logger = logging.getLogger(__name__)
 
+WRITES_IN_PROGRESS = metrics.gauge('usage_writes_in_progress',
+                                   'Usage writes waiting for or holding the database (queue depth)')
+COMMIT_SECONDS = metrics.histogram('usage_commit_seconds', 'Time for a usage write to commit', ['operation'])
+
 class UsageTracker:
     def __init__(self, db_path: Path):
         self.db_path = db_path
@@ -39,10 +45,17 @@ class UsageTracker:
                 )
             """)
             
+    @contextmanager
+    def _write(self, operation: str):
+        """Connection for one write transaction, timed until it commits"""
+        with WRITES_IN_PROGRESS.track_inprogress(), COMMIT_SECONDS.labels(operation).time():
+            with sqlite3.connect(self.db_path) as conn:
+                yield conn
+            
     def record_usage(self, license_id: str, customer_id: str, product_id: str,
                     feature_id: str, host_info: Dict, usage_data: Dict):
         """Record license usage"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write('record_usage') as conn:
             conn.execute(
                 """
                 INSERT INTO license_usage 
@@ -62,7 +75,7 @@ class UsageTracker:
             
     def end_usage_session(self, license_id: str, product_id: str, feature_id: str):
         """End a usage session"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write('end_usage_session') as conn:
             conn.execute(
                 """
                 UPDATE license_usage 
@@ -74,7 +87,7 @@ class UsageTracker:
             
     def record_metric(self, license_id: str, metric_type: str, metric_value: float):
         """Record a usage metric"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._write('record_metric') as conn:
             conn.execute(
                 """
                 INSERT INTO usage_metrics (license_id, metric_type, metric_value, timestamp)
@@ -11,14 +11,17 @@ from typing import Optional, Tuple
 logger = logging.getLogger(__name__)
 
 class KeyManager:
-    def __init__(self, key_dir: Path, settings_path: Path = None):
+    def __init__(self, key_dir: Path, settings_path: Path = None, key_pool=None):
         """Initialize KeyManager with paths and settings
         
         Args:
             key_dir: Directory for key storage
             settings_path: Path to security settings file
+            key_pool: Optional started KeyPool; generate_key_pair takes keys from it
+                      instead of generating them synchronously
         """
         self.key_dir = Path(key_dir)
+        self.key_pool = key_pool
         self.private_key_path = self.key_dir / "private_key.pem"
         self.public_key_path = self.key_dir / "public_key.pem"
         
@@ -79,12 +82,16 @@ class KeyManager:
             # Validate requirements
             self.validate_key_requirements(key_length, password)
             
-            # Generate private key
-            private_key = rsa.generate_private_key(
-                public_exponent=self.security_settings['key_settings']['public_exponent'],
-                key_size=key_length,
-                backend=default_backend()
-            )
+            # Generate private key (pre-generated by the key pool when one is configured)
+            public_exponent = self.security_settings['key_settings']['public_exponent']
+            if self.key_pool is not None and self.key_pool.matches(key_length, public_exponent):
+                private_key = self.key_pool.take()
+            else:
+                private_key = rsa.generate_private_key(
+                    public_exponent=public_exponent,
+                    key_size=key_length,
+                    backend=default_backend()
+                )
             
             public_key = private_key.public_key()
             
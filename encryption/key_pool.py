@@ -0,0 +1,306 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.file_operations import atomic_write
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE = metrics.gauge('license_key_pool_available', 'Pre-generated keys ready to take', ['key_length'])
+IN_FLIGHT = metrics.gauge('license_key_pool_in_flight', 'Keys being generated', ['key_length'])
+GENERATED_TOTAL = metrics.counter('license_key_pool_generated_total', 'Keys generated and stored by the pool',
+                                  ['key_length'])
+FAILURES_TOTAL = metrics.counter('license_key_pool_failures_total', 'Keys the pool failed to generate or store',
+                                 ['key_length'])
+TAKEN_TOTAL = metrics.counter('license_key_pool_taken_total', 'Keys taken from the pool', ['key_length'])
+MISSES_TOTAL = metrics.counter('license_key_pool_misses_total', 'Takes that found the pool empty', ['key_length'])
+GENERATION_SECONDS = metrics.histogram('license_key_pool_generation_seconds',
+                                       'Time from submitting a key generation to the stored key', ['key_length'])
+WAIT_SECONDS = metrics.histogram('license_key_pool_wait_seconds', 'Time take() spent getting a key',
+                                 ['key_length'])
+
+# Generation timestamps older than this are ignored for the generation rate
+RATE_WINDOW_SECONDS = 600
+
+def _generate_encrypted_key(key_length: int, public_exponent: int, encryption_key: bytes) -> bytes:
+    """Generate an RSA key and return it as a Fernet-encrypted PKCS8 DER token (runs in a worker process)
+
+    Fernet rather than PEM password encryption: the PEM scheme's key derivation
+    costs ~100 ms per load, which would defeat the point of a pool.
+    """
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.hazmat.backends import default_backend
+    private_key = rsa.generate_private_key(
+        public_exponent=public_exponent,
+        key_size=key_length,
+        backend=default_backend()
+    )
+    der = private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    return Fernet(encryption_key).encrypt(der)
+
+def _pool_encryption_key(app_name: str = "LicenseManager") -> bytes:
+    """Fernet key protecting pooled keys, kept in the system keyring like CredentialsManager's key"""
+    import keyring
+    from cryptography.fernet import Fernet
+    service = f"{app_name}_key_pool"
+    key = keyring.get_password(service, "encryption_key")
+    if not key:
+        key = Fernet.generate_key().decode()
+        keyring.set_password(service, "encryption_key", key)
+    return key.encode()
+
+class KeyPool:
+    """
+    Background pool of pre-generated RSA private keys
+
+    Keys are generated in worker processes (RSA generation is CPU-bound and
+    holds the GIL) and stored encrypted on disk, one file per key. take()
+    hands out a stored key immediately and schedules a replacement, so callers
+    only wait for generation when the pool has run dry.
+    """
+
+    def __init__(self, pool_dir: Path, key_length: int = 4096, public_exponent: int = 65537,
+                 size: int = 4, workers: int = None, encryption_key: Optional[bytes] = None):
+        """
+        Args:
+            pool_dir: Directory for the encrypted pooled keys
+            key_length: RSA key length in bits
+            public_exponent: RSA public exponent
+            size: Number of keys to keep ready
+            workers: Generator processes (defaults to min(size, CPU count))
+            encryption_key: Fernet key encrypting the pooled keys (defaults to one kept in
+                            the system keyring)
+        """
+        self.key_length = key_length
+        self.public_exponent = public_exponent
+        self.size = size
+        self.workers = workers or min(size, os.cpu_count() or 1)
+        # Keys of different parameters never mix
+        self.pool_dir = Path(pool_dir) / f"rsa_{key_length}_{public_exponent}"
+        self._encryption_key = encryption_key
+
+        self.generated_total = 0
+        self.taken_total = 0
+        self.misses = 0
+        self.failures = 0
+        self._last_error = None
+        self._generation_times = deque()  # (finished_at, seconds) for the rate metric
+        self._available = deque()
+        self._in_flight = 0
+        self._executor = None
+        self._condition = threading.Condition()
+
+        # Depth and in-flight count are read when metrics are exported
+        AVAILABLE.labels(key_length).set_function(lambda: len(self._available))
+        IN_FLIGHT.labels(key_length).set_function(lambda: self._in_flight)
+
+    @classmethod
+    def from_settings(cls, security_settings: Dict, pool_dir: Path, size: int = 4,
+                      workers: int = None) -> 'KeyPool':
+        """Create a pool for the key length and exponent in the security settings"""
+        key_settings = security_settings['key_settings']
+        return cls(pool_dir, key_settings['key_length'], key_settings['public_exponent'],
+                   size, workers)
+
+    @property
+    def encryption_key(self) -> bytes:
+        if self._encryption_key is None:
+            self._encryption_key = _pool_encryption_key()
+        return self._encryption_key
+
+    def matches(self, key_length: int, public_exponent: int) -> bool:
+        """Whether this pool produces keys with the given parameters"""
+        return key_length == self.key_length and public_exponent == self.public_exponent
+
+    def start(self) -> None:
+        """Pick up keys left from a previous run and start filling the pool"""
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        with self._condition:
+            if self._executor is not None:
+                return
+            self._available.extend(sorted(self.pool_dir.glob('*.key'), key=lambda p: p.stat().st_mtime))
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        logger.info(f"Key pool started with {len(self._available)} stored keys "
+                    f"(target {self.size}, {self.key_length} bits)")
+        self._refill()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop generating; stored keys stay on disk for the next start()"""
+        with self._condition:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _refill(self) -> None:
+        """Submit generation jobs until stored plus in-flight keys reach the target size"""
+        with self._condition:
+            if self._executor is None:
+                return
+            encryption_key = self.encryption_key
+            while len(self._available) + self._in_flight < self.size:
+                future = self._executor.submit(_generate_encrypted_key, self.key_length,
+                                               self.public_exponent, encryption_key)
+                self._in_flight += 1
+                started = time.monotonic()
+                future.add_done_callback(lambda f, started=started: self._on_generated(f, started))
+
+    def _on_generated(self, future, started: float) -> None:
+        if future.cancelled():
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+            return
+        try:
+            token = future.result()
+            # Private keys stay owner-only whatever the umask
+            path = atomic_write(self.pool_dir / f"{uuid.uuid4().hex}.key", token, mode=0o600)
+        except Exception as e:
+            logger.error(f"Key pool generation failed: {e}")
+            FAILURES_TOTAL.labels(self.key_length).inc()
+            with self._condition:
+                self._in_flight -= 1
+                self.failures += 1
+                self._last_error = e
+                # Waiters in take() give up once nothing else is in flight
+                self._condition.notify_all()
+            return
+
+        finished = time.monotonic()
+        GENERATED_TOTAL.labels(self.key_length).inc()
+        GENERATION_SECONDS.labels(self.key_length).observe(finished - started)
+        with self._condition:
+            self._in_flight -= 1
+            self._available.append(path)
+            self.generated_total += 1
+            self._generation_times.append((finished, finished - started))
+            self._condition.notify_all()
+
+    def _wait_for_key(self, deadline: Optional[float]) -> Path:
+        """Wait for a stored key and take its path (called with the condition held)"""
+        failures = self.failures
+        # The condition's lock is reentrant; make sure a key is on its way
+        self._refill()
+        while not self._available:
+            if self._executor is None:
+                raise RuntimeError("Key pool was stopped while waiting for a key")
+            if self.failures != failures and not self._in_flight:
+                raise RuntimeError(f"Key pool could not generate a key: {self._last_error}")
+            failures = self.failures
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("No pooled key became available in time")
+            self._condition.wait(remaining)
+        return self._available.popleft()
+
+    def _claim(self, path: Path) -> Optional[bytes]:
+        """
+        Read and delete a stored key, or return None if another pool sharing
+        pool_dir claimed it first (the rename succeeds for exactly one of them)
+        """
+        claimed = path.with_name(f".claimed-{os.getpid()}-{threading.get_ident()}")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        try:
+            return claimed.read_bytes()
+        finally:
+            claimed.unlink()
+
+    def take(self, timeout: Optional[float] = None):
+        """
+        Take a private key from the pool
+
+        Args:
+            timeout: Seconds to wait when the pool is empty (None waits as long as needed)
+
+        Returns:
+            RSAPrivateKey
+
+        Raises:
+            TimeoutError: If no key became available in time
+            RuntimeError: If the pool failed to generate or store a key
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        token = None
+        while token is None:
+            with self._condition:
+                if self._available:
+                    path = self._available.popleft()
+                else:
+                    self.misses += 1
+                    MISSES_TOTAL.labels(self.key_length).inc()
+                    path = None if self._executor is None else self._wait_for_key(deadline)
+
+            if path is None:
+                # Pool isn't running: generate in-process like an unpooled caller would
+                token = _generate_encrypted_key(self.key_length, self.public_exponent, self.encryption_key)
+            else:
+                token = self._claim(path)
+                self._refill()
+        with self._condition:
+            self.taken_total += 1
+        TAKEN_TOTAL.labels(self.key_length).inc()
+        WAIT_SECONDS.labels(self.key_length).observe(time.monotonic() - start)
+
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.backends import default_backend
+        der = Fernet(self.encryption_key).decrypt(token)
+        # The key was generated by the pool and the Fernet token is authenticated, so the
+        # RSA consistency check on load (most of the cost of take()) is skipped
+        try:
+            return serialization.load_der_private_key(der, password=None, backend=default_backend(),
+                                                      unsafe_skip_rsa_key_validation=True)
+        except TypeError:
+            # cryptography < 39 has no way to skip the check
+            return serialization.load_der_private_key(der, password=None, backend=default_backend())
+
+    def metrics(self) -> Dict[str, float]:
+        """Pool depth, generation rate and counters (also exported as license_key_pool_* metrics)"""
+        now = time.monotonic()
+        with self._condition:
+            while self._generation_times and now - self._generation_times[0][0] > RATE_WINDOW_SECONDS:
+                self._generation_times.popleft()
+            recent = list(self._generation_times)
+            return {
+                'depth': len(self._available),
+                'target_depth': self.size,
+                'in_flight': self._in_flight,
+                'generated_total': self.generated_total,
+                'taken_total': self.taken_total,
+                'misses': self.misses,
+                'failures': self.failures,
+                'generation_rate_per_minute': len(recent) * 60 / RATE_WINDOW_SECONDS,
+                'mean_generation_seconds': (sum(seconds for _, seconds in recent) / len(recent)
+                                            if recent else 0.0)
+            }
+
+def start_key_pool(security_settings: Dict, workers: int = None) -> Optional[KeyPool]:
+    """
+    Start the key pool configured in the security settings' 'key_pool' section
+
+    Returns:
+        Started KeyPool, or None if the pool isn't enabled
+    """
+    pool_settings = security_settings.get('key_pool') or {}
+    if not pool_settings.get('enabled'):
+        return None
+    pool = KeyPool.from_settings(security_settings, Path(pool_settings.get('directory', 'config/keys/pool')),
+                                 size=pool_settings.get('size', 4), workers=workers)
+    pool.start()
+    return pool
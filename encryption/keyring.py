@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bytes of the SHA-256 fingerprint used as a key ID (hex-encoded in JSON licenses)
+KEY_ID_SIZE = 8
+
+def key_id_bytes(public_key) -> bytes:
+    """Key ID of a public key: truncated SHA-256 of its DER SubjectPublicKeyInfo"""
+    from cryptography.hazmat.primitives import serialization
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(der).digest()[:KEY_ID_SIZE]
+
+def key_id_for(public_key) -> str:
+    """Hex key ID of a public key, as stored in JSON licenses"""
+    return key_id_bytes(public_key).hex()
+
+class Keyring:
+    """
+    All public keys a license may have been signed with, indexed by key ID
+
+    The current public_key.pem and every rotated public_key_*.pem in the backup
+    directory (see KeyManager.backup_existing_keys and from_key_manager) are parsed once; looking up
+    the key for a license is then a dictionary lookup.
+    """
+
+    def __init__(self, public_key_paths: Iterable[Path] = (), public_key_path: Path = None,
+                 backup_dir: Path = None):
+        """
+        Args:
+            public_key_paths: PEM public key files; the first one is the current key
+            public_key_path: Current public key whose rotated copies in backup_dir are
+                             looked up again on every load (see from_public_key)
+            backup_dir: Where rotated copies of public_key_path are kept
+        """
+        self.public_key_paths = [Path(path) for path in public_key_paths]
+        self.public_key_path = Path(public_key_path) if public_key_path else None
+        self.backup_dir = Path(backup_dir) if backup_dir else None
+        self.current_key_id: Optional[str] = None
+        self._keys: Dict[str, object] = {}
+        self._loaded = False
+        self._loaded_stamp = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_public_key(cls, public_key_path: Path, backup_dir: Path = None) -> 'Keyring':
+        """
+        Keyring over a current public key and its rotated copies
+
+        Args:
+            public_key_path: Current public key (e.g. config/keys/public_key.pem)
+            backup_dir: Where rotated keys are kept as <stem>_<timestamp><suffix>
+                        (defaults to a 'backup' directory next to the key)
+        """
+        public_key_path = Path(public_key_path)
+        backup_dir = Path(backup_dir) if backup_dir else public_key_path.parent / 'backup'
+        # The backup directory is listed in load(), so reload() finds keys rotated since
+        return cls(public_key_path=public_key_path, backup_dir=backup_dir)
+
+    def _key_paths(self):
+        """Key files to load: the fixed list, or the current key and its backups as of now"""
+        if self.public_key_path is None:
+            return self.public_key_paths
+        paths = [self.public_key_path]
+        if self.backup_dir.is_dir():
+            # Newest first, so the most recent backup wins if a key was restored twice
+            paths.extend(sorted(self.backup_dir.glob(f"{self.public_key_path.stem}_*{self.public_key_path.suffix}"),
+                                reverse=True))
+        return paths
+
+    @classmethod
+    def from_key_manager(cls, key_manager) -> 'Keyring':
+        """
+        Keyring over a key manager's public key and the rotated copies it backed up
+
+        Uses the backup_location from the key manager's security settings, the
+        directory KeyManager.backup_existing_keys writes to; key managers
+        without security settings fall back to the 'backup' directory next to the key.
+        """
+        settings = getattr(key_manager, 'security_settings', None) or {}
+        backup_location = settings.get('key_settings', {}).get('backup_location')
+        return cls.from_public_key(key_manager.public_key_path,
+                                   Path(backup_location) if backup_location else None)
+
+    @classmethod
+    def from_key_dir(cls, key_dir: Path, backup_dir: Path = None) -> 'Keyring':
+        """Keyring over key_dir/public_key.pem and its rotated copies"""
+        return cls.from_public_key(Path(key_dir) / 'public_key.pem', backup_dir)
+
+    def _stamp(self):
+        """Modification times of the current key and the backup directory (None if not watched)"""
+        if self.public_key_path is None:
+            return None
+        stamp = []
+        for path in (self.public_key_path, self.backup_dir):
+            try:
+                stamp.append(path.stat().st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load(self) -> None:
+        """Parse every public key and index it by key ID (done once)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.backends import default_backend
+            self._loaded_stamp = self._stamp()
+            for index, path in enumerate(self._key_paths()):
+                try:
+                    public_key = serialization.load_pem_public_key(path.read_bytes(),
+                                                                   backend=default_backend())
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable public key {path}: {e}")
+                    continue
+                key_id = key_id_for(public_key)
+                self._keys.setdefault(key_id, public_key)
+                if index == 0:
+                    self.current_key_id = key_id
+            self._loaded = True
+            logger.info(f"Loaded {len(self._keys)} public keys into the keyring")
+
+    def reload(self) -> None:
+        """Forget the loaded keys so the next lookup picks up rotated keys (and new backups)"""
+        with self._lock:
+            self._keys = {}
+            self.current_key_id = None
+            self._loaded = False
+
+    def get(self, key_id: str):
+        """Return the public key with this ID, or None if it isn't in the keyring
+
+        An unknown ID reloads the keyring if the key files changed since it was
+        loaded, so long-running verifiers pick up rotations without reset_keys().
+        """
+        self.load()
+        public_key = self._keys.get(key_id)
+        if public_key is None and self._stamp() != self._loaded_stamp:
+            logger.info("Key files changed since the keyring was loaded - reloading")
+            self.reload()
+            self.load()
+            public_key = self._keys.get(key_id)
+        return public_key
+
+    def current_key(self):
+        """Return the current public key"""
+        self.load()
+        return self._keys.get(self.current_key_id)
+
+    def __contains__(self, key_id: str) -> bool:
+        self.load()
+        return key_id in self._keys
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._keys)
@@ -0,0 +1,213 @@
+"""Compact binary license envelope
+
+Layout (all integers big-endian):
+
+    magic          4 bytes   b'LICB'
+    version        1 byte    schema version of the envelope (BINARY_FORMAT_VERSION)
+    flags          1 byte    reserved, 0
+    payload_len    4 bytes
+    signature_len  2 bytes
+    key_id         8 bytes   ID of the signing key (version 2 and later, see encryption/keyring.py)
+    payload        payload_len bytes    deterministic CBOR encoding of the license data
+    signature      signature_len bytes  RSA-PSS/SHA-256 signature over the payload bytes
+
+The payload is signed as stored, so verification never re-encodes the data.
+"""
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    # Optional C-accelerated decoder; encoding always uses the deterministic encoder below
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+BINARY_MAGIC = b'LICB'
+BINARY_FORMAT_VERSION = 2
+_HEADERS = {
+    1: struct.Struct('>4sBBIH'),
+    2: struct.Struct('>4sBBIH8s')
+}
+
+# License formats selectable per license system
+LICENSE_FORMATS = ('json', 'binary')
+
+def is_binary_license(data: bytes) -> bool:
+    """Return True if the bytes start with the binary license magic"""
+    return data[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+def pack_binary_license(payload: bytes, signature: bytes, key_id: bytes) -> bytes:
+    """Build a binary license from an encoded payload, its signature and the signing key ID"""
+    header = _HEADERS[BINARY_FORMAT_VERSION].pack(
+        BINARY_MAGIC, BINARY_FORMAT_VERSION, 0, len(payload), len(signature), key_id)
+    return header + payload + signature
+
+class BinaryLicense:
+    """
+    Zero-copy view over a binary license
+
+    payload and signature are memoryview slices of the original buffer; the
+    payload is only decoded when data is first accessed.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if len(view) < 5 or bytes(view[:4]) != BINARY_MAGIC:
+            raise ValueError("Not a binary license")
+        version = view[4]
+        header = _HEADERS.get(version)
+        if header is None:
+            raise ValueError(f"Unsupported binary license version: {version}")
+        if len(view) < header.size:
+            raise ValueError("Binary license is truncated")
+        fields = header.unpack_from(view)
+        _, _, flags, payload_len, signature_len = fields[:5]
+        end = header.size + payload_len + signature_len
+        if len(view) < end:
+            raise ValueError("Binary license is truncated")
+
+        self.version = version
+        self.flags = flags
+        # Version 1 licenses predate key IDs and are verified with the current key
+        self.key_id: Optional[str] = fields[5].hex() if version >= 2 else None
+        self.payload = view[header.size:header.size + payload_len]
+        self.signature = view[header.size + payload_len:end]
+        self._data = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Decoded license data"""
+        if self._data is None:
+            self._data = decode_cbor(self.payload)
+        return self._data
+
+# Deterministic CBOR (RFC 8949 section 4.2.1) for the JSON-compatible subset
+# used by license data: None, bool, int, float, str, bytes, list and dict.
+
+def _encode_head(major: int, value: int, out: bytearray):
+    if value < 24:
+        out.append((major << 5) | value)
+    elif value < 0x100:
+        out.append((major << 5) | 24)
+        out.append(value)
+    elif value < 0x10000:
+        out.append((major << 5) | 25)
+        out += value.to_bytes(2, 'big')
+    elif value < 0x100000000:
+        out.append((major << 5) | 26)
+        out += value.to_bytes(4, 'big')
+    else:
+        out.append((major << 5) | 27)
+        out += value.to_bytes(8, 'big')
+
+def _encode(value: Any, out: bytearray):
+    if value is None:
+        out.append(0xf6)
+    elif value is True:
+        out.append(0xf5)
+    elif value is False:
+        out.append(0xf4)
+    elif isinstance(value, int):
+        if value >= 0:
+            _encode_head(0, value, out)
+        else:
+            _encode_head(1, -1 - value, out)
+    elif isinstance(value, float):
+        out.append(0xfb)
+        out += struct.pack('>d', value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _encode_head(3, len(encoded), out)
+        out += encoded
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _encode_head(2, len(value), out)
+        out += value
+    elif isinstance(value, (list, tuple)):
+        _encode_head(4, len(value), out)
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        # Deterministic order: bytewise order of the encoded keys
+        items = []
+        for key, item in value.items():
+            encoded_key = bytearray()
+            _encode(key, encoded_key)
+            items.append((bytes(encoded_key), item))
+        items.sort(key=lambda pair: pair[0])
+        _encode_head(5, len(items), out)
+        for encoded_key, item in items:
+            out += encoded_key
+            _encode(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} in a binary license")
+
+def encode_cbor(value: Any) -> bytes:
+    """Encode a value as deterministic CBOR"""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+_unpack_u16 = struct.Struct('>H').unpack_from
+_unpack_u32 = struct.Struct('>I').unpack_from
+_unpack_u64 = struct.Struct('>Q').unpack_from
+_unpack_f64 = struct.Struct('>d').unpack_from
+
+def _decode(buffer, offset: int) -> Tuple[Any, int]:
+    # Head parsing is inlined - this runs once per item and dominates decode time
+    initial = buffer[offset]
+    offset += 1
+    major = initial >> 5
+    info = initial & 0x1f
+    if info < 24:
+        value = info
+    elif info == 24:
+        value = buffer[offset]
+        offset += 1
+    elif info == 25 and major != 7:
+        value = _unpack_u16(buffer, offset)[0]
+        offset += 2
+    elif info == 26 and major != 7:
+        value = _unpack_u32(buffer, offset)[0]
+        offset += 4
+    elif info == 27:
+        if major == 7:
+            return _unpack_f64(buffer, offset)[0], offset + 8
+        value = _unpack_u64(buffer, offset)[0]
+        offset += 8
+    else:
+        raise ValueError(f"Unsupported CBOR item (initial byte {initial:#04x})")
+
+    if major == 3:
+        end = offset + value
+        return str(buffer[offset:end], 'utf-8'), end
+    if major == 5:
+        result = {}
+        for _ in range(value):
+            key, offset = _decode(buffer, offset)
+            result[key], offset = _decode(buffer, offset)
+        return result, offset
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, offset = _decode(buffer, offset)
+            items.append(item)
+        return items, offset
+    if major == 0:
+        return value, offset
+    if major == 1:
+        return -1 - value, offset
+    if major == 2:
+        end = offset + value
+        return bytes(buffer[offset:end]), end
+    if major == 7 and value in (20, 21, 22):
+        return (False, True, None)[value - 20], offset
+    raise ValueError(f"Unsupported CBOR item (major type {major})")
+
+def decode_cbor(buffer) -> Any:
+    """Decode a CBOR item from a bytes-like object"""
+    if cbor2 is not None:
+        return cbor2.loads(buffer)
+    value, offset = _decode(buffer, 0)
+    if offset != len(buffer):
+        raise ValueError("Trailing data after CBOR item")
+    return value
@@ -1,75 +1,284 @@
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
 import json
 import base64
 import logging
+import os
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
+from .license_format import (
+    BinaryLicense, encode_cbor, is_binary_license, pack_binary_license
+)
+from .signing_client import RemoteSigningKey, connect_signing_daemon
+from .keyring import Keyring, key_id_bytes
+from utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
+SIGN_SECONDS = metrics.histogram('license_sign_seconds', 'Time to sign a license', ['format'])
+VERIFY_SECONDS = metrics.histogram('license_verify_seconds', 'Time to verify a license signature', ['format'])
+VERIFY_TOTAL = metrics.counter('license_verify_total', 'License verifications by result', ['format', 'result'])
+
+# Envelope format written by sign_license_data: 'payload' holds the signed canonical JSON
+# and 'key_id' the ID of the signing key (see encryption/keyring.py).
+# Files without 'format' are legacy licenses that store the data object directly.
+ENVELOPE_FORMAT = 2
+
+def _pss_sha256():
+    """Return (padding, hash) for RSA-PSS/SHA-256
+    cryptography is imported here rather than at module level to keep GUI startup fast
+    """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+    return (
+        padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.MAX_LENGTH
+        ),
+        hashes.SHA256()
+    )
+
 class LicenseSigner:
-    def __init__(self, key_manager):
+    def __init__(self, key_manager, signing_socket=None, keyring: Optional[Keyring] = None):
+        """
+        Args:
+            key_manager: Key manager providing load_private_key/load_public_key
+            signing_socket: Signing daemon socket (default: $LICENSE_SIGNING_SOCKET). Only
+                            when one is given and a daemon holding the key manager's
+                            key answers there is signing delegated to it; otherwise
+                            the private key is loaded here
+            keyring: Public keys to verify with; defaults to the key manager's public key
+                     plus its rotated copies in the configured backup location
+        """
         self.key_manager = key_manager
+        # The daemon is opt-in: never pick up whatever is listening on a default path
+        self.signing_socket = signing_socket or os.environ.get('LICENSE_SIGNING_SOCKET')
+        self.keyring = keyring
+        # Parsed keys are cached so PEM parsing happens once per signer
+        self._private_key = None
+        self._public_key = None
+        self._signing_key_id = None
+        self._key_lock = threading.Lock()
+        
+    def _get_private_key(self):
+        """Return the cached private key, loading it on first use
+        When a signing daemon is running this is a RemoteSigningKey instead
+        """
+        if self._private_key is None:
+            with self._key_lock:
+                if self._private_key is None:
+                    with tracing.span('key.load') as span:
+                        remote_key = None
+                        if self.signing_socket:
+                            # _get_public_key() would take the lock again
+                            if self._public_key is None:
+                                self._public_key = self.key_manager.load_public_key()
+                            remote_key = connect_signing_daemon(self.signing_socket, self._public_key)
+                        self._private_key = remote_key or self.key_manager.load_private_key()
+                        span.set_attribute('source', 'daemon' if isinstance(self._private_key, RemoteSigningKey)
+                                           else 'file')
+        return self._private_key
+        
+    def _get_public_key(self):
+        """Return the cached public key, loading it on first use"""
+        if self._public_key is None:
+            with self._key_lock:
+                if self._public_key is None:
+                    self._public_key = self.key_manager.load_public_key()
+        return self._public_key
+        
+    def _get_keyring(self) -> Keyring:
+        """Return the keyring, creating it on first use"""
+        if self.keyring is None:
+            with self._key_lock:
+                if self.keyring is None:
+                    self.keyring = Keyring.from_key_manager(self.key_manager)
+        return self.keyring
+        
+    def _get_signing_key_id(self) -> bytes:
+        """Key ID of the signing key, embedded in every license it signs"""
+        if self._signing_key_id is None:
+            self._signing_key_id = key_id_bytes(self._get_private_key().public_key())
+        return self._signing_key_id
+        
+    def _public_key_for(self, key_id: Optional[str]):
+        """Public key to verify a license signed with key_id (legacy licenses have none)"""
+        if key_id is None:
+            return self._get_public_key()
+        public_key = self._get_keyring().get(key_id)
+        if public_key is None:
+            raise ValueError(f"License was signed with unknown key {key_id}")
+        return public_key
+        
+    def warm_up(self) -> None:
+        """Load and cache the signing key ahead of the first sign call"""
+        self._get_private_key()
         
-    def sign_license_data(self, license_data: Dict[str, Any]) -> str:
-        """Sign license data and return signed license string"""
+    def reset_keys(self) -> None:
+        """Drop cached keys so the next call reloads them from disk (e.g. after a key rotation)"""
+        with self._key_lock:
+            if isinstance(self._private_key, RemoteSigningKey):
+                self._private_key.client.close()
+            self._private_key = None
+            self._public_key = None
+            self._signing_key_id = None
+        if self.keyring is not None:
+            self.keyring.reload()
+        
+    def sign_license_data(self, license_data: Dict[str, Any],
+                          license_format: str = 'json') -> Union[str, bytes]:
+        """Sign license data and return signed license string
+        
+        The license is written as an envelope whose 'payload' field holds the
+        exact canonical JSON that was signed, so verification can check those
+        bytes directly instead of re-serializing the data. 'key_id' identifies
+        the signing key so licenses still verify after a key rotation.
+        
+        Args:
+            license_data: License data to sign
+            license_format: 'json' (default) or 'binary' for the compact CBOR envelope,
+                            in which case the signed license is returned as bytes
+        """
         try:
             # Add timestamp to license data
             license_data['timestamp'] = datetime.utcnow().isoformat()
             
-            # Convert license data to JSON string
-            license_json = json.dumps(license_data, sort_keys=True)
-            
-            # Sign the license data
-            private_key = self.key_manager.load_private_key()
-            signature = private_key.sign(
-                license_json.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            
-            # Create final license format
-            final_license = {
-                'data': license_data,
-                'signature': base64.b64encode(signature).decode('utf-8')
-            }
+            if license_format == 'binary':
+                with SIGN_SECONDS.labels('binary').time(), tracing.span('license.sign', format='binary'):
+                    return self._sign_binary(license_data)
             
-            return json.dumps(final_license, indent=2)
+            with tracing.span('license.sign', format='json'):
+                # Canonical JSON (sorted keys, ASCII) is both the signed bytes and the payload
+                with tracing.span('license.serialize') as span:
+                    payload = canonical_json(license_data)
+                    span.set_attribute('bytes', len(payload))
+                
+                # Sign the license data
+                with SIGN_SECONDS.labels('json').time():
+                    private_key = self._get_private_key()
+                    pss, sha256 = _pss_sha256()
+                    with tracing.span('rsa.sign'):
+                        signature = private_key.sign(payload.encode('ascii'), pss, sha256)
+                
+                # Create final license format
+                with tracing.span('license.envelope'):
+                    final_license = {
+                        'format': ENVELOPE_FORMAT,
+                        'key_id': self._get_signing_key_id().hex(),
+                        'payload': payload,
+                        'signature': base64.b64encode(signature).decode('utf-8')
+                    }
+                    return json.dumps(final_license, indent=2)
             
         except Exception as e:
             logger.error(f"Failed to sign license: {str(e)}")
             raise
             
-    def verify_license(self, license_string: str) -> bool:
-        """Verify a signed license"""
+    def _sign_binary(self, license_data: Dict[str, Any]) -> bytes:
+        """Sign license data into the compact binary envelope"""
+        with tracing.span('license.serialize') as span:
+            payload = encode_cbor(license_data)
+            span.set_attribute('bytes', len(payload))
+        private_key = self._get_private_key()
+        pss, sha256 = _pss_sha256()
+        with tracing.span('rsa.sign'):
+            signature = private_key.sign(payload, pss, sha256)
+        return pack_binary_license(payload, signature, self._get_signing_key_id())
+        
+    def verify_binary(self, buffer) -> Optional[Dict[str, Any]]:
+        """Verify a binary license
+        
+        Args:
+            buffer: Raw license bytes (bytes, bytearray, mmap or memoryview)
+            
+        Returns:
+            The license data if the signature is valid, None otherwise
+        """
         try:
-            # Parse license
-            license_data = json.loads(license_string)
+            with VERIFY_SECONDS.labels('binary').time():
+                binary_license = BinaryLicense(buffer)
+                public_key = self._public_key_for(binary_license.key_id)
+                pss, sha256 = _pss_sha256()
+                # Payload and signature are views into the buffer - nothing is copied or decoded
+                public_key.verify(binary_license.signature, binary_license.payload, pss, sha256)
+            VERIFY_TOTAL.labels('binary', 'valid').inc()
+            return binary_license.data
             
-            # Extract components
-            data = license_data['data']
-            signature = base64.b64decode(license_data['signature'])
+        except Exception as e:
+            VERIFY_TOTAL.labels('binary', 'invalid').inc()
+            logger.error(f"License verification failed: {str(e)}")
+            return None
+            
+    def verify_envelope(self, envelope: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Verify a parsed license envelope
+        
+        Args:
+            envelope: Parsed license file (payload envelope or legacy 'data' format)
+            
+        Returns:
+            The license data if the signature is valid, None otherwise
+        """
+        try:
+            signature = base64.b64decode(envelope['signature'])
             
-            # Verify signature
-            public_key = self.key_manager.load_public_key()
-            data_json = json.dumps(data, sort_keys=True)
+            if 'payload' in envelope:
+                # Signed bytes are stored verbatim - no re-serialization needed
+                signed_bytes = envelope['payload'].encode('ascii')
+            else:
+                # Legacy licenses stored only the data; rebuild the signed JSON
+                signed_bytes = json.dumps(envelope['data'], sort_keys=True).encode()
             
-            public_key.verify(
-                signature,
-                data_json.encode(),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            # The key ID picks the verification key directly - no trying each key in turn
+            with VERIFY_SECONDS.labels('json').time():
+                public_key = self._public_key_for(envelope.get('key_id'))
+                pss, sha256 = _pss_sha256()
+                public_key.verify(signature, signed_bytes, pss, sha256)
+            VERIFY_TOTAL.labels('json', 'valid').inc()
             
-            return True
+            return envelope_data(envelope)
             
+        except Exception as e:
+            VERIFY_TOTAL.labels('json', 'invalid').inc()
+            logger.error(f"License verification failed: {str(e)}")
+            return None
+            
+    def verify_license_bytes(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        """Verify raw license file contents in either format
+        
+        Returns:
+            The license data if the signature is valid, None otherwise
+        """
+        if is_binary_license(raw):
+            return self.verify_binary(raw)
+        try:
+            envelope = json.loads(raw)
+        except Exception as e:
+            logger.error(f"License verification failed: {str(e)}")
+            return None
+        return self.verify_envelope(envelope)
+            
+    def verify_license(self, license_string: Union[str, bytes]) -> bool:
+        """Verify a signed license (JSON or binary)"""
+        if isinstance(license_string, (bytes, bytearray)) and is_binary_license(license_string):
+            return self.verify_binary(license_string) is not None
+        try:
+            envelope = json.loads(license_string)
         except Exception as e:
             logger.error(f"License verification failed: {str(e)}")
             return False
+        return self.verify_envelope(envelope) is not None
+
+def canonical_json(data: Dict[str, Any]) -> str:
+    """Serialize license data to the canonical form that gets signed"""
+    return json.dumps(data, sort_keys=True)
+
+def read_license_data(raw: bytes) -> Dict[str, Any]:
+    """Return the license data from raw license file bytes (any format) without verifying it"""
+    if is_binary_license(raw):
+        return BinaryLicense(raw).data
+    return envelope_data(json.loads(raw))
+
+def envelope_data(envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the license data from an envelope (payload or legacy format) without verifying it"""
+    if 'payload' in envelope:
+        return json.loads(envelope['payload'])
+    return envelope['data']
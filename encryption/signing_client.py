@@ -0,0 +1,208 @@
+"""Client side of the local signing daemon (tools/signing_daemon.py)
+
+Wire protocol, all integers big-endian. Each frame is a 9-byte header followed
+by a body:
+
+    request:   request_id u32 | op u8     | length u32 | payload
+    response:  request_id u32 | status u8 | length u32 | signature, or an error message
+
+Requests are pipelined: a client can send any number of requests without
+waiting, and the daemon answers each one with the same request_id, possibly
+out of order.
+"""
+import os
+import socket
+import struct
+import threading
+import logging
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.file_operations import owned_by_current_user, user_runtime_dir
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('>IBI')
+MAX_FRAME_SIZE = 1024 * 1024
+
+OP_PING = 0
+OP_SIGN = 1
+OP_PUBLIC_KEY = 2
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+def default_socket_path() -> Path:
+    """Socket used by the signing daemon (LICENSE_SIGNING_SOCKET overrides the default)
+
+    The default lives in the per-user runtime directory (see user_runtime_dir)
+    so other local users can neither connect to the daemon nor put their own
+    socket in its place.
+    """
+    return Path(os.environ.get('LICENSE_SIGNING_SOCKET') or user_runtime_dir() / 'license_signer.sock')
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from a socket"""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Signing daemon closed the connection")
+        buffer += chunk
+    return bytes(buffer)
+
+class SigningClient:
+    """
+    Thread-safe, pipelined connection to the signing daemon
+
+    Any number of threads can submit requests over one connection; a reader
+    thread matches responses to their futures by request ID.
+    """
+
+    def __init__(self, socket_path: Path = None, timeout: float = 30.0):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._next_id = 0
+
+    def _connect(self):
+        """Open the connection and start the response reader (called with the lock held)"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(self.socket_path))
+        self._sock = sock
+        reader = threading.Thread(target=self._read_responses, args=(sock,), daemon=True,
+                                  name='signing-client-reader')
+        reader.start()
+
+    def _read_responses(self, sock: socket.socket):
+        try:
+            while True:
+                request_id, status, length = FRAME_HEADER.unpack(recv_exact(sock, FRAME_HEADER.size))
+                body = recv_exact(sock, length) if length else b''
+                with self._lock:
+                    future = self._pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if status == STATUS_OK:
+                    future.set_result(body)
+                else:
+                    future.set_exception(RuntimeError(body.decode('utf-8', 'replace')))
+        except OSError as e:
+            self._fail_pending(sock, e)
+
+    def _fail_pending(self, sock: socket.socket, error: Exception):
+        """Fail every outstanding request after the connection drops"""
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+            pending, self._pending = self._pending, {}
+        try:
+            sock.close()
+        except OSError:
+            pass
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"Signing daemon connection lost: {error}"))
+
+    def submit(self, payload: bytes, op: int = OP_SIGN) -> Future:
+        """Send a request without waiting for its response"""
+        if len(payload) > MAX_FRAME_SIZE:
+            raise ValueError("Payload too large for the signing daemon")
+        future = Future()
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            self._next_id = (self._next_id + 1) & 0xffffffff
+            request_id = self._next_id
+            self._pending[request_id] = future
+            try:
+                self._sock.sendall(FRAME_HEADER.pack(request_id, op, len(payload)) + payload)
+            except OSError:
+                self._pending.pop(request_id, None)
+                raise
+        return future
+
+    def sign(self, payload: bytes) -> bytes:
+        """Sign payload bytes with the daemon's key (RSA-PSS/SHA-256)"""
+        return self.submit(payload).result(self.timeout)
+
+    def sign_many(self, payloads: Iterable[bytes]) -> List[bytes]:
+        """Sign several payloads, pipelining all requests before waiting"""
+        futures = [self.submit(payload) for payload in payloads]
+        return [future.result(self.timeout) for future in futures]
+
+    def public_key_der(self) -> bytes:
+        """DER-encoded public key matching the daemon's signing key"""
+        return self.submit(b'', op=OP_PUBLIC_KEY).result(self.timeout)
+
+    def ping(self) -> None:
+        """Round-trip an empty request; raises if the daemon isn't reachable"""
+        self.submit(b'', op=OP_PING).result(self.timeout)
+
+    def close(self) -> None:
+        """Close the connection"""
+        with self._lock:
+            sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+class RemoteSigningKey:
+    """
+    Stands in for a cryptography private key inside LicenseSigner.
+    The key itself stays in the daemon, which always signs with RSA-PSS/SHA-256.
+    """
+
+    def __init__(self, client: SigningClient):
+        self.client = client
+        self._public_key = None
+
+    def sign(self, data, padding=None, algorithm=None) -> bytes:
+        return self.client.sign(bytes(data))
+
+    def public_key(self):
+        """Public half of the daemon's key (used for the license key ID)"""
+        if self._public_key is None:
+            from cryptography.hazmat.primitives import serialization
+            self._public_key = serialization.load_der_public_key(self.client.public_key_der())
+        return self._public_key
+
+def connect_signing_daemon(socket_path: Path = None, expected_public_key=None) -> Optional[RemoteSigningKey]:
+    """
+    Return a RemoteSigningKey if a signing daemon answers on the socket, None otherwise
+
+    Args:
+        socket_path: Daemon socket (default: default_socket_path())
+        expected_public_key: Public key the daemon must be signing with; a daemon
+                             holding any other key is not used
+    """
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    if not socket_path.exists():
+        return None
+    if not owned_by_current_user(socket_path):
+        logger.error(f"Ignoring signing daemon socket {socket_path}: it belongs to another user")
+        return None
+    client = SigningClient(socket_path)
+    try:
+        client.ping()
+        remote_key = RemoteSigningKey(client)
+        if expected_public_key is not None:
+            from .keyring import key_id_for
+            remote_id, expected_id = key_id_for(remote_key.public_key()), key_id_for(expected_public_key)
+            if remote_id != expected_id:
+                logger.error(f"Signing daemon at {socket_path} holds key {remote_id}, "
+                             f"expected {expected_id}; signing locally")
+                client.close()
+                return None
+    except Exception as e:
+        logger.warning(f"Signing daemon at {socket_path} is not responding ({e}); signing locally")
+        client.close()
+        return None
+    logger.info(f"Signing through daemon at {socket_path}")
+    return remote_key
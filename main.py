@@ -1,34 +1,41 @@
 import sys
+import argparse
+import contextlib
 import logging
 from pathlib import Path
-import json
 import os
-from PyQt5.QtWidgets import QApplication
 
-# Local imports
-from ui.main_window import MainWindow
+# Local imports (the GUI is imported in run() so --profile-startup can time it)
 from utils.file_operations import ensure_directory_exists
+from config.config_service import get_config_service
+from config.config_schema import CONFIG_SCHEMA
+from utils.logging_config import setup_logging
+from utils.startup_profiler import StartupProfiler
+from utils import tracing
 
 class LicenseManagementSystem:
-    def __init__(self):
+    def __init__(self, profiler: StartupProfiler = None):
         # Initialize config file path
         self.config_file = Path("config/config.json")
-        self.setup_logging()
-        self.load_config()
+        self.profiler = profiler
+        with self._phase("Logging setup"):
+            self.setup_logging()
+        with self._phase("Config load"):
+            self.load_config()
+        
+    def _phase(self, name):
+        """Time a startup phase when profiling, otherwise do nothing"""
+        if self.profiler:
+            return self.profiler.phase(name)
+        return contextlib.nullcontext()
         
     def setup_logging(self):
         """Configure logging for the application"""
         log_dir = Path("logs")
         ensure_directory_exists(log_dir)
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / "app.log"),
-                logging.StreamHandler()
-            ]
-        )
+        # Queued: file writes and rotation happen on a background thread
+        setup_logging(log_dir / "app.log")
         self.logger = logging.getLogger(__name__)
         self.logger.info("License Management System starting...")
 
@@ -38,11 +45,8 @@ class LicenseManagementSystem:
             # Ensure config directory exists
             ensure_directory_exists(self.config_file.parent)
             
-            if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
-            else:
-                self.config = {}
+            # Shared, cached config (the main window watches it for external edits)
+            self.config = get_config_service(self.config_file, CONFIG_SCHEMA).get()
             
             # Initialize paths if not present
             if 'paths' not in self.config:
@@ -64,22 +68,56 @@ class LicenseManagementSystem:
             self.logger.error(f"Failed to load configuration: {str(e)}")
             raise
 
-    def run(self):
+    def run(self, qt_args=None):
         """Initialize and run the application"""
         try:
-            app = QApplication(sys.argv)
-            # Remove the license_systems parameter since MainWindow doesn't expect it
-            main_window = MainWindow(self.config)
-            main_window.show()
+            with self._phase("Import PyQt5 + ui.main_window"):
+                from PyQt5.QtWidgets import QApplication
+                from PyQt5.QtCore import QTimer
+                from ui.main_window import MainWindow
+            
+            with self._phase("QApplication"):
+                app = QApplication(qt_args if qt_args is not None else sys.argv)
+            
+            with self._phase("MainWindow construction"):
+                # Remove the license_systems parameter since MainWindow doesn't expect it
+                main_window = MainWindow(self.config)
+            
+            with self._phase("MainWindow.show"):
+                main_window.show()
+            
+            if self.profiler:
+                # Fires once the event loop has processed the first paint
+                QTimer.singleShot(0, self.report_startup)
             return app.exec_()
         except Exception as e:
             self.logger.error(f"Failed to start application: {str(e)}")
             return 1
 
+    def report_startup(self):
+        """Print the startup profile after first paint"""
+        self.profiler.mark("Time to first paint")
+        self.profiler.remove_import_hook()
+        self.profiler.report()
+
 def main():
     """Entry point of the application"""
-    lms = LicenseManagementSystem()
-    sys.exit(lms.run())
+    parser = argparse.ArgumentParser(description='License Management System')
+    parser.add_argument('--profile-startup', action='store_true',
+                      help='Print an import-time and initialization breakdown after first paint')
+    parser.add_argument('--trace', default=None,
+                      help='Write a timing trace of license generation to this file '
+                           '(.jsonl for JSON lines, else Chrome trace)')
+    args, qt_args = parser.parse_known_args()
+    tracing.configure(args.trace)
+    
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler()
+        profiler.install_import_hook()
+    
+    lms = LicenseManagementSystem(profiler)
+    sys.exit(lms.run([sys.argv[0]] + qt_args))
 
 if __name__ == "__main__":
     main()
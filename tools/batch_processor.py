@@ -5,30 +5,53 @@ import json
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Union
+import time
 
 # Custom module imports for license generation and encryption
-from core.license_generator import LicenseGenerator
+from config.config_service import get_config_service
+from core.license_generator import LicenseGeneratorFactory
+from core.license_pipeline import LicensePipeline, LicenseJob
+from core.product import Product
 from encryption.key_management import KeyManager
 from encryption.license_signing import LicenseSigner
+from utils.file_operations import atomic_write
+from utils.logging_config import setup_logging
+from utils import metrics, tracing
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+ROWS_TOTAL = metrics.counter('batch_rows_total', 'CSV rows processed by result', ['result'])
+ROWS_PER_SECOND = metrics.gauge('batch_rows_per_second', 'Licenses generated per second in the last batch')
+RUN_SECONDS = metrics.histogram('batch_run_seconds', 'Time to generate all licenses of a batch',
+                                buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600))
+
 class BatchLicenseProcessor:
     """
     Handles bulk processing of license requests from CSV files.
     Manages concurrent license generation with thread pooling.
     """
-    def __init__(self, config_path: Path, output_dir: Path):
+    def __init__(self, config_path: Path, output_dir: Path, key_manager: KeyManager = None):
         # Initialize paths and core components
         self.config_path = config_path
         self.output_dir = output_dir
         # Set up encryption and signing infrastructure
-        self.key_manager = KeyManager(Path('config/rsa_keys'))
+        self.key_manager = key_manager or KeyManager(Path('config/rsa_keys'))
         self.signer = LicenseSigner(self.key_manager)
-        self.generator = LicenseGenerator(self.signer)
+        # Per-system license formats (json/binary) come from the configuration
+        if config_path.exists():
+            config = get_config_service(config_path).get()
+            LicenseGeneratorFactory.load_license_formats(config.get('license_systems', {}))
+        # Shared generate/sign/save pipeline (also used by the GUI generation queue)
+        self.pipeline = LicensePipeline(self.signer, self.save_license)
+
+    def save_license(self, job: LicenseJob, license_data: Union[str, bytes]) -> Path:
+        """Save a signed license to the output directory as <customer_id>.lic"""
+        output_path = self.output_dir / f"{job.customer_info['id']}.lic"
+        with tracing.span('license.save'), tracing.span('file.write', path=str(output_path),
+                                                        bytes=len(license_data)):
+            return atomic_write(output_path, license_data)
 
     def process_csv(self, csv_path: Path, max_workers: int = 4) -> Dict[str, str]:
         """
@@ -48,28 +71,82 @@ class BatchLicenseProcessor:
             reader = csv.DictReader(f)
             tasks = list(reader)
 
-        # Process licenses concurrently using thread pool
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Create future objects for each license task
-            future_to_task = {
-                executor.submit(self.process_single_license, task): task
-                for task in tasks
-            }
-
-            # Process completed tasks as they finish
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    customer_id = task['customer_id']
-                    result = future.result()
-                    results[customer_id] = result
-                except Exception as e:
-                    # Log any errors and store them in results
-                    logger.error(f"Error processing license for {task.get('customer_id')}: {e}")
-                    results[task.get('customer_id')] = f"Error: {str(e)}"
+        # Convert rows to jobs up front so bad rows are reported individually
+        jobs = []
+        for task in tasks:
+            try:
+                jobs.append(self.build_job(task))
+            except Exception as e:
+                logger.error(f"Error processing license for {task.get('customer_id')}: {e}")
+                results[task.get('customer_id')] = f"Error: {str(e)}"
+                ROWS_TOTAL.labels('invalid').inc()
+
+        # Process licenses concurrently through the shared pipeline
+        with tracing.span('batch.process_csv', rows=len(tasks), workers=max_workers):
+            self.pipeline.warm_up()
+            start = time.perf_counter()
+            for result in self.pipeline.process_many(jobs, max_workers=max_workers):
+                customer_id = result.job.customer_info['id']
+                if result.success:
+                    results[customer_id] = f"Success: License saved to {result.output_path}"
+                    ROWS_TOTAL.labels('success').inc()
+                else:
+                    results[customer_id] = f"Error: Failed to process license: {result.error}"
+                    ROWS_TOTAL.labels('error').inc()
+            elapsed = time.perf_counter() - start
+
+        if jobs:
+            RUN_SECONDS.observe(elapsed)
+            ROWS_PER_SECOND.set(len(jobs) / elapsed if elapsed else 0)
+            logger.info(f"Processed {len(jobs)} licenses in {elapsed:.2f}s "
+                        f"({len(jobs) / elapsed if elapsed else 0:.1f} licenses/s)")
 
         return results
 
+    def build_job(self, data: Dict) -> LicenseJob:
+        """
+        Build a pipeline job from a CSV row
+        
+        Args:
+            data: Dictionary containing license request details
+        
+        Returns:
+            LicenseJob ready for the pipeline
+        """
+        # Extract customer information
+        customer_info = {
+            'name': data['customer_name'],
+            'id': data['customer_id'],
+            'email': data['email']
+        }
+
+        # Calculate license validity periods
+        validity_days = int(data.get('validity_days', 365))  # Default 1 year
+        maintenance_days = int(data.get('maintenance_days', 90))  # Default 90 days
+        
+        expiration_date = datetime.now() + timedelta(days=validity_days)
+        maintenance_date = datetime.now() + timedelta(days=maintenance_days)
+
+        # Prepare license configuration
+        license_info = {
+            'license_type': data.get('license_type', 'node_locked'),
+            'expiration_date': expiration_date.isoformat(),
+            'maintenance_date': maintenance_date.isoformat(),
+            'platforms': data.get('platforms', '').split(',')
+        }
+
+        # Parse product information from JSON string
+        products = [Product.from_dict(p) for p in json.loads(data.get('products', '[]'))]
+
+        return LicenseJob(
+            license_system=data.get('license_system', 'nodelock'),
+            customer_info=customer_info,
+            license_info=license_info,
+            products=products,
+            host_info={},  # Empty host info - will be collected during activation
+            job_id=data['customer_id']
+        )
+
     def process_single_license(self, data: Dict) -> str:
         """
         Generate a single license file from the provided data
@@ -81,44 +158,10 @@ class BatchLicenseProcessor:
             Success message with output path or error message
         """
         try:
-            # Extract customer information
-            customer_info = {
-                'name': data['customer_name'],
-                'id': data['customer_id'],
-                'email': data['email']
-            }
-
-            # Calculate license validity periods
-            validity_days = int(data.get('validity_days', 365))  # Default 1 year
-            maintenance_days = int(data.get('maintenance_days', 90))  # Default 90 days
-            
-            expiration_date = datetime.now() + timedelta(days=validity_days)
-            maintenance_date = datetime.now() + timedelta(days=maintenance_days)
-
-            # Prepare license configuration
-            license_info = {
-                'type': data.get('license_type', 'node_locked'),
-                'expiration_date': expiration_date,
-                'maintenance_date': maintenance_date,
-                'platforms': data.get('platforms', '').split(',')
-            }
-
-            # Parse product information from JSON string
-            products = json.loads(data.get('products', '[]'))
-
-            # Generate the license using core generator
-            license_data = self.generator.generate_license(
-                customer_info,
-                license_info,
-                products,
-                {}  # Empty host info - will be collected during activation
-            )
-
-            # Save license to output directory
-            output_path = self.output_dir / f"{data['customer_id']}.lic"
-            self.generator.save_license(license_data, output_path)
-
-            return f"Success: License saved to {output_path}"
+            result = self.pipeline.process(self.build_job(data))
+            if not result.success:
+                raise Exception(result.error)
+            return f"Success: License saved to {result.output_path}"
 
         except Exception as e:
             raise Exception(f"Failed to process license: {str(e)}")
@@ -139,18 +182,19 @@ def main():
                       help='Number of worker threads')
     parser.add_argument('--log-file', default='logs/batch_processor.log',
                       help='Log file path')
+    parser.add_argument('--metrics-file', default=None,
+                      help='Write Prometheus metrics to this file when done')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                      help='Serve Prometheus metrics on this local port while running')
+    parser.add_argument('--trace', default=None,
+                      help='Write a timing trace to this file (.jsonl for JSON lines, else Chrome trace)')
 
     args = parser.parse_args()
+    tracing.configure(args.trace)
+    metrics.configure(args.metrics_port, args.metrics_file)
 
-    # Configure logging to both file and console
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(args.log_file),
-            logging.StreamHandler()
-        ]
-    )
+    # Configure logging to both file and console (queued, so log I/O stays off the worker threads)
+    setup_logging(Path(args.log_file))
 
     # Ensure output directory exists
     output_dir = Path(args.output_dir)
@@ -1,12 +1,79 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 import json
 from datetime import datetime
 
+from utils.file_operations import atomic_write
+
+def _parse_public_key(key_path: Path) -> Dict:
+    """Key ID and size of a PEM public key"""
+    from cryptography.hazmat.primitives import serialization
+    from encryption.keyring import key_id_for
+    public_key = serialization.load_pem_public_key(key_path.read_bytes())
+    return {'key_id': key_id_for(public_key), 'key_size': public_key.key_size}
+
+class KeyCache:
+    """
+    Parsed key facts (key ID, size) per key file, reused while the file's
+    mtime and size are unchanged. Optionally persisted to a JSON file so
+    repeated fleet checks only parse keys that changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        if path is not None and path.exists():
+            try:
+                with open(path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.getLogger(__name__).warning(f"Ignoring unreadable key cache {path}: {e}")
+
+    def get(self, key_path: Path) -> Dict:
+        """Parsed facts for a public key file; a parse failure is returned as {'error': ...}"""
+        stat = key_path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cache_key = str(key_path.resolve())
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry['stamp'] == stamp:
+                self.hits += 1
+                return entry['facts']
+            self.misses += 1
+        try:
+            facts = _parse_public_key(key_path)
+        except Exception as e:
+            facts = {'error': f"Cannot parse public key: {e}"}
+        with self._lock:
+            self._entries[cache_key] = {'stamp': stamp, 'facts': facts}
+        return facts
+
+    def save(self) -> None:
+        if self.path is not None:
+            with self._lock:
+                content = json.dumps(self._entries)
+            atomic_write(self.path, content)
+
 class KeyHealthChecker:
-    def __init__(self, install_path: Path):
+    def __init__(self, install_path: Path, expected_key_id: Optional[str] = None,
+                 key_cache: Optional[KeyCache] = None, rotation_warning_days: int = 14):
+        """
+        Args:
+            install_path: Installation to check
+            expected_key_id: Key ID (fingerprint) the installed public key must have
+            key_cache: Shared cache of parsed keys (fleet checks)
+            rotation_warning_days: Warn when key rotation is due within this many days
+        """
         self.install_path = install_path
+        self.expected_key_id = expected_key_id
+        self.key_cache = key_cache or KeyCache()
+        self.rotation_warning_days = rotation_warning_days
         self.logger = logging.getLogger(__name__)
         
     def run_health_check(self) -> Dict:
@@ -25,6 +92,10 @@ class KeyHealthChecker:
         key_check = self.check_keys()
         results['checks'].append(key_check)
         
+        # Check key rotation schedule
+        rotation_check = self.check_rotation()
+        results['checks'].append(rotation_check)
+        
         # Check permissions
         perm_check = self.check_permissions()
         results['checks'].append(perm_check)
@@ -71,16 +142,68 @@ class KeyHealthChecker:
                 'details': {'error': 'Key directory not found'}
             }
             
+        details = {'issues': issues}
         public_key = key_dir / 'public_key.pem'
         if not public_key.exists():
             issues.append('Public key not found')
-            
-        # Add more key-specific checks here
+        else:
+            # Parse the key (cached while the file is unchanged) and compare fingerprints
+            facts = self.key_cache.get(public_key)
+            if 'error' in facts:
+                issues.append(facts['error'])
+            else:
+                details.update(facts)
+                if self.expected_key_id and facts['key_id'] != self.expected_key_id:
+                    issues.append(f"Public key {facts['key_id']} does not match expected key {self.expected_key_id}")
         
         return {
             'name': 'Key Files Check',
             'status': 'fail' if issues else 'pass',
-            'details': {'issues': issues}
+            'details': details
+        }
+        
+    def check_rotation(self) -> Dict:
+        """Check next_rotation_date in key_metadata.json"""
+        metadata_path = self.install_path / 'config/keys' / 'key_metadata.json'
+        if not metadata_path.exists():
+            return {
+                'name': 'Key Rotation Check',
+                'status': 'warning',
+                'details': {'issues': ['key_metadata.json not found']}
+            }
+        try:
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+            next_rotation = metadata['next_rotation_date']
+            # KeyManager writes a timestamp; accept ISO dates as well
+            if isinstance(next_rotation, (int, float)):
+                next_rotation = datetime.fromtimestamp(next_rotation)
+            else:
+                next_rotation = datetime.fromisoformat(next_rotation)
+        except Exception as e:
+            return {
+                'name': 'Key Rotation Check',
+                'status': 'warning',
+                'details': {'issues': [f'Cannot read next_rotation_date: {e}']}
+            }
+        
+        days_left = (next_rotation - datetime.now()).total_seconds() / 86400
+        issues = []
+        status = 'pass'
+        if days_left < 0:
+            status = 'fail'
+            issues.append(f'Key rotation overdue by {-days_left:.0f} days')
+        elif days_left < self.rotation_warning_days:
+            status = 'warning'
+            issues.append(f'Key rotation due in {days_left:.0f} days')
+        return {
+            'name': 'Key Rotation Check',
+            'status': status,
+            'details': {
+                'issues': issues,
+                'next_rotation_date': next_rotation.isoformat(),
+                'key_length': metadata.get('key_length')
+            }
         }
         
     def check_permissions(self) -> Dict:
@@ -104,17 +227,99 @@ class KeyHealthChecker:
             'details': {'issues': issues}
         }
 
+def check_fleet(install_paths: Iterable[Path], expected_key_id: Optional[str] = None,
+                workers: int = 32, key_cache: Optional[KeyCache] = None,
+                rotation_warning_days: int = 14) -> Dict:
+    """
+    Health-check many installations concurrently and aggregate the results
+
+    Args:
+        install_paths: Installations to check
+        expected_key_id: Key ID every installation's public key must have
+        workers: Concurrent checks
+        key_cache: Cache of parsed keys (shared by all checks)
+        rotation_warning_days: Warn when key rotation is due within this many days
+
+    Returns:
+        Report with a summary, counts per installed key ID and per-install results
+    """
+    key_cache = key_cache or KeyCache()
+    start = time.perf_counter()
+
+    def check(install_path: Path) -> Dict:
+        checker = KeyHealthChecker(install_path, expected_key_id, key_cache, rotation_warning_days)
+        try:
+            results = checker.run_health_check()
+        except Exception as e:
+            results = {'timestamp': datetime.now().isoformat(), 'status': 'fail',
+                       'checks': [], 'error': str(e)}
+        return dict(results, install_path=str(install_path))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        installs = list(executor.map(check, [Path(p) for p in install_paths]))
+
+    key_ids = {}
+    for install in installs:
+        for check_result in install['checks']:
+            key_id = check_result['details'].get('key_id')
+            if key_id:
+                key_ids[key_id] = key_ids.get(key_id, 0) + 1
+    statuses = [install['status'] for install in installs]
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'status': 'fail' if 'fail' in statuses else 'warning' if 'warning' in statuses else 'pass',
+        'summary': {
+            'installs': len(installs),
+            'pass': statuses.count('pass'),
+            'warning': statuses.count('warning'),
+            'fail': statuses.count('fail'),
+            'expected_key_id': expected_key_id,
+            'key_cache_hits': key_cache.hits,
+            'key_cache_misses': key_cache.misses,
+            'seconds': round(time.perf_counter() - start, 3)
+        },
+        'key_ids': key_ids,
+        'failing_installs': [install['install_path'] for install in installs if install['status'] == 'fail'],
+        'installs': installs
+    }
+
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='License System Health Check')
-    parser.add_argument('--install-path', required=True, help='Installation path to check')
+    parser.add_argument('--install-path', action='append', default=[],
+                        help='Installation path to check (repeat for a fleet check)')
+    parser.add_argument('--install-paths-file', help='File with one installation path per line (fleet check)')
+    parser.add_argument('--expected-public-key', help='Public key every installation should have')
+    parser.add_argument('--expected-key-id', help='Key ID (fingerprint) every installation should have')
+    parser.add_argument('--rotation-warning-days', type=int, default=14,
+                        help='Warn when key rotation is due within this many days')
+    parser.add_argument('--workers', type=int, default=32, help='Concurrent checks (fleet check)')
+    parser.add_argument('--cache', help='Parsed-key cache file, reused across runs')
     parser.add_argument('--output', help='Output file for results (JSON)')
     
     args = parser.parse_args()
     
-    checker = KeyHealthChecker(Path(args.install_path))
-    results = checker.run_health_check()
+    install_paths = list(args.install_path)
+    if args.install_paths_file:
+        with open(args.install_paths_file, 'r') as f:
+            install_paths.extend(line.strip() for line in f if line.strip())
+    if not install_paths:
+        parser.error("give --install-path or --install-paths-file")
+    
+    expected_key_id = args.expected_key_id
+    if args.expected_public_key:
+        expected_key_id = _parse_public_key(Path(args.expected_public_key))['key_id']
+    key_cache = KeyCache(Path(args.cache) if args.cache else None)
+    
+    if len(install_paths) == 1 and not args.install_paths_file:
+        checker = KeyHealthChecker(Path(install_paths[0]), expected_key_id, key_cache,
+                                   args.rotation_warning_days)
+        results = checker.run_health_check()
+    else:
+        results = check_fleet(install_paths, expected_key_id, args.workers, key_cache,
+                              args.rotation_warning_days)
+    key_cache.save()
     
     if args.output:
         with open(args.output, 'w') as f:
@@ -6,13 +6,18 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import json
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 from core.key_manager import KeyManager
+from encryption.key_management import KeyManager as KeyGenerator
+from encryption.key_pool import start_key_pool
 from config.security_settings import KeySettings, DEFAULT_SECURITY_SETTINGS
+from config.config_service import get_config_service
+from config.config_schema import CONFIG_SCHEMA
 
 class SecuritySettingsDialog(tk.Toplevel):
     def __init__(self, parent, current_settings=None):
@@ -60,9 +65,15 @@ class SecuritySettingsDialog(tk.Toplevel):
         self.rotation_period.insert(0, str(self.settings['key_settings']['rotation_period_days']))
         self.rotation_period.grid(row=5, column=1, pady=5)
 
+        # Key Pool
+        self.key_pool_settings = dict(self.settings.get('key_pool') or DEFAULT_SECURITY_SETTINGS['key_pool'])
+        self.key_pool_enabled = tk.BooleanVar(value=self.key_pool_settings['enabled'])
+        ttk.Checkbutton(main_frame, text="Pre-generate Keys in Background",
+                       variable=self.key_pool_enabled).grid(row=6, column=0, columnspan=2, pady=5)
+
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=7, column=0, columnspan=2, pady=10)
         ttk.Button(button_frame, text="Save", command=self.save_settings).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.LEFT, padx=5)
 
@@ -81,7 +92,8 @@ class SecuritySettingsDialog(tk.Toplevel):
                 'enforce_key_length': True,
                 'minimum_key_length': 2048,
                 'require_password': self.encryption_enabled.get()
-            }
+            },
+            'key_pool': dict(self.key_pool_settings, enabled=self.key_pool_enabled.get())
         }
         self.destroy()
 
@@ -110,15 +122,32 @@ class KeyManagementDashboard:
                 'public_key_path': 'config/keys/public_key.pem'
             }
         
+        # Key generation runs off the UI thread; the pool (if enabled) keeps keys ready for it
+        self.generation_executor = ThreadPoolExecutor(max_workers=1)
+        self.key_pool = self.start_key_pool()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         self.setup_ui()
         
+    def start_key_pool(self):
+        """Start the background key pool if it's enabled in the security settings"""
+        try:
+            return start_key_pool(self.load_security_settings())
+        except Exception as e:
+            logging.error(f"Failed to start key pool: {e}")
+            return None
+            
+    def on_close(self):
+        """Stop the key pool (pooled keys stay on disk) and close the window"""
+        if self.key_pool is not None:
+            self.key_pool.stop(wait=False)
+        self.generation_executor.shutdown(wait=False)
+        self.root.destroy()
+        
     def load_config(self):
         """Load the application configuration"""
         try:
-            config_path = Path('config/config.json')
-            if config_path.exists():
-                with open(config_path) as f:
-                    return json.load(f)
+            return get_config_service(Path('config/config.json'), CONFIG_SCHEMA).get()
         except Exception as e:
             logging.error(f"Failed to load config: {e}")
         return {}
@@ -145,6 +174,8 @@ class KeyManagementDashboard:
         ttk.Button(actions_frame, text="Backup Keys", command=self.backup_keys).grid(row=0, column=2, padx=5)
         ttk.Button(actions_frame, text="Security Settings", 
                   command=self.show_security_settings).grid(row=0, column=3, padx=5)
+        ttk.Button(actions_frame, text="Generate New Keys",
+                  command=self.generate_keys).grid(row=0, column=4, padx=5)
         
         # Status Section
         self.status_var = tk.StringVar()
@@ -225,14 +256,11 @@ class KeyManagementDashboard:
     def save_config(self):
         """Save the updated configuration"""
         try:
-            config_path = Path('config/config.json')
-            config_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            config = self.load_config()
+            config_service = get_config_service(Path('config/config.json'), CONFIG_SCHEMA)
+            config = config_service.get()
             config.setdefault('paths', {})['keys'] = self.key_paths
             
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=4)
+            config_service.save(config)
                 
         except Exception as e:
             logging.error(f"Failed to save config: {e}")
@@ -267,6 +295,38 @@ class KeyManagementDashboard:
             except Exception as e:
                 messagebox.showerror("Backup Error", f"Failed to backup keys: {e}")
 
+    def generate_keys(self):
+        """Generate a new key pair in config/keys, backing up the current one"""
+        if not messagebox.askyesno("Generate New Keys",
+                                   "Replace the current key pair? Existing keys are backed up first."):
+            return
+            
+        settings = self.load_security_settings()
+        password = None
+        if settings['key_settings']['encryption_enabled']:
+            password = simpledialog.askstring("Key Password", "Password for the new private key:", show='*')
+            if password is None:
+                return
+                
+        generator = KeyGenerator(Path('config/keys'), settings_path=Path('config/security_settings.json'),
+                                 key_pool=self.key_pool)
+        future = self.generation_executor.submit(generator.generate_key_pair, password=password)
+        self.status_var.set("Generating new key pair...")
+        self.root.after(100, self.check_generation, future)
+        
+    def check_generation(self, future):
+        """Poll the key generation job (Tk widgets must only be touched from the UI thread)"""
+        if not future.done():
+            self.root.after(100, self.check_generation, future)
+            return
+        try:
+            future.result()
+            self.status_var.set("Generated new key pair")
+            self.refresh_key_info()
+        except Exception as e:
+            self.status_var.set("")
+            messagebox.showerror("Key Generation Error", f"Failed to generate keys: {e}")
+
     def show_security_settings(self):
         """Show the security settings dialog"""
         try:
@@ -276,6 +336,10 @@ class KeyManagementDashboard:
             
             if dialog.result:
                 self.save_security_settings(dialog.result)
+                # Pick up a changed key length or pool setting
+                if self.key_pool is not None:
+                    self.key_pool.stop(wait=False)
+                self.key_pool = self.start_key_pool()
                 messagebox.showinfo("Success", "Security settings updated successfully")
                 
         except Exception as e:
@@ -0,0 +1,72 @@
+# Standard library imports
+import argparse
+import copy
+import time
+from pathlib import Path
+
+# Custom module imports for signing and the binary license format
+from encryption.key_management import KeyManager
+from encryption.license_signing import LicenseSigner, read_license_data
+from encryption.license_format import BinaryLicense
+
+def time_parse(parse, raw, iterations: int) -> float:
+    """Return the mean time in microseconds to parse raw license bytes"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(raw)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def parse_json(raw: bytes):
+    return read_license_data(raw)
+
+def parse_binary(raw: bytes):
+    return BinaryLicense(raw).data
+
+def main():
+    """
+    Compare size and parse time of the JSON and binary license formats.
+    Every license found under the customers directory is re-signed in both
+    formats with the given keys; the original file is left untouched.
+    """
+    parser = argparse.ArgumentParser(description='Compare JSON and binary license formats')
+    parser.add_argument('--customers-dir', default='customers',
+                      help='Directory searched recursively for .lic files')
+    parser.add_argument('--key-dir', default='config/keys',
+                      help='Directory containing private_key.pem and public_key.pem')
+    parser.add_argument('--iterations', type=int, default=2000,
+                      help='Parse iterations per license')
+    args = parser.parse_args()
+
+    signer = LicenseSigner(KeyManager(Path(args.key_dir)))
+    license_files = sorted(Path(args.customers_dir).rglob('*.lic'))
+    if not license_files:
+        print(f"No licenses found in {args.customers_dir}")
+        return
+
+    print(f"{'license':<48} {'orig B':>7} {'json B':>7} {'bin B':>7} "
+          f"{'orig us':>8} {'json us':>8} {'bin us':>8}")
+    totals = [0] * 6
+    for license_file in license_files:
+        original = license_file.read_bytes()
+        data = read_license_data(original)
+        signed_json = signer.sign_license_data(copy.deepcopy(data)).encode('utf-8')
+        signed_binary = signer.sign_license_data(copy.deepcopy(data), license_format='binary')
+
+        row = [
+            len(original), len(signed_json), len(signed_binary),
+            time_parse(parse_json, original, args.iterations),
+            time_parse(parse_json, signed_json, args.iterations),
+            time_parse(parse_binary, signed_binary, args.iterations)
+        ]
+        totals = [total + value for total, value in zip(totals, row)]
+        name = str(license_file.relative_to(args.customers_dir))
+        print(f"{name:<48} {row[0]:>7} {row[1]:>7} {row[2]:>7} "
+              f"{row[3]:>8.1f} {row[4]:>8.1f} {row[5]:>8.1f}")
+
+    count = len(license_files)
+    print(f"{'mean of ' + str(count):<48} {totals[0] / count:>7.0f} {totals[1] / count:>7.0f} "
+          f"{totals[2] / count:>7.0f} {totals[3] / count:>8.1f} {totals[4] / count:>8.1f} "
+          f"{totals[5] / count:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,24 @@
-from enum import Enum
-from typing import Dict, Any, List, Tuple, Path
+import argparse
+import hashlib
+import json
+import os
+import shlex
 import shutil
 import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from utils.file_operations import atomic_write
+
+# Command used to restart services; set LICENSE_SYSTEMCTL (e.g. to tools/systemctl_stub.py)
+# to run deployments without touching real services
+SYSTEMCTL = shlex.split(os.environ.get('LICENSE_SYSTEMCTL', 'systemctl'))
 
 class LicenseType(Enum):
     FLEXLM = "FlexLM"
@@ -10,58 +27,104 @@ class LicenseType(Enum):
     NODELOCK = "Node Locked"
     FLOATING = "Floating License"
 
+def restart_service(service: str, target_root: Optional[Path] = None,
+                    command: Optional[List[str]] = None) -> Tuple[bool, str]:
+    """
+    Restart a service with systemctl (or the configured replacement)
+
+    Args:
+        service: Service name
+        target_root: Root the licenses were installed under; passed to the command as
+                     LICENSE_TARGET_ROOT so a wrapper can route the restart to that host
+        command: Command prefix instead of SYSTEMCTL
+    """
+    env = dict(os.environ)
+    if target_root is not None:
+        env['LICENSE_TARGET_ROOT'] = str(target_root)
+    args = [*(command or SYSTEMCTL), 'restart', service]
+    try:
+        result = subprocess.run(args, env=env, capture_output=True, text=True)
+    except OSError as e:
+        # Missing or non-executable command
+        return False, f"Could not run {args[0]}: {e}"
+    output = (result.stdout + result.stderr).strip()
+    return result.returncode == 0, output or f"{service} restarted"
+
 class LicenseInstaller:
     """Handles installation of different license types"""
-    
+
+    # Installer class per license type; instances are created on first use and reused
+    INSTALLERS: Dict[LicenseType, type] = {}
+    _instances: Dict[LicenseType, 'BaseLicenseInstaller'] = {}
+
     @staticmethod
-    def install_license(license_type: LicenseType, license_path: Path, 
+    def install_license(license_type: LicenseType, license_path: Path,
                        options: Dict = None) -> Tuple[bool, str]:
         """Install license file for the specified system"""
         installer = LicenseInstaller._get_installer(license_type)
+        if installer is None:
+            return False, f"No installer for {license_type.value}"
         return installer.install(license_path, options or {})
-    
+
     @staticmethod
-    def _get_installer(license_type: LicenseType) -> 'BaseLicenseInstaller':
-        installers = {
-            LicenseType.FLEXLM: FlexLMInstaller(),
-            LicenseType.HASP: HASPInstaller(),
-            LicenseType.LICENSESERVER: CustomServerInstaller(),
-            # Add other installers...
-        }
-        return installers.get(license_type)
+    def _get_installer(license_type: LicenseType) -> Optional['BaseLicenseInstaller']:
+        installer = LicenseInstaller._instances.get(license_type)
+        if installer is None:
+            installer_class = LicenseInstaller.INSTALLERS.get(license_type)
+            if installer_class is None:
+                return None
+            installer = LicenseInstaller._instances.setdefault(license_type, installer_class())
+        return installer
 
 class BaseLicenseInstaller:
+    # Where licenses go (relative to the target root when deploying) and the service to restart
+    DEFAULT_PATH: Optional[Path] = None
+    SERVICE: Optional[str] = None
+
     def install(self, license_path: Path, options: Dict) -> Tuple[bool, str]:
         raise NotImplementedError()
-    
+
     def verify_installation(self, license_path: Path) -> bool:
         raise NotImplementedError()
 
+    def _configure_service(self, options: Dict):
+        """Hook for system-specific service configuration (nothing by default)"""
+        pass
+
+    def install_dir(self, target_root: Optional[Path] = None) -> Path:
+        """License directory, optionally under another root (e.g. a mounted host filesystem)"""
+        if self.DEFAULT_PATH is None:
+            raise ValueError(f"{type(self).__name__} does not install license files")
+        if target_root is None:
+            return self.DEFAULT_PATH
+        return Path(target_root) / self.DEFAULT_PATH.relative_to(self.DEFAULT_PATH.anchor)
+
 class FlexLMInstaller(BaseLicenseInstaller):
     DEFAULT_PATH = Path("/opt/flexlm/licenses")
-    
+    SERVICE = 'flexlm'
+
     def install(self, license_path: Path, options: Dict) -> Tuple[bool, str]:
         try:
             # Create directories
             self.DEFAULT_PATH.mkdir(parents=True, exist_ok=True)
-            
+
             # Copy license
             dest_path = self.DEFAULT_PATH / license_path.name
             shutil.copy2(license_path, dest_path)
-            
+
             # Set permissions
             dest_path.chmod(0o644)
-            
+
             # Configure service if needed
             if options.get('configure_service', True):
                 self._configure_service(options)
-            
+
             # Restart service
             if options.get('restart_service', True):
-                subprocess.run(['systemctl', 'restart', 'flexlm'])
-            
+                restart_service(self.SERVICE)
+
             return True, f"FlexLM license installed at {dest_path}"
-            
+
         except Exception as e:
             return False, f"FlexLM installation failed: {str(e)}"
 
@@ -75,21 +138,24 @@ class HASPInstaller(BaseLicenseInstaller):
             return False, f"HASP installation failed: {str(e)}"
 
 class CustomServerInstaller(BaseLicenseInstaller):
+    DEFAULT_PATH = Path("/opt/custom_license_server/licenses")
+    SERVICE = 'custom_license_server'
+
     def install(self, license_path: Path, options: Dict) -> Tuple[bool, str]:
         try:
             # Implement custom license server installation logic
             # copy the license file to the server directory
-            server_path = Path("/opt/custom_license_server/licenses")
+            server_path = self.DEFAULT_PATH
             server_path.mkdir(parents=True, exist_ok=True)
             dest_path = server_path / license_path.name
             shutil.copy2(license_path, dest_path)
-            
+
             # Configure server settings if needed
             # Modify a config file or set environment variables
-            
+
             # Restart the custom license server service
-            subprocess.run(['systemctl', 'restart', 'custom_license_server'])
-            
+            restart_service(self.SERVICE)
+
             return True, f"Custom License Server installed at {dest_path}"
         except Exception as e:
             return False, f"Custom License Server installation failed: {str(e)}"
@@ -97,5 +163,182 @@ class CustomServerInstaller(BaseLicenseInstaller):
     def verify_installation(self, license_path: Path) -> bool:
         # Implement verification logic to ensure the installation was successful
         # Check if the license file exists and the service is running
-        server_path = Path("/opt/custom_license_server/licenses") / license_path.name
+        server_path = self.DEFAULT_PATH / license_path.name
         return server_path.exists()
+
+LicenseInstaller.INSTALLERS.update({
+    LicenseType.FLEXLM: FlexLMInstaller,
+    LicenseType.HASP: HASPInstaller,
+    LicenseType.LICENSESERVER: CustomServerInstaller,
+    # Add other installers...
+})
+
+# Fleet deployment: many licenses to many target roots in one pass
+
+@dataclass
+class DeploymentReport:
+    """Outcome of a deployment: one entry per file copy and per service restart"""
+    files: List[Dict] = field(default_factory=list)
+    restarts: List[Dict] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(f['success'] for f in self.files) and all(r['success'] for r in self.restarts)
+
+    def summary(self) -> Dict:
+        attempted = [r for r in self.restarts if not r.get('skipped')]
+        return {
+            'files': len(self.files),
+            'files_failed': sum(not f['success'] for f in self.files),
+            'restarts': len(attempted),
+            'restarts_failed': sum(not r['success'] for r in attempted),
+            'restarts_skipped': len(self.restarts) - len(attempted),
+            'seconds': round(self.seconds, 3)
+        }
+
+def deploy_licenses(licenses: Iterable[Tuple[LicenseType, Path]], target_roots: Iterable[Path],
+                    workers: int = 16, restart: bool = True,
+                    systemctl: Optional[List[str]] = None) -> DeploymentReport:
+    """
+    Install a set of licenses under every target root concurrently
+
+    Each license is read and hashed once. Every copy is written atomically and
+    its checksum verified before it replaces the old file. Service restarts are
+    coalesced: each (target root, service) is restarted once, as soon as all of
+    its files have landed, while other copies continue. If any of its files
+    failed, the service is not restarted onto a partial set of licenses; the
+    report lists that restart as skipped.
+
+    Args:
+        licenses: (license type, license file) pairs
+        target_roots: Roots to install under (license dirs are relative to each root)
+        workers: Concurrent file copies / restarts
+        restart: Restart the affected services
+        systemctl: Command prefix used for restarts (default: SYSTEMCTL)
+
+    Returns:
+        DeploymentReport with every file and restart outcome
+    """
+    start = time.perf_counter()
+    sources = []
+    for license_type, license_path in licenses:
+        license_path = Path(license_path)
+        data = license_path.read_bytes()
+        sources.append((LicenseInstaller._get_installer(license_type), license_path, data,
+                        hashlib.sha256(data).hexdigest()))
+    target_roots = [Path(root) for root in target_roots]
+
+    # Files still to land and files that failed, per (root, service)
+    pending: Dict[Tuple[Path, str], int] = {}
+    failed: Dict[Tuple[Path, str], int] = {}
+    for root in target_roots:
+        for installer, _, _, _ in sources:
+            if installer is not None and installer.SERVICE:
+                key = (root, installer.SERVICE)
+                pending[key] = pending.get(key, 0) + 1
+    lock = threading.Lock()
+    report = DeploymentReport()
+
+    def copy(root: Path, installer, license_path: Path, data: bytes, digest: str) -> Dict:
+        entry = {'target_root': str(root), 'license': str(license_path), 'sha256': digest}
+        try:
+            if installer is None:
+                raise ValueError("no installer for this license type")
+            dest = installer.install_dir(root) / license_path.name
+            atomic_write(dest, data, sha256=digest, mode=0o644)
+            entry.update(success=True, dest=str(dest))
+        except Exception as e:
+            entry.update(success=False, error=str(e))
+        return entry
+
+    def restart_one(root: Path, service: str) -> Dict:
+        ok, output = restart_service(service, root, systemctl)
+        return {'target_root': str(root), 'service': service, 'success': ok, 'output': output}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        copies = {executor.submit(copy, root, installer, path, data, digest): (root, installer)
+                  for root in target_roots for installer, path, data, digest in sources}
+        restarts = []
+        for future in as_completed(copies):
+            entry = future.result()
+            report.files.append(entry)
+            root, installer = copies[future]
+            if installer is None or not installer.SERVICE:
+                continue
+            key = (root, installer.SERVICE)
+            with lock:
+                pending[key] -= 1
+                failed[key] = failed.get(key, 0) + (not entry['success'])
+                done = pending[key] == 0
+            if not (restart and done):
+                continue
+            if failed[key]:
+                report.restarts.append({
+                    'target_root': str(root), 'service': installer.SERVICE, 'success': False,
+                    'skipped': True, 'output': f"not restarted: {failed[key]} license file(s) failed to install"
+                })
+            else:
+                # Last file for this service on this root - restart once
+                restarts.append(executor.submit(restart_one, *key))
+        for future in as_completed(restarts):
+            report.restarts.append(future.result())
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+def parse_license_arg(value: str) -> Tuple[LicenseType, Path]:
+    """TYPE:PATH, where TYPE is a LicenseType name (flexlm, hasp, licenseserver...)"""
+    type_name, _, path = value.partition(':')
+    try:
+        return LicenseType[type_name.upper()], Path(path)
+    except KeyError:
+        raise argparse.ArgumentTypeError(
+            f"unknown license type {type_name!r} (one of: {', '.join(t.name.lower() for t in LicenseType)})")
+
+def main():
+    parser = argparse.ArgumentParser(description='Install licenses')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    deploy_parser = subparsers.add_parser('deploy', help='Install licenses under many target roots at once')
+    deploy_parser.add_argument('--license', type=parse_license_arg, action='append', required=True,
+                               metavar='TYPE:PATH', help='License to install (repeatable)')
+    deploy_parser.add_argument('--target', action='append', default=[],
+                               help='Target root (repeatable), e.g. a mounted host filesystem')
+    deploy_parser.add_argument('--targets-file', help='File with one target root per line')
+    deploy_parser.add_argument('--workers', type=int, default=16, help='Concurrent copies and restarts')
+    deploy_parser.add_argument('--no-restart', action='store_true', help="Don't restart services")
+    deploy_parser.add_argument('--systemctl', help='Command used instead of systemctl '
+                                                   '(e.g. "python tools/systemctl_stub.py")')
+    deploy_parser.add_argument('--report', help='Write a JSON lines report here')
+    args = parser.parse_args()
+
+    targets = list(args.target)
+    if args.targets_file:
+        with open(args.targets_file, 'r') as f:
+            targets.extend(line.strip() for line in f if line.strip())
+    if not targets:
+        parser.error("no target roots given (--target / --targets-file)")
+
+    report = deploy_licenses(args.license, targets, workers=args.workers, restart=not args.no_restart,
+                             systemctl=shlex.split(args.systemctl) if args.systemctl else None)
+
+    for entry in report.files + report.restarts:
+        if not entry['success']:
+            print(f"{'SKIPPED' if entry.get('skipped') else 'FAILED'} {json.dumps(entry)}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            for entry in report.files:
+                f.write(json.dumps(dict(entry, kind='file')) + '\n')
+            for entry in report.restarts:
+                f.write(json.dumps(dict(entry, kind='restart')) + '\n')
+            f.write(json.dumps({'summary': report.summary()}) + '\n')
+    summary = report.summary()
+    print(f"Deployed {summary['files'] - summary['files_failed']}/{summary['files']} files to "
+          f"{len(targets)} targets, {summary['restarts']} service restarts "
+          f"({summary['restarts_failed']} failed, {summary['restarts_skipped']} skipped) "
+          f"in {summary['seconds']:.1f}s")
+    return 0 if report.success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from core.template_manager import TemplateManager
 from core.revocation_manager import RevocationManager
 from core.usage_tracker import UsageTracker
+from utils import logging_config
 import logging
 import yaml
 from enum import Enum
@@ -164,14 +165,8 @@ def setup_logging(log_file: str):
     Args:
         log_file: Path to the log file where messages will be stored
     """
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),    # Write logs to file
-            logging.StreamHandler()           # Also output to console
-        ]
-    )
+    # Queued logging: a background thread writes the file and the console
+    logging_config.setup_logging(Path(log_file))
 
 def handle_template_commands(args, template_manager):
     """
@@ -189,16 +184,89 @@ def handle_template_commands(args, template_manager):
         print(f"Created template: {template.name}")
         
     elif args.template_action == "list":
-        # Display all available templates
-        templates = template_manager.list_templates()
+        # Display available templates (from the template index), optionally filtered
+        templates = template_manager.find_templates(args.type, args.platform, args.feature, args.search)
         print("\nAvailable Templates:")
         for template in templates:
-            print(f"- {template}")
+            if args.details:
+                print(f"- {template['name']} [{template['type']}] {template['validity_days']} days, "
+                      f"platforms: {', '.join(template['platforms']) or '-'}, "
+                      f"features: {', '.join(template['features']) or '-'}")
+            else:
+                print(f"- {template['name']}")
             
     elif args.template_action == "delete":
         # Remove specified template
         template_manager.delete_template(args.template_name)
         print(f"Deleted template: {args.template_name}")
+        
+    elif args.template_action == "issue":
+        # Sign a license from the template for every customer in a file
+        issue_from_template(args, template_manager)
+
+def issue_from_template(args, template_manager):
+    """
+    Issue licenses from a template to every customer in a CSV / JSON lines file
+
+    Customers are streamed through the signing pipeline, so large files (tens of
+    thousands of customers) never sit in memory; one result line per customer is
+    appended to <output-dir>/issue_results.jsonl as licenses complete.
+
+    Args:
+        args: Parsed command line arguments
+        template_manager: Instance of TemplateManager for template operations
+    """
+    # Signing is only needed for this command, so import it here
+    import time
+    from config.config_schema import CONFIG_SCHEMA
+    from config.config_service import get_config_service
+    from core.license_generator import LicenseGeneratorFactory
+    from core.license_pipeline import LicensePipeline
+    from core.template_engine import generate_from_template, read_customers
+    from encryption.key_management import KeyManager
+    from encryption.license_signing import LicenseSigner
+    from utils.file_operations import atomic_write
+
+    if not args.template_name or not args.customers:
+        raise SystemExit("template issue needs --template-name and --customers")
+
+    template = template_manager.load_template(args.template_name)
+    output_dir = Path(args.output_dir or f"licenses/{template.name}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    config_path = Path(args.config)
+    if config_path.exists():
+        LicenseGeneratorFactory.load_license_formats(
+            get_config_service(config_path, CONFIG_SCHEMA).get().get('license_systems', {}))
+
+    def save_license(job, license_data):
+        return atomic_write(output_dir / f"{job.customer_info['id']}.lic", license_data)
+
+    pipeline = LicensePipeline(LicenseSigner(KeyManager(Path(args.key_dir))), save_license)
+    customers = read_customers(Path(args.customers))
+
+    succeeded = failed = 0
+    start = time.perf_counter()
+    with open(output_dir / 'issue_results.jsonl', 'w') as results_file:
+        for result in generate_from_template(template, customers, pipeline,
+                                             license_system=args.license_system,
+                                             max_workers=args.workers):
+            if result.success:
+                succeeded += 1
+            else:
+                failed += 1
+            results_file.write(json.dumps({
+                'customer_id': result.job.customer_info.get('id'),
+                'success': result.success,
+                'output_path': str(result.output_path) if result.output_path else None,
+                'error': result.error
+            }) + '\n')
+            done = succeeded + failed
+            if done % 1000 == 0:
+                print(f"  {done} licenses ({done / (time.perf_counter() - start):.0f}/s)", flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"Issued {succeeded} licenses from template {template.name} ({failed} failed) "
+          f"in {elapsed:.1f}s -> {output_dir}")
 
 def handle_revocation_commands(args, revocation_manager):
     """
@@ -261,9 +329,21 @@ def main():
     
     # Template management command group
     template_parser = subparsers.add_parser('template')
-    template_parser.add_argument('template_action', choices=['create', 'list', 'delete'])
+    template_parser.add_argument('template_action', choices=['create', 'list', 'delete', 'issue'])
     template_parser.add_argument('--template-file', help='Template definition file')
     template_parser.add_argument('--template-name', help='Template name')
+    template_parser.add_argument('--type', help='Only templates of this license type (list)')
+    template_parser.add_argument('--platform', help='Only templates supporting this platform (list)')
+    template_parser.add_argument('--feature', help='Only templates with this feature (list)')
+    template_parser.add_argument('--search', help='Only templates whose name or description contains this (list)')
+    template_parser.add_argument('--details', action='store_true', help='Show type, platforms and features (list)')
+    template_parser.add_argument('--customers', help='Customers CSV or JSON lines file (issue)')
+    template_parser.add_argument('--output-dir', help='Directory for issued licenses (default: licenses/<template>)')
+    template_parser.add_argument('--license-system', help="License system (default: the template's, or nodelock)")
+    template_parser.add_argument('--workers', type=int, default=4, help='Signing worker threads (issue)')
+    template_parser.add_argument('--key-dir', default='config/rsa_keys', help='Signing key directory (issue)')
+    template_parser.add_argument('--config', default='config/config.json',
+                                 help='Configuration with per-system license formats (issue)')
     
     # Revocation management command group
     revoke_parser = subparsers.add_parser('revocation')
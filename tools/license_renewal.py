@@ -1,13 +1,20 @@
 import argparse
+import glob
 import json
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from utils.validation import LicenseVerifier
-from core.license_generator import LicenseGenerator
 from encryption.key_management import KeyManager
+from encryption.license_format import is_binary_license
 from encryption.license_signing import LicenseSigner
+from utils.file_operations import atomic_write
+from utils.logging_config import setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -20,33 +27,43 @@ class LicenseRenewal:
             key_manager: Manages encryption keys for license signing
         """
         self.key_manager = key_manager
+        # One signer verifies and re-signs every license, so keys are loaded once
         self.signer = LicenseSigner(key_manager)
-        self.generator = LicenseGenerator(self.signer)
+        self._host_info = None
 
-    def renew_license(self, 
+    def _get_host_info(self) -> Dict:
+        # Host identifiers for node-locked checks don't change between licenses
+        if self._host_info is None:
+            from utils.host_identifier import HostIdentifier
+            self._host_info = HostIdentifier.get_host_identifiers()
+        return self._host_info
+
+    def renew_license(self,
                      license_path: Path,
                      validity_days: int,
-                     maintenance_days: Optional[int] = None) -> Dict:
+                     maintenance_days: Optional[int] = None,
+                     output_path: Optional[Path] = None) -> Dict:
         """
         Renew an existing license with new expiration dates
-        
+
         Args:
             license_path: Path to the existing license file
             validity_days: Number of days to extend the license
             maintenance_days: Optional maintenance period (defaults to validity_days)
-            
+            output_path: Where to write the renewed license (default: <name>_renewed next to it)
+
         Returns:
             Dict containing paths and dates for the renewed license
-            
+
         Raises:
             ValueError: If the existing license is invalid
         """
         # Verify the authenticity and validity of the current license
-        valid, message, license_data = LicenseVerifier.verify_license_file(
-            str(license_path),
-            str(self.key_manager.public_key_path)
-        )
-
+        raw = Path(license_path).read_bytes()
+        license_data = self.signer.verify_license_bytes(raw)
+        if license_data is None:
+            raise ValueError("Invalid license file: Invalid license signature")
+        valid, message = LicenseVerifier.check_license_data(license_data, self._get_host_info())
         if not valid:
             raise ValueError(f"Invalid license file: {message}")
 
@@ -55,17 +72,19 @@ class LicenseRenewal:
         new_maintenance = datetime.now() + timedelta(days=maintenance_days if maintenance_days else validity_days)
 
         # Update the license data with new dates and metadata
+        metadata = license_data.setdefault('metadata', {})
+        metadata['previous_expiration'] = license_data['license']['expiration_date']
+        metadata['renewed_at'] = datetime.now().isoformat()
         license_data['license']['expiration_date'] = new_expiration.isoformat()
         license_data['license']['maintenance_date'] = new_maintenance.isoformat()
-        license_data['metadata']['renewed_at'] = datetime.now().isoformat()
-        license_data['metadata']['previous_expiration'] = license_data['license']['expiration_date']
 
-        # Generate and sign the new license data
-        new_license_data = self.signer.sign_license_data(license_data)
+        # Generate and sign the new license data (in the same format as the original)
+        license_format = 'binary' if is_binary_license(raw) else 'json'
+        new_license_data = self.signer.sign_license_data(license_data, license_format)
 
-        # Save the renewed license with a modified filename
-        renewed_path = license_path.with_stem(f"{license_path.stem}_renewed")
-        self.generator.save_license(new_license_data, renewed_path)
+        # Save the renewed license (atomically, so a failed run never leaves half a file)
+        renewed_path = Path(output_path) if output_path else renewed_path_for(license_path)
+        atomic_write(renewed_path, new_license_data)
 
         return {
             "original_license": str(license_path),
@@ -74,13 +93,213 @@ class LicenseRenewal:
             "new_maintenance": new_maintenance.isoformat()
         }
 
+def renewed_path_for(license_path: Path) -> Path:
+    """
+    Default renewed license path: <name>_renewed next to the license
+
+    A license that is itself a renewal keeps its name (and is replaced), so
+    repeated renewals don't become <name>_renewed_renewed.
+    """
+    license_path = Path(license_path)
+    stem = license_path.stem
+    if not stem.endswith('_renewed'):
+        stem = f"{stem}_renewed"
+    return license_path.with_stem(stem)
+
+# Bulk renewal: each worker process builds one LicenseRenewal (warm keys) and reuses it
+
+_worker_renewal: Optional[LicenseRenewal] = None
+_worker_options: Dict = {}
+
+def _init_worker(key_dir: str, options: Dict):
+    global _worker_renewal, _worker_options
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_renewal = LicenseRenewal(KeyManager(Path(key_dir)))
+    _worker_renewal.signer.warm_up()
+    _worker_options = options
+
+def output_path_for(license_path: str, output_dir: str, source_root: str) -> Path:
+    """
+    Where a renewed license goes under output_dir: at its path relative to source_root,
+    so same-named licenses from different directories don't overwrite each other
+
+    Raises:
+        ValueError: If the license isn't under source_root
+    """
+    relative = Path(os.path.relpath(os.path.abspath(license_path), source_root))
+    if relative.parts[0] == os.pardir:
+        raise ValueError(f"{license_path} is not under the source root {source_root}")
+    return Path(output_dir) / relative
+
+def common_source_root(license_paths: Iterable[str]) -> str:
+    """Deepest directory containing all the licenses"""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in license_paths])
+
+def _renew_one(license_path: str) -> Dict:
+    """Renew one license in a worker; never raises, the outcome goes to the manifest"""
+    options = _worker_options
+    path = Path(license_path)
+    start = time.perf_counter()
+    entry = {'license': license_path}
+    try:
+        output_path = (output_path_for(license_path, options['output_dir'], options['source_root'])
+                       if options.get('output_dir') else None)
+        result = _worker_renewal.renew_license(path, options['validity_days'],
+                                               options.get('maintenance_days'), output_path)
+        entry.update(success=True, renewed_license=result['renewed_license'],
+                     new_expiration=result['new_expiration'])
+    except Exception as e:
+        entry.update(success=False, error=str(e))
+    entry['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return entry
+
+def collect_license_paths(sources: Iterable[str], list_file: Optional[str] = None) -> List[str]:
+    """
+    Expand renewal sources into license file paths
+
+    Args:
+        sources: License files, directories (all *.lic inside, recursively) or glob patterns
+        list_file: File with one license path per line (e.g. the output of a query)
+    """
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(str(p) for p in sorted(Path(source).rglob('*.lic')))
+        elif glob.has_magic(source):
+            paths.extend(sorted(glob.glob(source, recursive=True)))
+        else:
+            paths.append(source)
+    if list_file:
+        with open(list_file, 'r') as f:
+            paths.extend(line.strip() for line in f if line.strip())
+    # Never renew a renewal left over from an earlier run alongside the originals,
+    # nor the same file twice under different spellings
+    seen = set()
+    return [p for p in paths if not Path(p).stem.endswith('_renewed') and
+            not (os.path.abspath(p) in seen or seen.add(os.path.abspath(p)))]
+
+def renewal_pool(key_dir: Path, validity_days: int, maintenance_days: Optional[int] = None,
+                 output_dir: Optional[Path] = None, workers: Optional[int] = None,
+                 source_root: Optional[Path] = None) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers each hold a warm LicenseRenewal (keys loaded once)
+
+    Use with renew_in_pool(); the pool can be reused for any number of batches.
+
+    Args:
+        key_dir: Signing key directory
+        validity_days: New validity period
+        maintenance_days: New maintenance period (defaults to validity_days)
+        output_dir: Write renewed licenses here, keeping their paths relative to
+                    source_root (default: <name>_renewed next to each license)
+        workers: Worker processes (default: CPU count)
+        source_root: Directory the output_dir layout is relative to (default: the
+                     current directory); licenses outside it fail
+    """
+    options = {
+        'validity_days': validity_days,
+        'maintenance_days': maintenance_days,
+        'output_dir': str(output_dir) if output_dir else None,
+        'source_root': os.path.abspath(source_root or os.curdir)
+    }
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                               initargs=(str(key_dir), options))
+
+def renew_in_pool(executor: ProcessPoolExecutor, license_paths: List[str],
+                  chunksize: int = 16) -> Iterator[Dict]:
+    """Renew licenses on a renewal_pool(), yielding manifest entries in input order"""
+    return executor.map(_renew_one, license_paths, chunksize=chunksize)
+
+def renew_many(license_paths: List[str], key_dir: Path, validity_days: int,
+               maintenance_days: Optional[int] = None, output_dir: Optional[Path] = None,
+               workers: Optional[int] = None, chunksize: int = 16) -> Iterator[Dict]:
+    """
+    Verify and re-sign many licenses in a process pool
+
+    Args:
+        license_paths: License files to renew
+        key_dir, validity_days, maintenance_days, output_dir, workers: See renewal_pool()
+        chunksize: Licenses handed to a worker at a time
+
+    Returns:
+        Iterator of manifest entries, in input order
+
+    With an output_dir, renewed licenses keep their paths relative to the
+    deepest directory containing all of the licenses.
+    """
+    source_root = common_source_root(license_paths) if output_dir and license_paths else None
+    with renewal_pool(key_dir, validity_days, maintenance_days, output_dir, workers,
+                      source_root) as executor:
+        yield from renew_in_pool(executor, license_paths, chunksize)
+
+def main_renew_many(argv: List[str]):
+    """Command-line interface for bulk renewal: license_renewal.py renew-many SOURCES..."""
+    parser = argparse.ArgumentParser(prog='license_renewal.py renew-many',
+                                     description='Renew many licenses in parallel')
+    parser.add_argument('sources', nargs='*',
+                        help='License files, directories or glob patterns (quote globs)')
+    parser.add_argument('--from-list', help='File with one license path per line')
+    parser.add_argument('--validity', type=int, default=365,
+                      help='New validity period in days')
+    parser.add_argument('--maintenance', type=int,
+                      help='New maintenance period in days (defaults to validity period)')
+    parser.add_argument('--output-dir',
+                        help='Directory for renewed licenses, keeping their layout below the directory '
+                             'common to all sources (default: <name>_renewed alongside)')
+    parser.add_argument('--key-dir', default='config/rsa_keys', help='Signing key directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--manifest', default='renewal_manifest.jsonl',
+                        help='JSON lines manifest of results and throughput')
+    parser.add_argument('--log-file', default='logs/renewal.log',
+                      help='Log file path')
+    args = parser.parse_args(argv)
+
+    setup_logging(Path(args.log_file))
+
+    paths = collect_license_paths(args.sources, args.from_list)
+    if not paths:
+        parser.error("no licenses to renew")
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Renewing {len(paths)} licenses with {workers} workers...")
+
+    succeeded = failed = 0
+    start = time.perf_counter()
+    with open(args.manifest, 'w') as manifest:
+        for entry in renew_many(paths, Path(args.key_dir), args.validity, args.maintenance,
+                                Path(args.output_dir) if args.output_dir else None, workers):
+            if entry['success']:
+                succeeded += 1
+            else:
+                failed += 1
+                logger.warning(f"Renewal failed for {entry['license']}: {entry['error']}")
+            manifest.write(json.dumps(entry) + '\n')
+        elapsed = time.perf_counter() - start
+        summary = {
+            'total': len(paths),
+            'succeeded': succeeded,
+            'failed': failed,
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'licenses_per_second': round(len(paths) / elapsed, 1) if elapsed else None
+        }
+        manifest.write(json.dumps({'summary': summary}) + '\n')
+
+    print(f"Renewed {succeeded}/{len(paths)} licenses in {elapsed:.1f}s "
+          f"({summary['licenses_per_second']} licenses/s); manifest: {args.manifest}")
+    return 1 if failed else 0
+
 def main():
     """
     Command-line interface for license renewal
     Processes arguments and handles the renewal workflow
     """
+    # Bulk mode: license_renewal.py renew-many ...
+    if len(sys.argv) > 1 and sys.argv[1] == 'renew-many':
+        sys.exit(main_renew_many(sys.argv[2:]))
+
     # Set up command line argument parsing
-    parser = argparse.ArgumentParser(description='License Renewal Tool')
+    parser = argparse.ArgumentParser(description='License Renewal Tool',
+                                     epilog='Use "renew-many SOURCES..." to renew many licenses in parallel')
     parser.add_argument('license_file', help='Path to the license file to renew')
     parser.add_argument('--validity', type=int, default=365,
                       help='New validity period in days')
@@ -92,20 +311,13 @@ def main():
     args = parser.parse_args()
 
     # Configure logging to both file and console
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(args.log_file),
-            logging.StreamHandler()
-        ]
-    )
+    setup_logging(Path(args.log_file))
 
     try:
         # Initialize components and perform renewal
         key_manager = KeyManager(Path('config/rsa_keys'))
         renewal = LicenseRenewal(key_manager)
-        
+
         result = renewal.renew_license(
             Path(args.license_file),
             args.validity,
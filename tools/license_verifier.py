@@ -40,6 +40,7 @@ def main():
     # Display verification results
     print(f"License Status: {'Valid' if valid else 'Invalid'}")
     print(f"Message: {message}")
+    print(f"Format: {LicenseVerifier.detect_format(args.license_file)}")
     
     # If license data was successfully extracted, display it
     if license_data:
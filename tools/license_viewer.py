@@ -57,7 +57,8 @@ class LicenseViewer(QMainWindow):
             
             # Prepare the display text with verification results
             display_text = f"License Status: {'Valid' if valid else 'Invalid'}\n"
-            display_text += f"Message: {message}\n\n"
+            display_text += f"Message: {message}\n"
+            display_text += f"Format: {LicenseVerifier.detect_format(file_path)}\n\n"
             
             # If license data was successfully extracted, add it to display
             if license_data:
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Expiration-driven license renewal
+
+Keeps an index of license expiration dates for the customer license tree and
+renews the licenses that are due (within --lead-days of expiring), earliest
+first, in rate-limited batches. Licenses that have already expired can't be
+renewed; they are listed in --expired-list for reissuing. Meant to run daily,
+e.g. from cron:
+
+    python tools/renewal_scheduler.py --root customers --lead-days 30 --rate 200
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from core.renewal_scheduler import ExpirationIndex, RenewalScheduler
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description='Renew licenses that are about to expire')
+    parser.add_argument('--root', default='customers', help='License tree to scan')
+    parser.add_argument('--index', default='data/expirations.db', help='Expiration index database')
+    parser.add_argument('--lead-days', type=int, default=30, help='Renew this many days before the date')
+    parser.add_argument('--field', choices=['expiration', 'maintenance'], default='expiration',
+                        help='Which date drives renewal')
+    parser.add_argument('--batch-size', type=int, default=500, help='Licenses per renewal batch')
+    parser.add_argument('--rate', type=float, default=None, help='Maximum licenses renewed per second')
+    parser.add_argument('--max-renewals', type=int, default=None, help='Renew at most this many (one wave)')
+    parser.add_argument('--validity', type=int, default=365, help='New validity period in days')
+    parser.add_argument('--maintenance', type=int,
+                        help='New maintenance period in days (defaults to validity period)')
+    parser.add_argument('--key-dir', default='config/rsa_keys', help='Signing key directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--manifest', default='renewal_manifest.jsonl', help='JSON lines manifest of results')
+    parser.add_argument('--expired-list', default='expired_licenses.txt',
+                        help='Write licenses that already expired (and need reissuing) here, one per line')
+    parser.add_argument('--no-sync', action='store_true', help="Don't rescan the license tree first")
+    parser.add_argument('--dry-run', action='store_true', help='Only list the licenses that are due')
+    parser.add_argument('--log-file', default='logs/renewal_scheduler.log', help='Log file path')
+    args = parser.parse_args()
+
+    setup_logging(Path(args.log_file))
+
+    index = ExpirationIndex(Path(args.index))
+    if not args.no_sync:
+        start = time.perf_counter()
+        counts = index.sync(Path(args.root))
+        print(f"Index synced in {time.perf_counter() - start:.1f}s: {counts['directories']} directories, "
+              f"{counts['listed']} relisted, {counts['indexed']} licenses indexed, {counts['removed']} removed")
+
+    scheduler = RenewalScheduler(index, lead_days=args.lead_days, date_field=f"{args.field}_date",
+                                 lookahead_days=0)
+    scheduler.refresh()
+
+    # Expired licenses fail verification, so they are reported instead of renewed
+    # (rewritten every run so it never lists licenses that have since been reissued)
+    expired = index.expired()
+    with open(args.expired_list, 'w') as f:
+        f.writelines(f"{renewal.path}\n" for renewal in expired)
+    if expired:
+        print(f"{len(expired)} licenses have already expired and can't be renewed "
+              f"(need reissuing); listed in {args.expired_list}")
+
+    if args.dry_run:
+        due = scheduler.pop_due(limit=args.max_renewals)
+        for renewal in due:
+            print(f"{renewal.due}  {renewal.customer_id or '-'}  {renewal.path}")
+        print(f"{len(due)} licenses due for renewal")
+        return 0
+
+    from tools.license_renewal import renewal_pool, renew_in_pool
+
+    start = time.perf_counter()
+    with renewal_pool(Path(args.key_dir), args.validity, args.maintenance, workers=args.workers) as executor, \
+            open(args.manifest, 'w') as manifest:
+        counts = scheduler.run(
+            lambda paths: renew_in_pool(executor, paths),
+            batch_size=args.batch_size,
+            rate=args.rate,
+            max_renewals=args.max_renewals,
+            on_result=lambda entry: manifest.write(json.dumps(entry) + '\n')
+        )
+        elapsed = time.perf_counter() - start
+        total = counts['renewed'] + counts['failed']
+        summary = dict(counts, seconds=round(elapsed, 3), finished=datetime.now().isoformat(),
+                       licenses_per_second=round(total / elapsed, 1) if elapsed else None)
+        manifest.write(json.dumps({'summary': summary}) + '\n')
+
+    print(f"Renewed {counts['renewed']} licenses ({counts['failed']} failed) in {counts['batches']} batches, "
+          f"{elapsed:.1f}s; manifest: {args.manifest}")
+    return 1 if counts['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Signing key rotation
+
+Replaces the key pair in a key directory (backing up the current one when
+backups are enabled). When the 'key_pool' section of the security settings
+is enabled the new key is taken from the pre-generated pool, so rotation
+doesn't wait for RSA generation; --fill-pool tops the pool up ahead of time,
+e.g. from cron:
+
+    python tools/rotate_keys.py --fill-pool
+    python tools/rotate_keys.py --key-dir config/keys
+"""
+import argparse
+import getpass
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from encryption.key_management import KeyManager
+from encryption.key_pool import start_key_pool
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+def fill_pool(pool) -> None:
+    """Wait until the pool holds its target number of keys"""
+    while True:
+        metrics = pool.metrics()
+        if metrics['depth'] >= metrics['target_depth']:
+            return
+        if metrics['failures']:
+            raise RuntimeError("Key pool failed to generate a key (see log)")
+        time.sleep(0.5)
+
+def main():
+    parser = argparse.ArgumentParser(description='Rotate the signing key pair')
+    parser.add_argument('--key-dir', default='config/keys', help='Key directory to rotate')
+    parser.add_argument('--settings', default='config/security_settings.json', help='Security settings file')
+    parser.add_argument('--key-length', type=int, help='Key length in bits (defaults to the settings)')
+    parser.add_argument('--password', action='store_true', help='Prompt for a password for the new private key')
+    parser.add_argument('--fill-pool', action='store_true',
+                        help='Only pre-generate keys until the key pool is full')
+    parser.add_argument('--log-file', default='logs/key_rotation.log', help='Log file path')
+    args = parser.parse_args()
+
+    setup_logging(Path(args.log_file))
+
+    with open(args.settings) as f:
+        security_settings = json.load(f)
+    pool = start_key_pool(security_settings)
+    if args.fill_pool and pool is None:
+        print("Key pool is not enabled in the security settings ('key_pool' section)")
+        return 1
+
+    try:
+        if args.fill_pool:
+            fill_pool(pool)
+            print(f"Key pool holds {pool.metrics()['depth']} keys")
+            return 0
+
+        password = getpass.getpass("New private key password: ") if args.password else None
+        manager = KeyManager(Path(args.key_dir), settings_path=Path(args.settings), key_pool=pool)
+        start = time.perf_counter()
+        _, public_key = manager.generate_key_pair(key_length=args.key_length, password=password)
+        print(f"Rotated {public_key.key_size}-bit key pair in {args.key_dir} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return 0
+    except Exception as e:
+        logger.error(f"Key rotation failed: {e}")
+        print(f"Key rotation failed: {e}")
+        return 1
+    finally:
+        if pool is not None:
+            # Let the replacement for the taken key finish so the next rotation finds it stored
+            pool.stop(wait=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# Standard library imports
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+# Third-party imports
+from cryptography.hazmat.primitives import serialization
+
+# Custom module imports for key loading and the daemon wire protocol
+from encryption.key_management import KeyManager
+from encryption.license_signing import _pss_sha256
+from encryption.signing_client import (
+    FRAME_HEADER, MAX_FRAME_SIZE, OP_PING, OP_PUBLIC_KEY, OP_SIGN, STATUS_OK, STATUS_ERROR,
+    default_socket_path
+)
+from utils.file_operations import ensure_private_dir, remove_stale_socket
+from utils.logging_config import setup_logging
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+BATCH_SECONDS = metrics.histogram('signing_daemon_batch_seconds', 'Time to sign one batch of requests')
+BATCH_SIZE = metrics.histogram('signing_daemon_batch_size', 'Requests per signing batch',
+                               buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+class SigningDaemon:
+    """
+    Long-lived signing service holding the private key in memory.
+
+    Requests from all connections go into one queue. The batcher drains up to
+    batch_size requests at a time and signs each batch on a worker thread
+    (cryptography releases the GIL while signing, so batches run in parallel).
+    Each batch's responses are then written with one write per connection.
+    """
+
+    def __init__(self, private_key, socket_path: Path, batch_size: int = 64,
+                 workers: int = None):
+        self.private_key = private_key
+        self.socket_path = Path(socket_path)
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.padding, self.algorithm = _pss_sha256()
+        self.public_key_der = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self.requests_signed = 0
+        self.batches = 0
+        self._queue = None
+        self._server = None
+
+    def _sign_batch(self, payloads: List[bytes]) -> List[Tuple[int, bytes]]:
+        """Sign a batch of payloads (runs on a worker thread)"""
+        results = []
+        BATCH_SIZE.observe(len(payloads))
+        with BATCH_SECONDS.time():
+            for payload in payloads:
+                try:
+                    results.append((STATUS_OK, self.private_key.sign(payload, self.padding, self.algorithm)))
+                except Exception as e:
+                    results.append((STATUS_ERROR, str(e).encode('utf-8')))
+        return results
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                request_id, op, length = FRAME_HEADER.unpack(header)
+                if length > MAX_FRAME_SIZE:
+                    logger.warning("Dropping connection after an oversized request")
+                    break
+                payload = await reader.readexactly(length) if length else b''
+                if op == OP_PING:
+                    writer.write(FRAME_HEADER.pack(request_id, STATUS_OK, 0))
+                elif op == OP_PUBLIC_KEY:
+                    writer.write(FRAME_HEADER.pack(request_id, STATUS_OK, len(self.public_key_der)) +
+                                 self.public_key_der)
+                elif op == OP_SIGN:
+                    await self._queue.put((writer, request_id, payload))
+                else:
+                    message = f"Unknown operation {op}".encode('utf-8')
+                    writer.write(FRAME_HEADER.pack(request_id, STATUS_ERROR, len(message)) + message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _process_batch(self, loop, executor, semaphore, batch):
+        try:
+            results = await loop.run_in_executor(
+                executor, self._sign_batch, [payload for _, _, payload in batch])
+
+            # Coalesce the responses for each connection into a single write
+            responses = {}
+            for (writer, request_id, _), (status, body) in zip(batch, results):
+                frames = responses.setdefault(writer, [])
+                frames.append(FRAME_HEADER.pack(request_id, status, len(body)))
+                frames.append(body)
+            for writer, frames in responses.items():
+                if not writer.is_closing():
+                    writer.write(b''.join(frames))
+
+            self.requests_signed += len(batch)
+            self.batches += 1
+        finally:
+            semaphore.release()
+
+    async def _batcher(self, executor):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.workers)
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await semaphore.acquire()
+            loop.create_task(self._process_batch(loop, executor, semaphore, batch))
+
+    async def serve(self):
+        """Serve until SIGINT/SIGTERM"""
+        if self.socket_path == default_socket_path():
+            ensure_private_dir(self.socket_path.parent)
+        remove_stale_socket(self.socket_path)
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+
+        # Only the owner may connect to the socket
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_connection,
+                                                           path=str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+
+        logger.info(f"Signing daemon listening on {self.socket_path} "
+                    f"(batch size {self.batch_size}, {self.workers} workers)")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='signer') as executor:
+            batcher = loop.create_task(self._batcher(executor))
+            try:
+                await stop
+            finally:
+                batcher.cancel()
+                self._server.close()
+                await self._server.wait_closed()
+                if self.socket_path.exists():
+                    self.socket_path.unlink()
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Signed {self.requests_signed} requests in {self.batches} batches "
+                    f"over {elapsed:.1f}s")
+
+def main():
+    """Command-line entry point for the signing daemon"""
+    parser = argparse.ArgumentParser(description='Local license signing daemon')
+    parser.add_argument('--socket', default=str(default_socket_path()),
+                      help='Unix socket path (default: $LICENSE_SIGNING_SOCKET, else in $XDG_RUNTIME_DIR); '
+                           'clients use the daemon only when given this socket')
+    parser.add_argument('--key-dir', default='config/keys',
+                      help='Directory containing private_key.pem')
+    parser.add_argument('--batch-size', type=int, default=64,
+                      help='Maximum requests signed per batch')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Signing threads (default: CPU count)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                      help='Serve Prometheus metrics on this local port')
+    args = parser.parse_args()
+    metrics.configure(args.metrics_port)
+
+    # Console logging through a queue so the event loop never blocks on stderr
+    setup_logging()
+
+    private_key = KeyManager(Path(args.key_dir)).load_private_key()
+    daemon = SigningDaemon(private_key, Path(args.socket), args.batch_size, args.workers)
+    asyncio.run(daemon.serve())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Stand-in for systemctl when testing license deployments
+
+Records each call as a JSON line in $SYSTEMCTL_STUB_LOG (default:
+systemctl_stub.log) and succeeds, except for services listed in
+$SYSTEMCTL_STUB_FAIL (comma separated), which fail like a broken unit.
+
+    LICENSE_SYSTEMCTL="python tools/systemctl_stub.py" python tools/license_installer.py deploy ...
+"""
+import json
+import os
+import sys
+import time
+
+def main():
+    args = sys.argv[1:]
+    action, service = (args + [None, None])[:2]
+    entry = {
+        'time': time.time(),
+        'action': action,
+        'service': service,
+        'target_root': os.environ.get('LICENSE_TARGET_ROOT')
+    }
+    # Appends of one short line are atomic, so concurrent calls don't interleave
+    with open(os.environ.get('SYSTEMCTL_STUB_LOG', 'systemctl_stub.log'), 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    failing = {name for name in os.environ.get('SYSTEMCTL_STUB_FAIL', '').split(',') if name}
+    if service in failing:
+        print(f"Job for {service}.service failed.", file=sys.stderr)
+        return 1
+    print(f"{action} {service}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
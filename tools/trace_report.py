@@ -0,0 +1,104 @@
+# Standard library imports
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+def load_spans(path: Path) -> List[Dict]:
+    """Read spans written by the JSON lines trace exporter"""
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                spans.append(json.loads(line))
+    return spans
+
+def aggregate(spans: List[Dict]) -> Dict[Tuple[str, ...], Dict[str, float]]:
+    """
+    Sum span time per call path (root name, ..., span name)
+
+    Returns:
+        Dict mapping each path to its count, total and self time in ms;
+        self time excludes the time of child spans
+    """
+    by_id = {span['span_id']: span for span in spans}
+    child_time = defaultdict(float)
+    for span in spans:
+        if span['parent_id'] in by_id:
+            child_time[span['parent_id']] += span['duration_ms']
+
+    paths = {}
+
+    def path_of(span) -> Tuple[str, ...]:
+        cached = paths.get(span['span_id'])
+        if cached is None:
+            parent = by_id.get(span['parent_id'])
+            cached = (path_of(parent) if parent else ()) + (span['name'],)
+            paths[span['span_id']] = cached
+        return cached
+
+    totals = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0})
+    for span in spans:
+        entry = totals[path_of(span)]
+        entry['count'] += 1
+        entry['total_ms'] += span['duration_ms']
+        # Children on other threads can overlap their parent; never report negative self time
+        entry['self_ms'] += max(0.0, span['duration_ms'] - child_time[span['span_id']])
+    return totals
+
+def print_tree(totals: Dict[Tuple[str, ...], Dict[str, float]], min_percent: float = 0.0):
+    """Print the call tree, children sorted by total time, with each node's share of its root"""
+    children = defaultdict(list)
+    for path in totals:
+        children[path[:-1]].append(path)
+
+    print(f"{'span':<48} {'count':>7} {'total ms':>11} {'self ms':>11} {'% root':>7}")
+
+    def walk(path, root_total):
+        entry = totals[path]
+        percent = entry['total_ms'] / root_total * 100 if root_total else 0.0
+        if percent < min_percent:
+            return
+        label = '  ' * (len(path) - 1) + path[-1]
+        print(f"{label:<48} {entry['count']:>7} {entry['total_ms']:>11.2f} "
+              f"{entry['self_ms']:>11.2f} {percent:>6.1f}%")
+        for child in sorted(children[path], key=lambda p: -totals[p]['total_ms']):
+            walk(child, root_total)
+
+    for root in sorted(children[()], key=lambda p: -totals[p]['total_ms']):
+        walk(root, totals[root]['total_ms'])
+
+def print_folded(totals: Dict[Tuple[str, ...], Dict[str, float]]):
+    """Folded stacks (path;to;span self_microseconds) for flamegraph.pl or speedscope"""
+    for path, entry in sorted(totals.items()):
+        self_us = int(round(entry['self_ms'] * 1000))
+        if self_us:
+            print(f"{';'.join(path)} {self_us}")
+
+def main():
+    """
+    Break down a JSON lines trace (LICENSE_TRACE=trace.jsonl or --trace trace.jsonl)
+    into time per call path, so slow runs show where the time went
+    """
+    parser = argparse.ArgumentParser(description='Summarize a license generation trace')
+    parser.add_argument('trace_file', help='JSON lines trace file')
+    parser.add_argument('--folded', action='store_true',
+                      help='Print folded stacks for flame graph tools instead of a tree')
+    parser.add_argument('--min-percent', type=float, default=0.0,
+                      help='Hide spans below this share of their root span')
+    args = parser.parse_args()
+
+    spans = load_spans(Path(args.trace_file))
+    if not spans:
+        print("No spans in trace")
+        return
+    totals = aggregate(spans)
+    if args.folded:
+        print_folded(totals)
+    else:
+        print_tree(totals, args.min_percent)
+
+if __name__ == "__main__":
+    main()
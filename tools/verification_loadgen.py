@@ -0,0 +1,93 @@
+# Standard library imports
+import argparse
+import itertools
+import threading
+import time
+from pathlib import Path
+
+# Custom utility imports (no cryptography needed on the client side)
+from utils.histogram import LatencyHistogram
+from utils.verification_client import VerificationClient, default_verification_socket
+
+def run_client(socket_path: Path, licenses, requests: int, batch_size: int,
+               histogram: LatencyHistogram, errors: list):
+    """Send requests from one connection, recording the latency of each round trip"""
+    client = VerificationClient(socket_path)
+    paths = itertools.cycle(licenses)
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            if batch_size > 1:
+                client.verify_batch([{'path': str(next(paths))} for _ in range(batch_size)])
+            else:
+                client.verify(path=next(paths))
+            histogram.record(time.perf_counter() - start)
+    except Exception as e:
+        errors.append(str(e))
+    finally:
+        client.close()
+
+def main():
+    """
+    Load generator for tools/verification_server.py.
+    Runs concurrent clients against the server and prints throughput, latency
+    percentiles and a latency histogram.
+    """
+    parser = argparse.ArgumentParser(description='Verification server load generator')
+    parser.add_argument('--socket', default=str(default_verification_socket()),
+                      help='Verification server socket')
+    parser.add_argument('--licenses', default='customers',
+                      help='Directory searched recursively for .lic files to verify')
+    parser.add_argument('--clients', type=int, default=8,
+                      help='Concurrent client connections')
+    parser.add_argument('--requests', type=int, default=2000,
+                      help='Requests per client')
+    parser.add_argument('--batch-size', type=int, default=1,
+                      help='Licenses per request (1 sends single verify requests)')
+    args = parser.parse_args()
+
+    licenses = sorted(Path(args.licenses).rglob('*.lic'))
+    if not licenses:
+        print(f"No licenses found in {args.licenses}")
+        return
+
+    histograms = [LatencyHistogram() for _ in range(args.clients)]
+    errors = []
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(Path(args.socket), licenses, args.requests, args.batch_size,
+                               histograms[index], errors))
+        for index in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = LatencyHistogram()
+    for histogram in histograms:
+        total.merge(histogram)
+    verified = total.count * args.batch_size
+
+    print(f"{args.clients} clients, {total.count} requests x {args.batch_size} licenses "
+          f"in {elapsed:.2f}s")
+    print(f"Throughput: {total.count / elapsed:.0f} requests/s, {verified / elapsed:.0f} licenses/s")
+    summary = total.summary()
+    print("Round-trip latency: " + ", ".join(
+        f"{key[:-3]} {value:.3f} ms" for key, value in summary.items() if key.endswith('_ms')))
+    print("\nLatency histogram:")
+    print(total.render())
+    if errors:
+        print(f"\n{len(errors)} clients failed; first error: {errors[0]}")
+
+    stats = VerificationClient(Path(args.socket)).stats()
+    print(f"\nServer: {stats['requests']} verifications, {stats['cache_hits']} cache hits")
+    for name, latency in stats['latency'].items():
+        if latency['count']:
+            print(f"  {name}: p50 {latency['p50_ms']:.3f} ms, p99 {latency['p99_ms']:.3f} ms "
+                  f"({latency['count']} requests)")
+
+if __name__ == "__main__":
+    main()
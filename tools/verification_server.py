@@ -0,0 +1,157 @@
+# Standard library imports
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Custom module imports for verification and latency tracking
+from utils.file_operations import ensure_private_dir, remove_stale_socket
+from utils.logging_config import setup_logging
+from utils import metrics
+from utils.histogram import LatencyHistogram
+from utils.verification_client import default_verification_socket
+from utils.verification_service import LicenseVerificationService
+
+logger = logging.getLogger(__name__)
+
+# Largest request line accepted (batches of license texts can be big)
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+class VerificationServer:
+    """
+    Local license verification server speaking JSON lines over a Unix socket
+    (see utils/verification_client.py for the protocol).
+
+    Requests run on a thread pool: a request may read a license file and, on a
+    cache miss, check an RSA signature, neither of which may stall the event
+    loop and with it every other client.
+    """
+
+    def __init__(self, service: LicenseVerificationService, socket_path: Path, workers: int = None):
+        self.service = service
+        self.socket_path = Path(socket_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.latency = {
+            'verify': LatencyHistogram(),
+            'batch': LatencyHistogram()
+        }
+        self._executor = None
+
+    def stats(self) -> dict:
+        """Service counters and server-side latency summaries"""
+        return {
+            'requests': self.service.requests,
+            'cache_hits': self.service.cache_hits,
+            'latency': {name: histogram.summary() for name, histogram in self.latency.items()}
+        }
+
+    async def _dispatch(self, request: dict) -> dict:
+        start = time.perf_counter()
+        if request.get('op') == 'stats':
+            return self.stats()
+        loop = asyncio.get_running_loop()
+        if 'batch' in request:
+            results = await loop.run_in_executor(self._executor, self.service.verify_many,
+                                                 request['batch'])
+            self.latency['batch'].record(time.perf_counter() - start)
+            return {'results': results}
+        response = await loop.run_in_executor(self._executor, self.service.verify_request, request)
+        self.latency['verify'].record(time.perf_counter() - start)
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    response = await self._dispatch(request)
+                    response['id'] = request.get('id')
+                except Exception as e:
+                    response = {'error': str(e)}
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                # Pipelined requests are answered together; only wait when the buffer fills
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+        except (ConnectionError, ValueError, asyncio.LimitOverrunError) as e:
+            logger.warning(f"Closing verification connection: {e}")
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Serve until SIGINT/SIGTERM"""
+        if self.socket_path == default_verification_socket():
+            ensure_private_dir(self.socket_path.parent)
+        remove_stale_socket(self.socket_path)
+        self.service.warm_up()
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='verifier') as executor:
+            self._executor = executor
+            # Only the owner may connect: requests can name any file to read
+            old_umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(self._handle_connection,
+                                                         path=str(self.socket_path),
+                                                         limit=MAX_REQUEST_SIZE)
+            finally:
+                os.umask(old_umask)
+            logger.info(f"Verification server listening on {self.socket_path}")
+            try:
+                await stop
+            finally:
+                server.close()
+                await server.wait_closed()
+                if self.socket_path.exists():
+                    self.socket_path.unlink()
+
+        for name, histogram in self.latency.items():
+            if histogram.count:
+                logger.info(f"{name} latency: {histogram.summary()}")
+
+def main():
+    """Command-line entry point for the verification server"""
+    parser = argparse.ArgumentParser(description='Local license verification server')
+    parser.add_argument('--socket', default=str(default_verification_socket()),
+                      help='Unix socket path (default: $LICENSE_VERIFY_SOCKET, else in $XDG_RUNTIME_DIR)')
+    parser.add_argument('--key-dir', default='config/keys',
+                      help='Directory containing public_key.pem')
+    parser.add_argument('--revocation-db', default=None,
+                      help='Revocation database to check licenses against')
+    parser.add_argument('--cache-size', type=int, default=4096,
+                      help='Number of license signature results to cache')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Verification threads (default: CPU count)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                      help='Serve Prometheus metrics on this local port')
+    args = parser.parse_args()
+
+    # Console logging through a queue so the event loop never blocks on stderr
+    setup_logging()
+
+    service = LicenseVerificationService(
+        Path(args.key_dir),
+        Path(args.revocation_db) if args.revocation_db else None,
+        cache_size=args.cache_size
+    )
+    if args.metrics_port is not None:
+        metrics.gauge('verification_requests', 'Verification requests served').set_function(
+            lambda: service.requests)
+        metrics.gauge('verification_cache_hits', 'Verification requests answered from the cache').set_function(
+            lambda: service.cache_hits)
+        metrics.configure(args.metrics_port)
+    server = VerificationServer(service, Path(args.socket), args.workers)
+    asyncio.run(server.serve())
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget,
-                           QPushButton, QTableWidgetItem, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableView,
+                           QPushButton, QLineEdit, QMessageBox, QAbstractItemView,
+                           QHeaderView)
 from ..dialogs.product_dialog import ProductDialog
+from ..models import ProductTableModel, create_filter_proxy
+from core.catalog import product_key
 from core.product import Product
 
 class ProductManagerDialog(QDialog):
     def __init__(self, config, parent=None):
         super().__init__(parent)
         self.config = config
+        # Keys of products added, edited or deleted here; only these are saved
+        self.changed_keys = set()
         self.setup_ui()
         self.load_products()
         
@@ -15,11 +19,26 @@ class ProductManagerDialog(QDialog):
         self.setWindowTitle("Product Manager")
         layout = QVBoxLayout(self)
         
-        # Product Table
-        self.product_table = QTableWidget(0, 4)
-        self.product_table.setHorizontalHeaderLabels(
-            ["Product Name", "Version", "Features", "Description"]
+        # Filter box
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter products...")
+        layout.addWidget(self.filter_edit)
+        
+        # Product Table (model/view so large catalogs open instantly)
+        self.product_model = ProductTableModel(
+            columns=['name', 'version', 'features', 'description'],
+            catalog=getattr(self.parent(), 'product_catalog', None),
+            parent=self
         )
+        self.product_proxy = create_filter_proxy(self.product_model, self)
+        self.filter_edit.textChanged.connect(self.product_proxy.setFilterFixedString)
+        
+        self.product_table = QTableView()
+        self.product_table.setModel(self.product_proxy)
+        self.product_table.setSortingEnabled(True)
+        self.product_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.product_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.product_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.product_table)
         
         # Buttons
@@ -52,11 +71,12 @@ class ProductManagerDialog(QDialog):
         
     def load_products(self):
         """Load products from config"""
-        self.product_table.setRowCount(0)
-        products = self.config.get('products', [])
-        
-        for product in products:
-            self.add_product_to_table(Product(**product))
+        self.product_model.set_products(self.config.get('products', []))
+    
+    def apply_catalog_change(self, change):
+        """Apply products changed on disk while the dialog is open"""
+        if change.products:
+            self.product_model.apply_product_diff(change.products)
     
     def add_product(self):
         """Add new product"""
@@ -67,35 +87,35 @@ class ProductManagerDialog(QDialog):
     
     def add_product_to_table(self, product: Product):
         """Add product to table"""
-        row = self.product_table.rowCount()
-        self.product_table.insertRow(row)
-        
-        self.product_table.setItem(row, 0, QTableWidgetItem(product.name))
-        self.product_table.setItem(row, 1, QTableWidgetItem(product.version))
-        self.product_table.setItem(row, 2, QTableWidgetItem(
-            ", ".join(f.name for f in product.features)
-        ))
-        # Handle case where description might not exist
-        description = getattr(product, 'description', '')
-        self.product_table.setItem(row, 3, QTableWidgetItem(description))
+        data = product.to_dict()
+        self.product_model.append_products([data])
+        self.changed_keys.add(product_key(data))
+
+    def selected_row(self) -> int:
+        """Return the model row of the selected product, or -1"""
+        index = self.product_table.currentIndex()
+        if not index.isValid():
+            return -1
+        return self.product_proxy.mapToSource(index).row()
 
     def edit_product(self):
-        selected_items = self.product_table.selectedItems()
-        if not selected_items:
+        row = self.selected_row()
+        if row < 0:
             QMessageBox.warning(self, "Warning", "Please select a product to edit")
             return
             
-        selected_item = selected_items[0]
-        product_id = selected_item.data(Qt.UserRole)
-        
-        dialog = ProductDialog(self.config, product_id, self)
+        dialog = ProductDialog(self.product_model.product(row), self)
         if dialog.exec_():
-            self.load_products()  # Refresh the list after editing
+            data = dialog.get_product().to_dict()
+            # A renamed product removes the old key
+            self.changed_keys.add(product_key(self.product_model.product_data(row)))
+            self.changed_keys.add(product_key(data))
+            self.product_model.update_product(row, data)
 
     def delete_product(self):
         """Delete selected product"""
-        selected_items = self.product_table.selectedItems()
-        if not selected_items:
+        row = self.selected_row()
+        if row < 0:
             QMessageBox.warning(self, "Warning", "Please select a product to delete")
             return
             
@@ -108,30 +128,14 @@ class ProductManagerDialog(QDialog):
         )
         
         if reply == QMessageBox.Yes:
-            row = selected_items[0].row()
-            self.product_table.removeRow(row)
+            self.changed_keys.add(product_key(self.product_model.product_data(row)))
+            self.product_model.remove_product(row)
 
     def accept(self):
         """Override accept to save products before closing"""
         try:
-            # Convert products in table to list of dictionaries
-            products = []
-            for row in range(self.product_table.rowCount()):
-                product = {
-                    'name': self.product_table.item(row, 0).text(),
-                    'version': self.product_table.item(row, 1).text(),
-                    'features': [],  # Get features from the table cell
-                    'quantity': 1  # Default quantity
-                }
-                
-                # Parse features from the features column
-                features_text = self.product_table.item(row, 2).text()
-                if features_text:
-                    features = [{'name': f.strip(), 'value': '', 'quantity': 1, 'enabled': True} 
-                              for f in features_text.split(',')]
-                    product['features'] = features
-
-                products.append(product)
+            # The model holds the product dictionaries directly
+            products = self.product_model.all_product_data()
             
             # Update config with new products
             self.config['products'] = products
@@ -1,8 +1,68 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, 
                            QProgressBar, QLineEdit, QMessageBox)
+from PyQt5.QtCore import QThread, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import os
-import shutil
+import threading
+from utils.file_operations import atomic_copy
+
+# Network filesystems (SMB/NFS) are latency bound rather than CPU bound,
+# so we keep many more copies in flight than there are cores
+SYNC_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+class SyncWorker(QThread):
+    """Copies the server directory tree to the local license directory off the GUI thread"""
+    progress = pyqtSignal(int, int)   # files copied, total files
+    completed = pyqtSignal(int)       # number of files copied
+    failed = pyqtSignal(str)          # error message
+    cancelled = pyqtSignal()
+
+    def __init__(self, server_path: Path, local_path: Path, max_workers: int = SYNC_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.server_path = Path(server_path)
+        self.local_path = Path(local_path)
+        self.max_workers = max_workers
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; copies already in flight are allowed to finish"""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            self.local_path.mkdir(parents=True, exist_ok=True)
+            
+            # Collect files to copy (directories are created on demand)
+            files = [p for p in self.server_path.glob('**/*') if p.is_file()]
+            total_files = len(files)
+            self.progress.emit(0, total_files)
+            
+            copied = 0
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(atomic_copy, src_path,
+                                    self.local_path / src_path.relative_to(self.server_path))
+                    for src_path in files
+                ]
+                for future in as_completed(futures):
+                    if self._cancel_event.is_set():
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        self.cancelled.emit()
+                        return
+                    try:
+                        future.result()
+                    except Exception:
+                        # Don't keep copying the rest of the tree after a failure
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise
+                    copied += 1
+                    self.progress.emit(copied, total_files)
+            
+            self.completed.emit(copied)
+            
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class ServerSyncDialog(QDialog):
     def __init__(self, config, parent=None):
@@ -39,6 +99,14 @@ class ServerSyncDialog(QDialog):
         self.sync_button.clicked.connect(self.sync_directories)
         layout.addWidget(self.sync_button)
         
+        # Cancel button (only enabled while a sync is running)
+        self.cancel_button = QPushButton("Cancel Sync")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_sync)
+        layout.addWidget(self.cancel_button)
+        
+        self.sync_worker = None
+        
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.accept)
         layout.addWidget(self.close_button)
@@ -87,43 +155,73 @@ class ServerSyncDialog(QDialog):
         return self.server_connected, self.server_path.text() if self.server_connected else None
 
     def sync_directories(self):
-        """Sync local and server directories"""
+        """Start syncing the server directory to the local license directory in the background"""
         try:
             server_path = Path(self.server_path.text())
             local_path = Path(self.config['paths']['licenses'])
             
-            # Create local directory if it doesn't exist
-            local_path.mkdir(parents=True, exist_ok=True)
-            
-            # Count total files for progress bar
-            total_files = len(list(server_path.glob('**/*')))
-            self.progress.setMaximum(total_files)
-            current_progress = 0
+            self.sync_worker = SyncWorker(server_path, local_path, parent=self)
+            self.sync_worker.progress.connect(self.on_sync_progress)
+            self.sync_worker.completed.connect(self.on_sync_completed)
+            self.sync_worker.failed.connect(self.on_sync_failed)
+            self.sync_worker.cancelled.connect(self.on_sync_cancelled)
+            self.sync_worker.finished.connect(self.on_sync_finished)
             
-            # Sync files from server to local
-            for src_path in server_path.glob('**/*'):
-                if src_path.is_file():
-                    # Calculate relative path
-                    rel_path = src_path.relative_to(server_path)
-                    dst_path = local_path / rel_path
-                    
-                    # Create parent directories if needed
-                    dst_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copy file
-                    shutil.copy2(src_path, dst_path)
-                    
-                    # Update progress
-                    current_progress += 1
-                    self.progress.setValue(current_progress)
-            
-            self.status_label.setText("Sync completed successfully!")
-            QMessageBox.information(self, "Success", "Directory sync completed!")
+            self.sync_button.setEnabled(False)
+            self.test_button.setEnabled(False)
+            self.cancel_button.setEnabled(True)
+            self.status_label.setText("Syncing...")
+            self.sync_worker.start()
             
         except Exception as e:
             self.status_label.setText(f"Sync failed: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to sync directories: {str(e)}")
 
+    def cancel_sync(self):
+        """Cancel a running sync"""
+        if self.sync_worker and self.sync_worker.isRunning():
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling sync...")
+            self.sync_worker.cancel()
+
+    def on_sync_progress(self, copied: int, total: int):
+        self.progress.setMaximum(total)
+        self.progress.setValue(copied)
+        self.status_label.setText(f"Syncing... {copied}/{total} files")
+
+    def on_sync_completed(self, copied: int):
+        self.status_label.setText(f"Sync completed successfully! ({copied} files)")
+        QMessageBox.information(self, "Success", "Directory sync completed!")
+
+    def on_sync_failed(self, message: str):
+        self.status_label.setText(f"Sync failed: {message}")
+        QMessageBox.critical(self, "Error", f"Failed to sync directories: {message}")
+
+    def on_sync_cancelled(self):
+        self.status_label.setText("Sync cancelled")
+
+    def on_sync_finished(self):
+        self.sync_button.setEnabled(True)
+        self.test_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.sync_worker = None
+
+    def stop_sync(self):
+        """Cancel a running sync and wait for the worker to finish"""
+        # Don't let the worker outlive the dialog
+        if self.sync_worker and self.sync_worker.isRunning():
+            self.sync_worker.cancel()
+            self.sync_worker.wait()
+
+    def closeEvent(self, event):
+        self.stop_sync()
+        super().closeEvent(event)
+
+    def done(self, result):
+        # accept() and reject() both end up here
+        self.stop_sync()
+        super().done(result)
+
     def accept(self):
         # Save any final config changes before closing
         if self.server_path.text():
@@ -0,0 +1,234 @@
+from PyQt5.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QTableWidget,
+                           QTableWidgetItem, QPushButton, QLabel, QSpinBox,
+                           QInputDialog, QMessageBox, QHeaderView)
+from PyQt5.QtCore import QThreadPool, QElapsedTimer
+from core.license_pipeline import LicensePipeline, LicenseJob
+from .workers import QueueJobWorker
+import os
+
+class GenerationQueuePanel(QGroupBox):
+    """
+    Queue of license generation jobs built from LicenseFrame form states.
+    Jobs run concurrently on a dedicated thread pool and share one warm signer.
+    """
+
+    COLUMNS = ['#', 'Customer', 'Customer ID', 'System', 'Platforms', 'Status', 'Time (ms)']
+    STATUS_COLUMN = 5
+    TIME_COLUMN = 6
+
+    def __init__(self, license_frame, parent=None):
+        super().__init__("Generation Queue", parent)
+        self.license_frame = license_frame
+        # Reuse the frame's signer so its cached key is shared by every job
+        self.pipeline = LicensePipeline(license_frame.signer, self.save_license)
+
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(os.cpu_count() or 4)
+
+        self.jobs = []           # LicenseJob per table row
+        self.pending_rows = []   # rows not yet submitted
+        self.workers = {}        # row -> QueueJobWorker while queued/running
+        self.completed = 0
+        self.failed = 0
+        self.timer = QElapsedTimer()
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.job_table = QTableWidget(0, len(self.COLUMNS))
+        self.job_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.job_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.job_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.job_table)
+
+        # Enqueue buttons
+        enqueue_layout = QHBoxLayout()
+
+        add_current_btn = QPushButton("Add Current Form")
+        add_current_btn.clicked.connect(self.enqueue_current)
+        enqueue_layout.addWidget(add_current_btn)
+
+        add_customers_btn = QPushButton("Add for Customer IDs...")
+        add_customers_btn.clicked.connect(self.enqueue_customer_ids)
+        enqueue_layout.addWidget(add_customers_btn)
+
+        add_platforms_btn = QPushButton("Add per Platform")
+        add_platforms_btn.clicked.connect(self.enqueue_per_platform)
+        enqueue_layout.addWidget(add_platforms_btn)
+
+        layout.addLayout(enqueue_layout)
+
+        # Run controls
+        run_layout = QHBoxLayout()
+
+        run_layout.addWidget(QLabel("Workers:"))
+        self.worker_count = QSpinBox()
+        self.worker_count.setRange(1, 64)
+        self.worker_count.setValue(self.thread_pool.maxThreadCount())
+        run_layout.addWidget(self.worker_count)
+
+        self.start_button = QPushButton("Start")
+        self.start_button.clicked.connect(self.start_queue)
+        run_layout.addWidget(self.start_button)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_queue)
+        run_layout.addWidget(self.cancel_button)
+
+        clear_button = QPushButton("Clear Finished")
+        clear_button.clicked.connect(self.clear_finished)
+        run_layout.addWidget(clear_button)
+
+        layout.addLayout(run_layout)
+
+        self.throughput_label = QLabel("No jobs queued")
+        layout.addWidget(self.throughput_label)
+
+    def save_license(self, job: LicenseJob, license_data: str):
+        """Save a queued license into the customer directory structure"""
+        return self.license_frame.dir_manager.save_license(
+            job.customer_info['name'],
+            job.customer_info['id'],
+            license_data,
+            job.license_system
+        )
+
+    def add_job(self, job: LicenseJob):
+        """Append a job to the queue table"""
+        row = self.job_table.rowCount()
+        job.job_id = str(row + 1)
+        self.jobs.append(job)
+        self.pending_rows.append(row)
+
+        self.job_table.insertRow(row)
+        values = [
+            job.job_id,
+            job.customer_info.get('name', ''),
+            job.customer_info.get('id', ''),
+            str(job.license_system),
+            ", ".join(job.license_info.get('platforms', [])),
+            "Queued",
+            ""
+        ]
+        for column, value in enumerate(values):
+            self.job_table.setItem(row, column, QTableWidgetItem(value))
+        self.update_throughput()
+
+    def _build_jobs(self, builder):
+        try:
+            for job in builder():
+                self.add_job(job)
+        except ValueError as e:
+            QMessageBox.warning(self, "Validation Error", str(e))
+
+    def enqueue_current(self):
+        """Enqueue the license currently described by the form"""
+        self._build_jobs(lambda: [self.license_frame.build_license_job()])
+
+    def enqueue_customer_ids(self):
+        """Enqueue the current form for a list of customer IDs"""
+        text, ok = QInputDialog.getMultiLineText(
+            self,
+            "Customer IDs",
+            "Enter one customer ID per line:"
+        )
+        if not ok:
+            return
+        customer_ids = [line.strip() for line in text.splitlines() if line.strip()]
+        self._build_jobs(lambda: [
+            self.license_frame.build_license_job(customer_id=customer_id)
+            for customer_id in customer_ids
+        ])
+
+    def enqueue_per_platform(self):
+        """Enqueue one license per selected platform"""
+        self._build_jobs(lambda: [
+            self.license_frame.build_license_job(platforms=[platform])
+            for platform in self.license_frame.selected_platforms
+        ])
+
+    def start_queue(self):
+        """Submit all pending jobs to the worker pool"""
+        if not self.pending_rows:
+            return
+        if not self.workers:
+            # Starting a fresh run
+            self.completed = 0
+            self.failed = 0
+            self.timer.start()
+
+        self.thread_pool.setMaxThreadCount(self.worker_count.value())
+        for row in self.pending_rows:
+            worker = QueueJobWorker(self.pipeline, self.jobs[row], row)
+            worker.signals.progress.connect(lambda _, message, row=row: self.set_status(row, message))
+            worker.signals.result.connect(self.on_job_result)
+            worker.signals.error.connect(lambda message, row=row: self.on_job_error(row, message))
+            worker.signals.cancelled.connect(lambda row=row: self.set_status(row, "Cancelled"))
+            worker.signals.finished.connect(lambda row=row: self.on_job_finished(row))
+            self.workers[row] = worker
+            self.thread_pool.start(worker)
+        self.pending_rows = []
+
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+    def cancel_queue(self):
+        """Cancel jobs that haven't started yet"""
+        for worker in self.workers.values():
+            worker.cancel()
+        self.cancel_button.setEnabled(False)
+
+    def clear_finished(self):
+        """Remove finished rows from the table (only when idle)"""
+        if self.workers:
+            return
+        for row in reversed(range(self.job_table.rowCount())):
+            if row not in self.pending_rows:
+                self.job_table.removeRow(row)
+                del self.jobs[row]
+        # Renumber remaining (pending) rows
+        self.pending_rows = list(range(self.job_table.rowCount()))
+        for row, job in enumerate(self.jobs):
+            job.job_id = str(row + 1)
+            self.job_table.item(row, 0).setText(job.job_id)
+        self.update_throughput()
+
+    def set_status(self, row: int, status: str):
+        self.job_table.item(row, self.STATUS_COLUMN).setText(status)
+
+    def on_job_result(self, result):
+        row = int(result.job.job_id) - 1
+        if result.success:
+            self.completed += 1
+            self.set_status(row, "Done")
+            self.job_table.item(row, self.STATUS_COLUMN).setToolTip(str(result.output_path))
+        else:
+            self.on_job_error(row, result.error)
+        self.job_table.item(row, self.TIME_COLUMN).setText(f"{result.elapsed * 1000:.0f}")
+
+    def on_job_error(self, row: int, message: str):
+        self.failed += 1
+        self.set_status(row, "Failed")
+        self.job_table.item(row, self.STATUS_COLUMN).setToolTip(message)
+
+    def on_job_finished(self, row: int):
+        self.workers.pop(row, None)
+        self.update_throughput()
+        if not self.workers:
+            self.start_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+
+    def update_throughput(self):
+        """Refresh the aggregate status line"""
+        queued = len(self.pending_rows) + len(self.workers)
+        if not self.timer.isValid():
+            self.throughput_label.setText(f"{queued} queued")
+            return
+        elapsed = self.timer.elapsed() / 1000.0
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        self.throughput_label.setText(
+            f"{self.completed} done, {self.failed} failed, {queued} queued - "
+            f"{rate:.1f} licenses/s"
+        )
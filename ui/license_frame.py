@@ -1,27 +1,23 @@
 from PyQt5.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QLabel, QLineEdit, QComboBox, QDateEdit, QPushButton,
-                           QScrollArea, QWidget, QGroupBox, QCheckBox, QTableWidgetItem,
+                           QScrollArea, QWidget, QGroupBox,
                            QDialog, QTextEdit, QMessageBox, QStackedWidget, QFormLayout, QSpinBox,
-                           QFileDialog, QTableWidget)
-from PyQt5.QtCore import Qt, QDate, pyqtSlot
-from .dialogs.platform_select import PlatformSelectDialog
-from .dialogs.product_dialog import ProductDialog
+                           QFileDialog, QProgressBar, QTableView,
+                           QAbstractItemView, QHeaderView)
+from PyQt5.QtCore import Qt, QDate, pyqtSlot, QThreadPool, QTimer
 from core.product import Product
 from core.license_generator import LicenseGeneratorFactory, LicenseType
 from core.key_manager import KeyManager
 from encryption.license_signing import LicenseSigner
 from pathlib import Path
 import json
-from utils.validation import LicenseValidator
-from utils.host_identifier import HostIdentifier
 from typing import List, Tuple, Dict
 from enum import Enum
-from .dialogs.floating_license_dialog import FloatingLicenseDialog
-from .dialogs.credentials_dialog import CredentialsDialog
-from security.credentials_manager import CredentialsManager
 from utils.directory_manager import CustomerDirectoryManager
-from datetime import datetime, date
 from core.license_enforcer import LicenseEnforcer
+from core.license_pipeline import LicenseJob
+from .workers import LicenseGenerationWorker, SignerWarmupWorker
+from .models import ProductTableModel, ActiveLicenseTableModel, create_filter_proxy
 
 class LicenseType(Enum):
     SINGLE_USER = "Single-User License"
@@ -152,6 +148,10 @@ class LicenseFrame(QFrame):
         self.server_path = None
         self.server_info = None
         self.license_enforcer = LicenseEnforcer()
+        
+        # Load the signing key in the background once the window has painted,
+        # so the first Generate is fast without delaying startup
+        QTimer.singleShot(0, lambda: self.thread_pool.start(SignerWarmupWorker(self.signer)))
 
     def validate_config(self, config: Dict):
         """Validate configuration structure"""
@@ -172,7 +172,7 @@ class LicenseFrame(QFrame):
     def initialize_components(self, config: Dict):
         self.config = config
         self.floating_license_config = None  # Store floating license settings
-        self.credentials_manager = CredentialsManager()
+        self._credentials_manager = None  # Created on first use (keyring round-trip)
         self.selected_platforms = []  # Initialize selected_platforms list
         
         # Initialize key management
@@ -183,6 +183,10 @@ class LicenseFrame(QFrame):
         )
         self.signer = LicenseSigner(self.key_manager)
         
+        # Background workers for generation and key warm-up
+        self.thread_pool = QThreadPool.globalInstance()
+        self.generation_worker = None
+        
         # Create SQL options widget
         self.sql_options = self.create_sql_options()
         self.sql_options.setVisible(False)  # Hide by default
@@ -217,9 +221,12 @@ class LicenseFrame(QFrame):
         content_layout.addWidget(product_group)
         
         # Active Licenses Table
-        self.active_licenses_table = QTableWidget()
-        self.active_licenses_table.setColumnCount(3)
-        self.active_licenses_table.setHorizontalHeaderLabels(['License ID', 'Type', 'Expiration'])
+        self.active_licenses_model = ActiveLicenseTableModel(parent=self)
+        self.active_licenses_proxy = create_filter_proxy(self.active_licenses_model, self)
+        self.active_licenses_table = QTableView()
+        self.active_licenses_table.setModel(self.active_licenses_proxy)
+        self.active_licenses_table.setSortingEnabled(True)
+        self.active_licenses_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         content_layout.addWidget(self.active_licenses_table)
         
         # Add scroll area to main layout
@@ -228,9 +235,9 @@ class LicenseFrame(QFrame):
         # Action Buttons
         button_layout = QHBoxLayout()
         
-        generate_button = QPushButton("Generate License")
-        generate_button.clicked.connect(self.generate_license)
-        button_layout.addWidget(generate_button)
+        self.generate_button = QPushButton("Generate License")
+        self.generate_button.clicked.connect(self.generate_license)
+        button_layout.addWidget(self.generate_button)
         
         preview_button = QPushButton("Preview")
         preview_button.clicked.connect(self.preview_license)
@@ -238,6 +245,20 @@ class LicenseFrame(QFrame):
         
         main_layout.addLayout(button_layout)
         
+        # Generation progress (shown while a license is being generated)
+        progress_layout = QHBoxLayout()
+        self.generation_progress = QProgressBar()
+        self.generation_progress.setRange(0, 100)
+        self.generation_progress.setVisible(False)
+        progress_layout.addWidget(self.generation_progress)
+        
+        self.cancel_generation_button = QPushButton("Cancel")
+        self.cancel_generation_button.setVisible(False)
+        self.cancel_generation_button.clicked.connect(self.cancel_generation)
+        progress_layout.addWidget(self.cancel_generation_button)
+        
+        main_layout.addLayout(progress_layout)
+        
         # REMOVE these lines that create duplicate dropdowns
         # self.form_layout = QFormLayout()
         # self.license_type_combo = QComboBox()
@@ -350,17 +371,30 @@ class LicenseFrame(QFrame):
         group = QGroupBox("Product Selection")
         layout = QVBoxLayout()
         
-        # Create a scrollable area for product checkboxes
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.NoFrame)
-        
-        # Container for checkboxes
-        self.product_container = QWidget()
-        self.product_layout = QVBoxLayout(self.product_container)
-        
-        scroll.setWidget(self.product_container)
-        layout.addWidget(scroll)
+        # Filter box for large catalogs
+        self.product_filter = QLineEdit()
+        self.product_filter.setPlaceholderText("Filter products...")
+        layout.addWidget(self.product_filter)
+        
+        # Checkable product table backed by a model (rows are only rendered when visible)
+        self.product_model = ProductTableModel(
+            self.config.get('products', []),
+            columns=['name', 'version', 'quantity', 'features'],
+            checkable=True,
+            catalog=getattr(self.window(), 'product_catalog', None),
+            parent=self
+        )
+        self.product_proxy = create_filter_proxy(self.product_model, self)
+        self.product_filter.textChanged.connect(self.product_proxy.setFilterFixedString)
+        
+        self.product_view = QTableView()
+        self.product_view.setModel(self.product_proxy)
+        self.product_view.setSortingEnabled(True)
+        self.product_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.product_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.product_view.verticalHeader().setVisible(False)
+        self.product_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.product_view)
         
         group.setLayout(layout)
         return group
@@ -374,6 +408,7 @@ class LicenseFrame(QFrame):
             self.sql_options.setVisible(False)
         
         if license_type == LicenseType.FLOATING:
+            from .dialogs.floating_license_dialog import FloatingLicenseDialog
             dialog = FloatingLicenseDialog(self)
             if dialog.exec_():
                 self.floating_license_config = dialog.get_values()
@@ -386,6 +421,7 @@ class LicenseFrame(QFrame):
 
     def show_platform_dialog(self):
         """Show platform selection dialog"""
+        from .dialogs.platform_select import PlatformSelectDialog
         # Pass the currently selected platforms to the dialog
         dialog = PlatformSelectDialog(current_platforms=self.selected_platforms, parent=self)
         if dialog.exec_():
@@ -441,8 +477,15 @@ class LicenseFrame(QFrame):
         return len(errors) == 0, errors
 
     def generate_license(self):
-        """Generate license based on selected system"""
+        """Generate license based on selected system
+        
+        Form values are read here on the GUI thread; signing and saving run
+        on a QThreadPool worker so the event loop is never blocked.
+        """
         try:
+            if self.generation_worker is not None:
+                return  # A generation is already running
+            
             # Validate form first
             valid, errors = self.validate_form()
             if not valid:
@@ -462,16 +505,28 @@ class LicenseFrame(QFrame):
                 self.signer
             )
             
-            # Generate license
-            license_data = generator.generate_license(
+            worker = LicenseGenerationWorker(
+                generator,
+                self.dir_manager,
+                license_system,
                 self.get_customer_info(),
                 self.get_license_info(),
                 self.get_products(),
-                self.get_host_info()
+                self.get_host_info(),
+                save_path=Path(self.save_path_input.text())
             )
+            worker.signals.progress.connect(self.on_generation_progress)
+            worker.signals.result.connect(self.on_license_saved)
+            worker.signals.error.connect(self.on_generation_error)
+            worker.signals.finished.connect(self.on_generation_finished)
             
-            # Save license
-            self.save_license(license_data, license_system)
+            self.generation_worker = worker
+            self.generate_button.setEnabled(False)
+            self.generation_progress.setValue(0)
+            self.generation_progress.setVisible(True)
+            self.cancel_generation_button.setVisible(True)
+            self.cancel_generation_button.setEnabled(True)
+            self.thread_pool.start(worker)
             
         except Exception as e:
             QMessageBox.critical(
@@ -480,6 +535,68 @@ class LicenseFrame(QFrame):
                 f"Failed to generate license: {str(e)}"
             )
     
+    def build_license_job(self, customer_id: str = None, platforms: List[str] = None) -> LicenseJob:
+        """Capture the current form state as a LicenseJob for the generation queue
+        
+        Args:
+            customer_id: Optional customer ID overriding the form value
+            platforms: Optional platform list overriding the selected platforms
+            
+        Raises:
+            ValueError: If the form doesn't validate
+        """
+        valid, errors = self.validate_form()
+        if not valid:
+            raise ValueError("\n".join(errors))
+        
+        customer_info = self.get_customer_info()
+        if customer_id:
+            customer_info['id'] = customer_id
+        
+        license_info = self.get_license_info()
+        if platforms is not None:
+            license_info['platforms'] = list(platforms)
+        
+        return LicenseJob(
+            license_system=self.license_system_combo.currentData(),
+            customer_info=customer_info,
+            license_info=license_info,
+            products=self.get_products(),
+            host_info=self.get_host_info()
+        )
+    
+    def cancel_generation(self):
+        """Cancel the running license generation"""
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.cancel_generation_button.setEnabled(False)
+            self.generation_progress.setFormat("Cancelling...")
+    
+    def on_generation_progress(self, percent: int, message: str):
+        self.generation_progress.setValue(percent)
+        self.generation_progress.setFormat(f"{message} %p%")
+    
+    def on_license_saved(self, license_path):
+        QMessageBox.information(
+            self,
+            "Success",
+            f"License saved successfully to:\n{license_path}"
+        )
+    
+    def on_generation_error(self, message: str):
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to generate license: {message}"
+        )
+    
+    def on_generation_finished(self):
+        self.generation_worker = None
+        self.generate_button.setEnabled(True)
+        self.generation_progress.setVisible(False)
+        self.generation_progress.setFormat("%p%")
+        self.cancel_generation_button.setVisible(False)
+    
     def get_system_options(self, license_system: str) -> Dict:
         """Get options specific to the selected license system"""
         if license_system == 'flexlm':
@@ -546,6 +663,7 @@ class LicenseFrame(QFrame):
 
     def add_product(self):
         """Add a new product"""
+        from .dialogs.product_dialog import ProductDialog
         dialog = ProductDialog(parent=self)
         if dialog.exec_():
             product = dialog.get_product()
@@ -553,8 +671,9 @@ class LicenseFrame(QFrame):
 
     def edit_product(self):
         """Edit selected product"""
-        current_row = self.product_table.currentRow()
+        current_row = self.get_selected_product_row()
         if current_row >= 0:
+            from .dialogs.product_dialog import ProductDialog
             product = self.get_product_from_row(current_row)
             dialog = ProductDialog(product, parent=self)
             if dialog.exec_():
@@ -563,52 +682,32 @@ class LicenseFrame(QFrame):
 
     def remove_product(self):
         """Remove selected product"""
-        current_row = self.product_table.currentRow()
+        current_row = self.get_selected_product_row()
         if current_row >= 0:
-            self.product_table.removeRow(current_row)
+            self.product_model.remove_product(current_row)
+
+    def get_selected_product_row(self) -> int:
+        """Return the model row of the selected product, or -1"""
+        index = self.product_view.currentIndex()
+        if not index.isValid():
+            return -1
+        return self.product_proxy.mapToSource(index).row()
 
     def add_product_to_table(self, product: Product):
         """Add product to the table"""
-        row = self.product_table.rowCount()
-        self.product_table.insertRow(row)
-        
-        self.product_table.setItem(row, 0, QTableWidgetItem(product.name))
-        self.product_table.setItem(row, 1, QTableWidgetItem(product.version))
-        self.product_table.setItem(row, 2, QTableWidgetItem(str(product.quantity)))
-        
-        features_text = ", ".join(f.name for f in product.features)
-        self.product_table.setItem(row, 3, QTableWidgetItem(features_text))
+        self.product_model.append_products([product.to_dict()])
 
     def update_product_in_table(self, row: int, product: Product):
         """Update product in the table"""
-        self.product_table.setItem(row, 0, QTableWidgetItem(product.name))
-        self.product_table.setItem(row, 1, QTableWidgetItem(product.version))
-        self.product_table.setItem(row, 2, QTableWidgetItem(str(product.quantity)))
-        
-        features_text = ", ".join(f.name for f in product.features)
-        self.product_table.setItem(row, 3, QTableWidgetItem(features_text))
+        self.product_model.update_product(row, product.to_dict())
 
     def get_product_from_row(self, row: int) -> Product:
         """Get product object from table row"""
-        name = self.product_table.item(row, 0).text()
-        version = self.product_table.item(row, 1).text()
-        quantity = int(self.product_table.item(row, 2).text())
-        
-        # Note: This is a simplified version - in a real implementation,
-        # you'd want to store the full product object somewhere
-        return Product(
-            name=name,
-            version=version,
-            features=[],
-            quantity=quantity
-        )
+        return self.product_model.product(row)
 
     def get_all_products(self) -> List[Product]:
         """Get all products from the table"""
-        products = []
-        for row in range(self.product_table.rowCount()):
-            products.append(self.get_product_from_row(row))
-        return products
+        return self.product_model.all_products()
 
     def create_flexlm_options(self):
         """Create FlexLM-specific options widget"""
@@ -675,32 +774,10 @@ class LicenseFrame(QFrame):
                 )
                 return
             
-            # Get or create the customer directory
-            path = self.dir_manager.create_customer_structure(customer_name, customer_id)
-            
-            # Determine file extension based on license system
-            extensions = {
-                'flexlm': '.lic',
-                'hasp': '.v2c',
-                'sentinel': '.c2v',
-                'mysql': '.sql'
-            }
-            extension = extensions.get(license_system, '.lic')
-            
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"license_{timestamp}{extension}"
-            
-            # Full path for the license file
-            license_path = path / filename
-            
-            # Save the license data
-            if isinstance(license_data, str):
-                with open(license_path, 'w', encoding='utf-8') as f:
-                    f.write(license_data)
-            else:
-                with open(license_path, 'wb') as f:
-                    f.write(license_data)
+            # Save into the customer directory structure
+            license_path = self.dir_manager.save_license(
+                customer_name, customer_id, license_data, license_system
+            )
             
             QMessageBox.information(
                 self,
@@ -776,6 +853,7 @@ class LicenseFrame(QFrame):
         license_type = self.license_type_combo.currentData()  # Now using consistent name
         
         if license_type == LicenseType.FLOATING:
+            from .dialogs.floating_license_dialog import FloatingLicenseDialog
             dialog = FloatingLicenseDialog(self)
             if dialog.exec_():
                 self.floating_license_config = dialog.get_values()
@@ -793,6 +871,14 @@ class LicenseFrame(QFrame):
         
         return data
 
+    @property
+    def credentials_manager(self):
+        """Credentials manager, created on first access to avoid a keyring round-trip at startup"""
+        if self._credentials_manager is None:
+            from security.credentials_manager import CredentialsManager
+            self._credentials_manager = CredentialsManager()
+        return self._credentials_manager
+
     def validate_server_path(self, server_path: str):
         """Validate server path and request credentials if needed"""
         # Check if we have credentials for this path
@@ -800,6 +886,7 @@ class LicenseFrame(QFrame):
         
         if not credentials:
             # Show credentials dialog
+            from .dialogs.credentials_dialog import CredentialsDialog
             dialog = CredentialsDialog(server_path, self)
             if dialog.exec_() == QDialog.Accepted:
                 credentials = dialog.get_credentials()
@@ -946,37 +1033,13 @@ class LicenseFrame(QFrame):
         return customer_info
 
     def refresh_product_list(self):
-        """Refresh the product checkboxes after changes"""
-        # Clear existing checkboxes
-        while self.product_layout.count():
-            item = self.product_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
+        """Reload the product table after changes"""
         # Load products from config
-        products = self.config.get('products', [])
-        
-        # Add checkbox for each product
-        for product_data in products:
-            product = Product(**product_data)
-            checkbox = QCheckBox(f"{product.name} (v{product.version})")
-            checkbox.setProperty('product_data', product_data)  # Store product data
-            self.product_layout.addWidget(checkbox)
-        
-        # Add stretch at the end to keep checkboxes at top
-        self.product_layout.addStretch()
+        self.product_model.set_products(self.config.get('products', []))
 
     def get_selected_products(self) -> List[Product]:
         """Get list of selected products"""
-        selected_products = []
-        for i in range(self.product_layout.count()):
-            item = self.product_layout.itemAt(i)
-            if item and item.widget():
-                checkbox = item.widget()
-                if isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                    product_data = checkbox.property('product_data')
-                    selected_products.append(Product(**product_data))
-        return selected_products
+        return self.product_model.checked_products()
 
     def get_products(self) -> List[Product]:
         """Get selected products for the license"""
@@ -1008,10 +1071,38 @@ class LicenseFrame(QFrame):
         """Populate the license systems combo box"""
         self.license_system_combo.clear()
         if self.config and 'license_systems' in self.config:
+            # Each system may choose the compact binary license format
+            LicenseGeneratorFactory.load_license_formats(self.config['license_systems'])
             for system_id, system in self.config['license_systems'].items():
                 if system.get('enabled', True):
                     self.license_system_combo.addItem(system['name'], system_id)
 
+    def apply_catalog_change(self, change):
+        """
+        Apply a core.catalog.CatalogChange without rebuilding the form
+        Only changed products and license systems are touched, so selections survive
+        """
+        if change.products:
+            self.product_model.apply_product_diff(change.products)
+        
+        diff = change.license_systems
+        if not diff:
+            return
+        combo = self.license_system_combo
+        for system_id in diff.removed:
+            index = combo.findData(system_id)
+            if index >= 0:
+                combo.removeItem(index)
+        for system_id, system in {**diff.added, **diff.changed}.items():
+            index = combo.findData(system_id)
+            if not system.get('enabled', True):
+                if index >= 0:
+                    combo.removeItem(index)
+            elif index >= 0:
+                combo.setItemText(index, system.get('name', system_id))
+            else:
+                combo.addItem(system.get('name', system_id), system_id)
+
     def browse_save_location(self):
         """Browse for save location, using server path if connected"""
         try:
@@ -1138,15 +1229,4 @@ class LicenseFrame(QFrame):
 
     def update_active_licenses_table(self):
         """Update the table with active licenses"""
-        self.active_licenses_table.setRowCount(len(self.license_enforcer.active_licenses))
-        for row, license_data in enumerate(self.license_enforcer.active_licenses):
-            self.active_licenses_table.setItem(row, 0, QTableWidgetItem(license_data.get('id', '')))
-            self.active_licenses_table.setItem(row, 1, QTableWidgetItem(license_data.get('type', '')))
-            self.active_licenses_table.setItem(row, 2, QTableWidgetItem(license_data.get('expiration_date', '')))
-
-
-
-
-
-
-
+        self.active_licenses_model.sync(self.license_enforcer.active_licenses)
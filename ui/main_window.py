@@ -1,26 +1,82 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                           QMenuBar, QMenu, QAction, QMessageBox, QDialog, QFileDialog)
-from PyQt5.QtCore import Qt, QSize
+                           QMenuBar, QMenu, QAction, QMessageBox, QDialog, QFileDialog,
+                           QDockWidget)
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
 from PyQt5.QtGui import QFont
 from .license_frame import LicenseFrame
-from .dialogs.eval_dialog import EvalDialog
-from .dialogs.common_settings import CommonSettingsDialog
+from .generation_queue import GenerationQueuePanel
 from pathlib import Path
 import json
-from .dialogs.license_systems_dialog import LicenseSystemsDialog
-from core.license_generator import LicenseType
-from .dialogs.server_sync_dialog import ServerSyncDialog  # Add this import
-from .dialogs.user_guide import UserGuideDialog
+import logging
+from config.config_service import get_config_service
+from config.config_schema import CONFIG_SCHEMA
+from core.catalog import CatalogWatcher
+from core.product_catalog import ProductCatalog
+# Dialogs are imported where they are opened to keep startup fast
+
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
+    # Emitted from the file watcher thread; delivered on the GUI thread
+    config_changed = pyqtSignal(object)
+    catalog_changed = pyqtSignal(object)
+
     def __init__(self, config, parent=None):
         super().__init__(parent)
         self.config = config
         # Add default config paths if not present
         if 'paths' not in self.config:
             self.config['paths'] = {'config': 'src/config'}
+        config_dir = Path(self.config['paths']['config'])
+        self.config_service = get_config_service(config_dir / 'config.json', CONFIG_SCHEMA)
+        self.products_service = get_config_service(config_dir / 'products.json')
+        # Products are stored per product in products.db. products.json is an input:
+        # edits made to it (while closed, or live via the watcher) are applied to the
+        # catalog, and it is only rewritten by Products > Export products.json
+        self.product_catalog = ProductCatalog(config_dir / 'products.db')
+        if self.product_catalog.sync_from_json(self.products_service.path, self.products_service.get()):
+            self.config.pop('products', None)
+        if 'products' not in self.config:
+            self.config['products'] = self.product_catalog.all_data()
+        self.product_manager_dialog = None
         self.setup_ui()
         
+        # Pick up edits to config.json and products.json made outside the application
+        self.config_changed.connect(self.apply_config)
+        self.config_service.subscribe(self.config_changed.emit)
+        self.catalog_watcher = CatalogWatcher(self.config_service, self.products_service)
+        self.catalog_changed.connect(self.apply_catalog_change)
+        self.catalog_watcher.subscribe(self.catalog_changed.emit)
+        self.catalog_watcher.start()
+        
+    def apply_config(self, config):
+        """Apply a configuration reloaded from disk (GUI thread)"""
+        if config is self.config:
+            return  # Our own save
+        # Update in place - the license frame and dialogs hold this same dict
+        paths = self.config.get('paths')
+        products = self.config.get('products')
+        self.config.clear()
+        self.config.update(config)
+        self.config.setdefault('paths', paths)
+        if products is not None:
+            self.config.setdefault('products', products)
+        logger.info("Configuration changed on disk - reloaded")
+        self.statusBar().showMessage("Configuration reloaded", 5000)
+        
+    def apply_catalog_change(self, change):
+        """Apply only the products and license systems that changed on disk (GUI thread)"""
+        if change.products:
+            self.product_catalog.apply_diff(change.products)
+            self.product_catalog.record_json_sync(self.products_service.path, self.products_service.get())
+            self.config['products'] = self.product_catalog.all_data()
+        self.license_frame.apply_catalog_change(change)
+        if self.product_manager_dialog is not None:
+            self.product_manager_dialog.apply_catalog_change(change)
+        self.statusBar().showMessage(
+            f"Catalog updated: products {change.products.summary()}, "
+            f"license systems {change.license_systems.summary()}", 5000)
+        
     def setup_ui(self):
         """Initialize the user interface"""
         # Set minimum window dimensions to prevent UI from breaking
@@ -170,6 +226,13 @@ class MainWindow(QMainWindow):
         # Create license frame and add it to the layout
         self.license_frame = LicenseFrame(self, config=self.config)  # Pass config here
         self.layout.addWidget(self.license_frame)
+        
+        # Generation queue for issuing the current form to many customers/platforms
+        self.generation_queue = GenerationQueuePanel(self.license_frame, self)
+        self.queue_dock = QDockWidget("Generation Queue", self)
+        self.queue_dock.setWidget(self.generation_queue)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.queue_dock)
+        self.queue_dock.hide()
         #TODO: Add the eval frame to the layout
         self.create_menu_bar()
         
@@ -213,6 +276,10 @@ class MainWindow(QMainWindow):
         sync_products_action.triggered.connect(self.sync_products)
         products_menu.addAction(sync_products_action)
         
+        export_products_action = QAction('&Export products.json', self)
+        export_products_action.triggered.connect(self.export_products)
+        products_menu.addAction(export_products_action)
+        
         # Tools Menu
         tools_menu = menubar.addMenu('&Tools')
         
@@ -225,6 +292,11 @@ class MainWindow(QMainWindow):
         key_management_action.triggered.connect(self.show_key_management)
         tools_menu.addAction(key_management_action)
         
+        # Generation queue panel toggle
+        queue_action = self.queue_dock.toggleViewAction()
+        queue_action.setText('Generation &Queue')
+        tools_menu.addAction(queue_action)
+        
         # Help Menu
         help_menu = menubar.addMenu('&Help')
         
@@ -287,13 +359,12 @@ class MainWindow(QMainWindow):
 
     def show_settings(self):
         """Show the settings dialog"""
+        from .dialogs.common_settings import CommonSettingsDialog
         dialog = CommonSettingsDialog(self.config, self)
         if dialog.exec_():
             # Save the updated config
             try:
-                config_path = Path(self.config['paths']['config']) / 'config.json'
-                with open(config_path, 'w') as f:
-                    json.dump(self.config, f, indent=4)
+                self.config_service.save(self.config)
                 QMessageBox.information(
                     self,
                     "Settings Saved",
@@ -319,15 +390,21 @@ class MainWindow(QMainWindow):
         """Show the product manager dialog"""
         from .dialogs.product_manager_dialog import ProductManagerDialog
         dialog = ProductManagerDialog(self.config, self)
-        if dialog.exec_():
-            # Save updated products to config
-            self.save_products_config()
+        self.product_manager_dialog = dialog
+        try:
+            accepted = dialog.exec_()
+        finally:
+            self.product_manager_dialog = None
+        if accepted:
+            # Save the products that were added, edited or deleted
+            self.save_products_config(dialog.changed_keys)
             # Update product dropdown in license frame
             self.license_frame.refresh_product_list()
 
     def sync_products(self):
         """Synchronize products with server"""
         try:
+            from .dialogs.server_sync_dialog import ServerSyncDialog
             dialog = ServerSyncDialog(self.config, self)
             if dialog.exec_():
                 # Refresh local product list after sync
@@ -345,12 +422,16 @@ class MainWindow(QMainWindow):
                 f"Failed to synchronize products: {str(e)}"
             )
 
-    def save_products_config(self):
-        """Save products configuration to file"""
+    def save_products_config(self, changed_keys):
+        """
+        Save products to the catalog
+
+        Args:
+            changed_keys: (name, version) keys of the products that were added, edited or deleted;
+                          only those rows are written
+        """
         try:
-            products_file = Path(self.config['paths']['config']) / 'products.json'
-            with open(products_file, 'w') as f:
-                json.dump(self.config['products'], f, indent=4)
+            self.product_catalog.apply_changed(self.config['products'], changed_keys)
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -358,6 +439,20 @@ class MainWindow(QMainWindow):
                 f"Failed to save products configuration: {str(e)}"
             )
 
+    def export_products(self):
+        """Write the product catalog to products.json"""
+        try:
+            path = self.product_catalog.export_json(self.products_service.path)
+            # Our own write shouldn't come back as an outside edit
+            self.products_service.mark_written(self.product_catalog.all_data())
+            self.statusBar().showMessage(f"Exported {len(self.product_catalog)} products to {path}", 5000)
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Failed to export products: {str(e)}"
+            )
+
     def show_key_management(self):
         """Launch the key management GUI"""
         try:
@@ -389,11 +484,13 @@ class MainWindow(QMainWindow):
 
     def show_user_guide(self):
         """Show the user guide dialog"""
+        from .dialogs.user_guide import UserGuideDialog
         guide = UserGuideDialog(self)
         guide.exec_()
 
     def show_server_sync_dialog(self):
         """Show the server sync dialog and update license frame if connected"""
+        from .dialogs.server_sync_dialog import ServerSyncDialog
         dialog = ServerSyncDialog(self.config, self)
         if dialog.exec_():
             # Get the server status and update the license frame
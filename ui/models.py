@@ -0,0 +1,216 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from typing import Dict, Iterable, List
+from core.product import Product
+
+# Role returning raw (unformatted) values so the proxy sorts numbers as numbers
+SORT_ROLE = Qt.UserRole + 1
+
+class ProductTableModel(QAbstractTableModel):
+    """
+    Table model over product dictionaries (as stored in config['products']).
+    Display strings are built lazily in data(), so only visible rows cost anything.
+    """
+
+    HEADERS = {
+        'name': "Product Name",
+        'version': "Version",
+        'quantity': "Quantity",
+        'features': "Features",
+        'description': "Description"
+    }
+
+    def __init__(self, products: Iterable[Dict] = None, columns: List[str] = None,
+                 checkable: bool = False, catalog=None, parent=None):
+        """
+        Args:
+            products: Product dictionaries to show
+            columns: Column keys to display (see HEADERS)
+            checkable: Whether the first column has a selection checkbox
+            catalog: Optional ProductCatalog to share its cached Product instances
+        """
+        super().__init__(parent)
+        self.columns = columns or ['name', 'version', 'features', 'description']
+        self.checkable = checkable
+        self.catalog = catalog
+        self._products = list(products or [])
+        self._checked = [False] * len(self._products)
+        self._product_cache = {}  # row -> Product, built on first request
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._products)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS.get(self.columns[section], self.columns[section])
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        product = self._products[index.row()]
+        key = self.columns[index.column()]
+
+        if role == Qt.DisplayRole:
+            if key == 'features':
+                return ", ".join(f.get('name', '') if isinstance(f, dict) else f.name
+                                 for f in product.get('features', []))
+            value = product.get(key)
+            return '' if value is None else str(value)
+        if role == SORT_ROLE:
+            value = product.get(key, '')
+            if key == 'features':
+                return len(value or [])
+            return value if isinstance(value, (int, float)) else str(value or '')
+        if role == Qt.CheckStateRole and self.checkable and index.column() == 0:
+            return Qt.Checked if self._checked[index.row()] else Qt.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role == Qt.CheckStateRole and self.checkable and index.column() == 0:
+            self._checked[index.row()] = (value == Qt.Checked)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+        return False
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.checkable and index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    # Product operations
+
+    def set_products(self, products: Iterable[Dict]):
+        """Replace all products"""
+        self.beginResetModel()
+        self._products = list(products)
+        self._checked = [False] * len(self._products)
+        self._product_cache = {}
+        self.endResetModel()
+
+    def append_products(self, products: Iterable[Dict]):
+        """Append products, emitting a single row insertion"""
+        products = list(products)
+        if not products:
+            return
+        first = len(self._products)
+        self.beginInsertRows(QModelIndex(), first, first + len(products) - 1)
+        self._products.extend(products)
+        self._checked.extend([False] * len(products))
+        self.endInsertRows()
+
+    def update_product(self, row: int, product_data: Dict):
+        """Replace the product at a row"""
+        self._products[row] = product_data
+        self._product_cache.pop(row, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def remove_product(self, row: int):
+        """Remove the product at a row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._products[row]
+        del self._checked[row]
+        # Cached Products are keyed by row, which has just shifted
+        self._product_cache = {}
+        self.endRemoveRows()
+
+    def apply_product_diff(self, diff) -> None:
+        """
+        Apply a core.catalog.CatalogDiff of products in place
+
+        Only changed rows are touched; check states of the other rows are kept.
+        """
+        from core.catalog import product_key
+        rows = {product_key(product): row for row, product in enumerate(self._products)}
+        new_products = []
+        # Added or changed: update the row if the model already has the product, else append
+        for key, product in {**diff.added, **diff.changed}.items():
+            row = rows.get(key)
+            if row is None:
+                new_products.append(product)
+            elif self._products[row] != product:
+                self.update_product(row, product)
+        # Remove from the bottom up so earlier row numbers stay valid
+        for row in sorted((rows[key] for key in diff.removed if key in rows), reverse=True):
+            self.remove_product(row)
+        self.append_products(new_products)
+
+    def product_data(self, row: int) -> Dict:
+        """Return the raw product dictionary at a row"""
+        return self._products[row]
+
+    def product(self, row: int) -> Product:
+        """Return the Product at a row (created once and cached)"""
+        product = self._product_cache.get(row)
+        if product is None:
+            data = self._products[row]
+            product = self.catalog.product_for(data) if self.catalog is not None else Product.from_dict(data)
+            self._product_cache[row] = product
+        return product
+
+    def all_product_data(self) -> List[Dict]:
+        return list(self._products)
+
+    def all_products(self) -> List[Product]:
+        return [self.product(row) for row in range(len(self._products))]
+
+    def checked_products(self) -> List[Product]:
+        return [self.product(row) for row, checked in enumerate(self._checked) if checked]
+
+class ActiveLicenseTableModel(QAbstractTableModel):
+    """Table model over the LicenseEnforcer's active license dictionaries"""
+
+    COLUMNS = [
+        ('id', 'License ID'),
+        ('type', 'Type'),
+        ('expiration_date', 'Expiration')
+    ]
+
+    def __init__(self, licenses: List[Dict] = None, parent=None):
+        super().__init__(parent)
+        self._licenses = list(licenses or [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._licenses)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, SORT_ROLE):
+            key = self.COLUMNS[index.column()][0]
+            return str(self._licenses[index.row()].get(key, '') or '')
+        return None
+
+    def sync(self, licenses: List[Dict]):
+        """Bring the model in line with a license list that only grows at the end"""
+        current = len(self._licenses)
+        if len(licenses) < current:
+            self.beginResetModel()
+            self._licenses = list(licenses)
+            self.endResetModel()
+        elif len(licenses) > current:
+            self.beginInsertRows(QModelIndex(), current, len(licenses) - 1)
+            self._licenses.extend(licenses[current:])
+            self.endInsertRows()
+
+def create_filter_proxy(model: QAbstractTableModel, parent=None) -> QSortFilterProxyModel:
+    """Create a case-insensitive, all-column filter proxy that sorts on raw values"""
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+    proxy.setFilterKeyColumn(-1)
+    proxy.setSortRole(SORT_ROLE)
+    return proxy
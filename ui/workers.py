@@ -0,0 +1,133 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from pathlib import Path
+from typing import Dict, List, Optional
+import threading
+import logging
+from utils import tracing
+
+logger = logging.getLogger(__name__)
+
+class CancelledError(Exception):
+    """Raised inside a worker when its job has been cancelled"""
+    pass
+
+class WorkerSignals(QObject):
+    """Signals emitted by background workers (QRunnable can't own signals itself)"""
+    progress = pyqtSignal(int, str)   # percent complete, stage description
+    result = pyqtSignal(object)       # job result
+    error = pyqtSignal(str)           # error message
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+class SignerWarmupWorker(QRunnable):
+    """Loads and caches the signer's private key so the first generation doesn't pay for it"""
+
+    def __init__(self, signer):
+        super().__init__()
+        self.signer = signer
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            self.signer.warm_up()
+        except Exception as e:
+            # Not fatal - the key is loaded again on first sign
+            logger.warning(f"Signer warm-up failed: {e}")
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+class LicenseGenerationWorker(QRunnable):
+    """
+    Generates, signs and saves a single license off the GUI thread.
+    All form values must be collected on the GUI thread and passed in.
+    """
+
+    def __init__(self, generator, dir_manager, license_system: str,
+                 customer_info: Dict, license_info: Dict, products: List, host_info: Dict,
+                 save_path: Optional[Path] = None):
+        super().__init__()
+        self.generator = generator
+        self.dir_manager = dir_manager
+        self.license_system = license_system
+        self.customer_info = customer_info
+        self.license_info = license_info
+        self.products = products
+        self.host_info = host_info
+        self.save_path = save_path
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; takes effect at the next stage boundary"""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise CancelledError()
+
+    def run(self):
+        try:
+            with tracing.span('gui.generate_license', license_system=self.license_system):
+                self._check_cancelled()
+                self.signals.progress.emit(10, "Signing license...")
+                license_data = self.generator.generate_license(
+                    self.customer_info,
+                    self.license_info,
+                    self.products,
+                    self.host_info
+                )
+
+                # Last chance to cancel - nothing has been written yet
+                self._check_cancelled()
+                self.signals.progress.emit(70, "Saving license...")
+                if self.save_path and not self.save_path.exists():
+                    self.save_path.mkdir(parents=True, exist_ok=True)
+                license_path = self.dir_manager.save_license(
+                    self.customer_info['name'],
+                    self.customer_info['id'],
+                    license_data,
+                    self.license_system
+                )
+
+            self.signals.progress.emit(100, "Done")
+            self.signals.result.emit(license_path)
+
+        except CancelledError:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.error(f"License generation failed: {e}")
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+class QueueJobWorker(QRunnable):
+    """Runs one LicenseJob through a shared LicensePipeline"""
+
+    def __init__(self, pipeline, job, row: int):
+        super().__init__()
+        self.pipeline = pipeline
+        self.job = job
+        self.row = row
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Skip the job if it hasn't started yet"""
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            if self._cancel_event.is_set():
+                self.signals.cancelled.emit()
+                return
+            self.signals.progress.emit(0, "Running")
+            self.signals.result.emit(self.pipeline.process(self.job))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
@@ -2,7 +2,18 @@ from pathlib import Path
 from datetime import datetime
 import os
 import platform
-from typing import Optional
+import threading
+from typing import Optional, Union
+from utils.file_operations import atomic_write
+from utils import tracing
+
+# License file extension per license system
+LICENSE_EXTENSIONS = {
+    'flexlm': '.lic',
+    'hasp': '.v2c',
+    'sentinel': '.c2v',
+    'mysql': '.sql'
+}
 
 class CustomerDirectoryManager:
     def __init__(self, base_path: str):
@@ -11,7 +22,11 @@ class CustomerDirectoryManager:
         base_path: Root directory for all customer folders
         """
         self.base_path = Path(base_path)
+        # Guards filename selection when licenses are saved from several threads
+        self._name_lock = threading.Lock()
+        self._reserved_paths = set()
         
+    @tracing.traced('directory.create')
     def create_customer_structure(self, customer_name: str, customer_id: str) -> Path:
         """
         Creates the directory structure for a customer:
@@ -51,6 +66,36 @@ class CustomerDirectoryManager:
         
         return customer_path if customer_path.exists() else None
     
+    @tracing.traced('license.save')
+    def save_license(self, customer_name: str, customer_id: str,
+                     license_data: Union[str, bytes], license_system: str = None) -> Path:
+        """
+        Save a license into the customer's current month directory
+        The file is named license_YYYYMMDD_HHMMSS<ext> and written atomically;
+        a numeric suffix is added if that name is already taken.
+        Returns the path of the saved license file
+        """
+        path = self.create_customer_structure(customer_name, customer_id)
+        extension = LICENSE_EXTENSIONS.get(license_system, '.lic')
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        with self._name_lock:
+            license_path = path / f"license_{timestamp}{extension}"
+            counter = 1
+            while license_path.exists() or license_path in self._reserved_paths:
+                license_path = path / f"license_{timestamp}_{counter}{extension}"
+                counter += 1
+            self._reserved_paths.add(license_path)
+        
+        try:
+            with tracing.span('file.write', path=str(license_path), bytes=len(license_data)):
+                atomic_write(license_path, license_data)
+        finally:
+            with self._name_lock:
+                self._reserved_paths.discard(license_path)
+        
+        return license_path
+    
     @staticmethod
     def sanitize_name(name: str) -> str:
         """
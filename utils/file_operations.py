@@ -1,7 +1,11 @@
+import getpass
 import os
 from pathlib import Path
 import shutil
 import logging
+import socket
+import stat
+import tempfile
 
 logger = logging.getLogger(__name__)
 
@@ -82,3 +86,151 @@ def create_unique_filename(base_path, prefix="", suffix=""):
     while (path / filename).exists():
         filename = f"{prefix}{suffix}.{len(filename.split('.'))}"
     return path / filename
+
+
+def atomic_copy(src_path, dst_path):
+    """
+    Copy a file so that readers never observe a partially written destination
+    
+    The data is copied to a temporary file in the destination directory and
+    then renamed over the target, which is atomic on the same filesystem.
+    
+    Args:
+        src_path: Path of the file to copy
+        dst_path: Destination path
+        
+    Returns:
+        Path object of the destination file
+    """
+    dst = Path(dst_path)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent)
+    os.close(fd)
+    try:
+        shutil.copy2(src_path, tmp_name)
+        os.replace(tmp_name, dst)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return dst
+
+
+def _current_umask():
+    # Linux reports the umask in /proc; elsewhere it can only be read by
+    # setting it, which briefly affects other threads
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    mask = os.umask(0o077)
+    os.umask(mask)
+    return mask
+
+def atomic_write(file_path, content, sha256=None, mode=None):
+    """
+    Write content to a file via a temporary file and rename
+    
+    Args:
+        file_path: Path to the file
+        content: str or bytes content to write
+        sha256: Expected SHA-256 hex digest; the temporary file is read back and
+                checked before the rename, so a bad copy never replaces the file
+        mode: Permissions for the new file (e.g. 0o644); by default an existing
+              file keeps its permissions and a new one gets the usual umask ones
+        
+    Returns:
+        Path object of the written file
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        if isinstance(content, str):
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+        else:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+        if sha256 is not None:
+            import hashlib
+            with open(tmp_name, 'rb') as f:
+                written = hashlib.sha256(f.read()).hexdigest()
+            if written != sha256:
+                raise IOError(f"Checksum mismatch writing {path}: expected {sha256}, got {written}")
+        if mode is None:
+            # mkstemp creates owner-only files; give the result the mode a
+            # plain open() would have
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_current_umask()
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return path
+
+def user_runtime_dir():
+    """
+    Per-user directory for local sockets: $XDG_RUNTIME_DIR, or a
+    license_manager-<uid> directory in the temp dir (see ensure_private_dir)
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir)
+    user = os.getuid() if hasattr(os, 'getuid') else getpass.getuser()
+    return Path(tempfile.gettempdir()) / f'license_manager-{user}'
+
+def ensure_private_dir(path):
+    """
+    Create a directory only the current user can use, or check an existing one
+    
+    Raises:
+        PermissionError: If the directory belongs to someone else or others can write to it
+    """
+    path = Path(path)
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, 'getuid'):
+        return
+    info = path.stat()
+    if info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise PermissionError(f"{path} is not a private directory of the current user")
+
+def owned_by_current_user(path):
+    """Whether a file (e.g. a server socket) belongs to this user - anyone can bind in a shared directory"""
+    if not hasattr(os, 'getuid'):
+        return True
+    return Path(path).stat().st_uid == os.getuid()
+
+def remove_stale_socket(socket_path):
+    """
+    Prepare a Unix socket path for a server to bind
+    
+    A leftover socket file nobody is listening on is removed.
+    
+    Args:
+        socket_path: Path of the Unix domain socket
+    
+    Raises:
+        RuntimeError: If another server is already listening on the socket
+    """
+    path = Path(socket_path)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()
+        logger.info(f"Removed stale socket {path}")
+    else:
+        raise RuntimeError(f"A server is already listening on {path}")
+    finally:
+        probe.close()
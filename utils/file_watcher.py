@@ -0,0 +1,178 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Editors often save by writing a temp file and renaming it over the original,
+# so the parent directory is watched and events are filtered by file name
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_MODIFY
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+def _load_libc():
+    """Return libc with inotify support, or None on platforms without it"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError if missing
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class FileWatcher:
+    """
+    Calls callback(changed_paths) from a background thread when watched files change
+
+    Uses inotify on Linux, so changes are seen within milliseconds; elsewhere
+    (or if inotify can't be set up) the files' mtime and size are polled.
+    Bursts of events (a save is often several writes) are coalesced into one
+    callback.
+    """
+
+    def __init__(self, paths: Iterable[Path], callback: Callable[[Set[Path]], None],
+                 poll_interval: float = 1.0, debounce: float = 0.02):
+        """
+        Args:
+            paths: Files to watch (they need not exist yet, but their directories should)
+            callback: Called with the set of changed paths
+            poll_interval: Seconds between checks when polling
+            debounce: Seconds to wait for further events before calling back
+        """
+        self.paths = {Path(path).resolve() for path in paths}
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.backend: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_r = self._wake_w = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        inotify_fd = self._setup_inotify()
+        if inotify_fd is not None:
+            self.backend = 'inotify'
+            target, args = self._run_inotify, (inotify_fd,)
+        else:
+            self.backend = 'polling'
+            target, args = self._run_polling, ()
+        self._thread = threading.Thread(target=target, args=args, name='file-watcher', daemon=True)
+        self._thread.start()
+        logger.debug(f"Watching {len(self.paths)} file(s) using {self.backend}")
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop_event.set()
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'x')
+        thread.join()
+
+    def _notify(self, changed: Set[Path]) -> None:
+        try:
+            self.callback(changed)
+        except Exception as e:
+            logger.error(f"File watcher callback failed: {e}")
+
+    # inotify backend
+
+    def _setup_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"inotify unavailable ({os.strerror(ctypes.get_errno())}), polling instead")
+            return None
+        self._directories: Dict[int, Path] = {}
+        for directory in {path.parent for path in self.paths}:
+            wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), WATCH_MASK)
+            if wd < 0:
+                logger.warning(f"Cannot watch {directory} ({os.strerror(ctypes.get_errno())}), polling instead")
+                os.close(fd)
+                return None
+            self._directories[wd] = directory
+        self._wake_r, self._wake_w = os.pipe()
+        return fd
+
+    def _read_events(self, fd: int) -> Set[Path]:
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                directory = self._directories.get(wd)
+                if directory is not None and name:
+                    path = directory / os.fsdecode(name)
+                    if path in self.paths:
+                        changed.add(path)
+
+    def _run_inotify(self, fd: int) -> None:
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([fd, self._wake_r], [], [])
+                if self._wake_r in readable:
+                    break
+                changed = self._read_events(fd)
+                if not changed:
+                    continue
+                # Let the rest of a multi-write save arrive, then report once
+                time.sleep(self.debounce)
+                changed |= self._read_events(fd)
+                self._notify(changed)
+        finally:
+            os.close(fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
+
+    # Polling backend
+
+    def _stamps(self) -> Dict[Path, Optional[Tuple[int, int]]]:
+        stamps = {}
+        for path in self.paths:
+            try:
+                stat = path.stat()
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stamps[path] = None
+        return stamps
+
+    def _run_polling(self) -> None:
+        previous = self._stamps()
+        while not self._stop_event.wait(self.poll_interval):
+            current = self._stamps()
+            changed = {path for path in self.paths if current[path] != previous[path]}
+            previous = current
+            if changed:
+                self._notify(changed)
@@ -0,0 +1,92 @@
+import bisect
+import math
+import threading
+from typing import Dict, List
+
+def log_buckets(min_seconds: float = 1e-6, max_seconds: float = 10.0) -> List[float]:
+    """Log-spaced bucket bounds, 1-2-5 per decade, from min_seconds up to max_seconds"""
+    bounds = []
+    decade = min_seconds
+    while decade <= max_seconds:
+        for step in (1, 2, 5):
+            bound = decade * step
+            if bound <= max_seconds:
+                bounds.append(bound)
+        decade *= 10
+    return bounds
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with log-spaced buckets (1-2-5 per decade)
+
+    Recording is O(log buckets) and memory is constant, so it can stay on for
+    long load runs. Percentiles are reported as the upper bound of the bucket
+    they fall in.
+    """
+
+    def __init__(self, min_seconds: float = 1e-6, max_seconds: float = 10.0):
+        self.bounds: List[float] = log_buckets(min_seconds, max_seconds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record one observation"""
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram with the same buckets into this one"""
+        with self._lock:
+            for index, count in enumerate(other.counts):
+                self.counts[index] += count
+            self.count += other.count
+            self.total += other.total
+            self.max = max(self.max, other.max)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given fraction of observations,
+        capped at the largest observation"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * fraction))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and percentiles in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p90_ms': self.percentile(0.90) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'p999_ms': self.percentile(0.999) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+    def render(self, width: int = 50) -> str:
+        """Text rendering of the non-empty buckets"""
+        if not self.count:
+            return "  (no observations)"
+        lines = []
+        peak = max(self.counts)
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            label = (f"<= {self.bounds[index] * 1000:.3f} ms" if index < len(self.bounds)
+                     else f" > {self.bounds[-1] * 1000:.3f} ms")
+            bar = '#' * max(1, round(count / peak * width))
+            lines.append(f"  {label:>16} {count:>9} {bar}")
+        return "\n".join(lines)
@@ -4,9 +4,14 @@ import subprocess
 import re
 import logging
 from typing import Dict, Optional
+from utils import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
+IDENTIFY_SECONDS = metrics.histogram('host_identifier_seconds', 'Time to collect host identifiers')
+IDENTIFIER_MISSING_TOTAL = metrics.counter('host_identifier_missing_total',
+                                           'Host identifiers that could not be read', ['identifier'])
+
 class HostIdentifier:
     @staticmethod
     def get_mac_address() -> Optional[str]:
@@ -63,8 +68,14 @@ class HostIdentifier:
             return None
 
     @classmethod
+    @tracing.traced('host.identify')
     def get_host_identifiers(cls) -> Dict[str, str]:
         """Get all available host identifiers"""
+        with IDENTIFY_SECONDS.time():
+            return cls._collect_identifiers()
+
+    @classmethod
+    def _collect_identifiers(cls) -> Dict[str, str]:
         identifiers = {
             "hostname": platform.node(),
             "os": platform.system(),
@@ -72,16 +83,13 @@ class HostIdentifier:
             "machine_id": str(uuid.getnode()),
         }
 
-        mac_address = cls.get_mac_address()
-        if mac_address:
-            identifiers["mac_address"] = mac_address
-
-        disk_serial = cls.get_disk_serial()
-        if disk_serial:
-            identifiers["disk_serial"] = disk_serial
-
-        cpu_info = cls.get_cpu_info()
-        if cpu_info:
-            identifiers["cpu_id"] = cpu_info
+        for key, getter in (("mac_address", cls.get_mac_address),
+                            ("disk_serial", cls.get_disk_serial),
+                            ("cpu_id", cls.get_cpu_info)):
+            value = getter()
+            if value:
+                identifiers[key] = value
+            else:
+                IDENTIFIER_MISSING_TOTAL.labels(key).inc()
 
         return identifiers
@@ -1,45 +1,162 @@
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
+import os
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
-def setup_logging(log_dir: Path = Path("logs"), 
-                 log_level: int = logging.INFO) -> None:
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied extras
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line (extras passed via extra={} are included)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback out of the message so JSON output has it separately"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args and exc_info now - they may not be picklable/valid on the listener thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes 1 in every `every` records at or below `level` from each call site
+
+    High-frequency debug logging (per license, per request) would otherwise
+    flood the queue and the log file. The first record from a call site always
+    passes; passed records carry a 'sampled' attribute with the rate.
+    """
+
+    def __init__(self, every: int, level: int = logging.DEBUG):
+        super().__init__()
+        self.every = max(1, every)
+        self.level = level
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(site, 0)
+            self._counts[site] = count + 1
+        if count % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+def setup_logging(log_file: Optional[Path] = None,
+                 log_level: int = logging.INFO,
+                 console: bool = True,
+                 json_file: bool = True,
+                 debug_sample_every: int = None,
+                 max_bytes: int = 10*1024*1024,
+                 backup_count: int = 5) -> logging.handlers.QueueListener:
     """Configure application logging
-    
+
+    Log calls only put the record on an in-memory queue; a background listener
+    thread does the formatting, file writes and rotation, so callers (e.g. the
+    signing hot path) never wait on the log disk. Safe to call more than once:
+    later calls return the running listener.
+
     Args:
-        log_dir: Directory for log files
+        log_file: Log file path (rotated at max_bytes); None logs to the console only
         log_level: Logging level (default: INFO)
+        console: Also log to stderr
+        json_file: Write the log file as JSON lines (default) instead of text
+        debug_sample_every: Keep 1 in N DEBUG records per call site
+                            (default: $LICENSE_LOG_DEBUG_SAMPLE or 1, i.e. keep all)
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated log files to keep
+
+    Returns:
+        The QueueListener (stopped automatically at exit)
     """
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
-    
-    # File handler with rotation
-    log_file = log_dir / f"app_{datetime.now():%Y%m%d}.log"
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file,
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    handlers = []
+    if log_file is not None:
+        log_file = Path(log_file)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        # File handler with rotation (runs on the listener thread)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter() if json_file else logging.Formatter(TEXT_FORMAT))
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    # Records are handed over through an unbounded queue
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    if debug_sample_every is None:
+        debug_sample_every = int(os.environ.get('LICENSE_LOG_DEBUG_SAMPLE', '1'))
+    if debug_sample_every > 1:
+        queue_handler.addFilter(SamplingFilter(debug_sample_every))
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
+    root_logger.addHandler(queue_handler)
+    _queue_handler = queue_handler
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
     # Log startup information
-    logging.info("Logging initialized")
-    logging.info(f"Log file: {log_file}") 
\ No newline at end of file
+    logging.getLogger(__name__).debug(f"Logging initialized (file: {log_file})")
+    return _listener
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
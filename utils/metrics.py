@@ -0,0 +1,315 @@
+"""
+Lightweight in-process metrics: counters, gauges and histograms
+
+Metrics are declared at module level next to the code they measure and are
+exported in the Prometheus text format, either over HTTP on a local port or
+written to a file (e.g. for the node_exporter textfile collector).
+
+Recording is disabled unless LICENSE_METRICS=1 is set or enable()/configure()
+is called; while disabled every inc/set/observe returns immediately and
+time() hands back a shared no-op context manager, so instrumented hot paths
+pay one attribute check.
+
+Example:
+    SIGN_SECONDS = metrics.histogram('license_sign_seconds', 'Time to sign a license', ['format'])
+
+    with SIGN_SECONDS.labels('json').time():
+        ...
+"""
+import atexit
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.histogram import log_buckets
+
+logger = logging.getLogger(__name__)
+
+# 100 us .. 10 s in 1-2-5 steps - covers SQLite lookups up to 4096-bit signing batches
+DEFAULT_BUCKETS: Tuple[float, ...] = tuple(float(f"{bound:.3g}") for bound in log_buckets(1e-4, 10.0))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NULL_TIMER = nullcontext()
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _Metric:
+    """Base for a metric family: holds one child per label value combination"""
+    type = 'untyped'
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values) -> '_Metric':
+        """Child metric for the given label values (positional, in labelnames order)"""
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self) -> '_Metric':
+        return type(self)(self._registry, self.name, self.documentation)
+
+    def _samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, extra label, value) for one child"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+        children = list(self._children.items()) if self.labelnames else [((), self)]
+        for values, child in children:
+            for suffix, extra, value in child._samples():
+                labels = _format_labels(self.labelnames, values, extra)
+                lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing count (name it with a _total suffix)"""
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def _samples(self):
+        yield '', '', self.value
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at export time"""
+    type = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        if self._registry.enabled:
+            self.value = value
+
+    def inc(self, amount: float = 1):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from function() whenever metrics are exported"""
+        self._function = function
+
+    def track_inprogress(self):
+        """Context manager counting the callers currently inside the block"""
+        if not self._registry.enabled:
+            return _NULL_TIMER
+        return self._inprogress()
+
+    @contextmanager
+    def _inprogress(self):
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+    def _samples(self):
+        value = self.value
+        if self._function is not None:
+            try:
+                value = self._function()
+            except Exception as e:
+                logger.warning(f"Metric {self.name} callback failed: {e}")
+        yield '', '', value
+
+class Histogram(_Metric):
+    """Distribution of observations (usually seconds) over fixed buckets"""
+    type = 'histogram'
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+
+    def _new_child(self):
+        return Histogram(self._registry, self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float):
+        if not self._registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager observing the elapsed seconds of the block"""
+        if not self._registry.enabled:
+            return _NULL_TIMER
+        return self._timer()
+
+    @contextmanager
+    def _timer(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def _samples(self):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            yield '_bucket', f'le="{_format_value(bound)}"', cumulative
+        yield '_sum', '', total
+        yield '_count', '', cumulative
+
+class MetricsRegistry:
+    """Named collection of metrics that renders them as Prometheus text"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(self, name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: Path) -> Path:
+        """Write the current metrics to a file (atomically, so scrapers never see a partial file)"""
+        from utils.file_operations import atomic_write
+        return atomic_write(path, self.render())
+
+REGISTRY = MetricsRegistry(enabled=os.environ.get('LICENSE_METRICS', '') == '1')
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, documentation, labelnames)
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.gauge(name, documentation, labelnames)
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+def enable(enabled: bool = True):
+    """Turn recording on (or off) for the default registry"""
+    REGISTRY.enabled = enabled
+
+def is_enabled() -> bool:
+    return REGISTRY.enabled
+
+def start_http_server(port: int, host: str = '127.0.0.1', registry: MetricsRegistry = None):
+    """
+    Serve metrics as Prometheus text on http://host:port/metrics from a daemon thread
+
+    Returns:
+        The running ThreadingHTTPServer (call shutdown() to stop it)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"Metrics request: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+def configure(port: Optional[int] = None, textfile: Optional[Path] = None):
+    """
+    Enable metrics for a tool and set up export
+
+    Args:
+        port: Serve metrics over HTTP on this local port
+        textfile: Write metrics to this file when the process exits
+    """
+    if port is None and textfile is None:
+        return
+    enable()
+    if port is not None:
+        start_http_server(port)
+    if textfile is not None:
+        atexit.register(lambda: REGISTRY.write_textfile(Path(textfile)))
@@ -0,0 +1,92 @@
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+class StartupProfiler:
+    """
+    Records import times and named startup phases for --profile-startup
+
+    Import timing wraps builtins.__import__ and records, for every module loaded
+    for the first time, its cumulative time (including nested imports) and its
+    self time (excluding them).
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}  # name -> (cumulative, self)
+        self._original_import = None
+        self._local = threading.local()
+
+    def install_import_hook(self):
+        """Start timing imports"""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def remove_import_hook(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level:
+            try:
+                package = (globals or {}).get('__package__') or ''
+                module_name = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                pass
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # accumulated time of child imports
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if module_name not in self.imports:
+                self.imports[module_name] = (elapsed, elapsed - children)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str):
+        """Record a point in time relative to profiler creation"""
+        self.phases.append((name, time.perf_counter() - self.start_time))
+
+    def report(self, top: int = 20, stream=None):
+        """Print the startup breakdown"""
+        stream = stream or sys.stderr
+        print("\n=== Startup profile ===", file=stream)
+        print("Phases:", file=stream)
+        for name, seconds in self.phases:
+            print(f"  {name:<40} {seconds * 1000:9.1f} ms", file=stream)
+
+        print(f"\nSlowest imports (top {top} by self time):", file=stream)
+        print(f"  {'module':<48} {'self ms':>9} {'cumul ms':>9}", file=stream)
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (cumulative, self_time) in ranked[:top]:
+            print(f"  {name:<48} {self_time * 1000:9.1f} {cumulative * 1000:9.1f}", file=stream)
+        total_imports = sum(self_time for _, self_time in self.imports.values())
+        print(f"\n  {len(self.imports)} modules imported, {total_imports * 1000:.1f} ms total",
+              file=stream)
@@ -0,0 +1,246 @@
+"""
+Lightweight tracing: nested, timed spans with attributes
+
+Spans are opened as context managers around the stages of license generation
+(key loading, host probing, serialization, RSA, directory creation, file
+writes) and handed to an exporter when they end:
+
+    with tracing.span('license.sign', format='json') as span:
+        ...
+        span.set_attribute('bytes', len(payload))
+
+Tracing is off unless LICENSE_TRACE=<file> is set or configure() is called
+(main.py and the batch processor have a --trace option). The file suffix picks
+the exporter: .jsonl writes one span per line (see tools/trace_report.py for a
+breakdown), anything else writes a Chrome trace for chrome://tracing or
+https://ui.perfetto.dev. While off, span() returns a shared no-op span.
+"""
+import atexit
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Span currently open in this thread/task - the parent of the next span
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+_span_ids = itertools.count(1)
+
+class Span:
+    """One timed operation; nested spans record their parent"""
+    __slots__ = ('name', 'attributes', 'span_id', 'parent_id', 'trace_id', 'start_ns', 'end_ns',
+                 'thread_id', 'thread_name', '_token', '_tracer')
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self):
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes['error'] = f"{exc_type.__name__}: {exc}"
+        self._tracer.export(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self._tracer.wall_time(self.start_ns),
+            'duration_ms': round(self.duration_ms, 4),
+            'thread': self.thread_name,
+            'attributes': self.attributes
+        }
+
+class _NullSpan:
+    """Returned by span() while tracing is off"""
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class JsonLinesExporter:
+    """Appends each finished span to a file as one JSON object per line"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+class ChromeTraceExporter:
+    """Collects spans and writes them as a Chrome trace event file on shutdown"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        event = {
+            'name': span.name,
+            'cat': span.name.split('.')[0],
+            'ph': 'X',  # complete event: start + duration
+            'ts': span.start_ns / 1000,
+            'dur': (span.end_ns - span.start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': span.thread_id,
+            'args': span.attributes
+        }
+        with self._lock:
+            self.events.append(event)
+            self._threads[span.thread_id] = span.thread_name
+
+    def shutdown(self):
+        from utils.file_operations import atomic_write
+        with self._lock:
+            metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                         'args': {'name': name}} for tid, name in self._threads.items()]
+            trace = {'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}
+            atomic_write(self.path, json.dumps(trace, default=str))
+        logger.info(f"Wrote {len(self.events)} spans to {self.path}")
+
+class Tracer:
+    """Creates spans and forwards finished ones to the configured exporters"""
+
+    def __init__(self):
+        self.exporters = []
+        self.enabled = False
+        # perf_counter has no fixed epoch; remember the offset to report wall-clock start times
+        self._wall_offset = time.time() - time.perf_counter_ns() / 1e9
+
+    def wall_time(self, perf_ns: int) -> float:
+        return round(self._wall_offset + perf_ns / 1e9, 6)
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+        self.enabled = True
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attributes)
+
+    def export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Trace exporter failed: {e}")
+
+    def shutdown(self):
+        """Flush and close all exporters (registered with atexit by configure())"""
+        exporters, self.exporters = self.exporters, []
+        self.enabled = False
+        for exporter in exporters:
+            try:
+                exporter.shutdown()
+            except Exception as e:
+                logger.warning(f"Trace exporter shutdown failed: {e}")
+
+TRACER = Tracer()
+
+def span(name: str, **attributes):
+    """Context manager timing a named operation; attributes are stored with it"""
+    return TRACER.span(name, **attributes)
+
+def traced(name: str = None):
+    """Decorator opening a span around each call of the function"""
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+            with TRACER.span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def is_enabled() -> bool:
+    return TRACER.enabled
+
+def configure(path: Optional[str], trace_format: str = None) -> bool:
+    """
+    Turn tracing on, writing spans to path
+
+    Args:
+        path: Output file; nothing happens when empty
+        trace_format: 'jsonl' or 'chrome'; by default .jsonl files get JSON lines
+                      and anything else a Chrome trace
+
+    Returns:
+        True if tracing was enabled
+    """
+    if not path:
+        return False
+    path = Path(path)
+    if trace_format is None:
+        trace_format = 'jsonl' if path.suffix == '.jsonl' else 'chrome'
+    if trace_format == 'jsonl':
+        TRACER.add_exporter(JsonLinesExporter(path))
+    elif trace_format == 'chrome':
+        TRACER.add_exporter(ChromeTraceExporter(path))
+    else:
+        raise ValueError(f"Unknown trace format: {trace_format}")
+    atexit.register(TRACER.shutdown)
+    logger.info(f"Tracing enabled ({trace_format}): {path}")
+    return True
+
+configure(os.environ.get('LICENSE_TRACE'), os.environ.get('LICENSE_TRACE_FORMAT'))
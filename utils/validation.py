@@ -2,9 +2,9 @@ import re
 from datetime import date, datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
-import json
 from encryption.key_management import KeyManager
 from encryption.license_signing import LicenseSigner
+from encryption.license_format import is_binary_license
 from utils.host_identifier import HostIdentifier
 
 class LicenseValidator:
@@ -62,30 +62,53 @@ class LicenseValidator:
         return errors
 
 class LicenseVerifier:
+    @staticmethod
+    def detect_format(license_path: str) -> str:
+        """Return 'binary' or 'json' for a license file"""
+        try:
+            with open(license_path, 'rb') as f:
+                return 'binary' if is_binary_license(f.read(4)) else 'json'
+        except OSError:
+            return 'unknown'
+
+    @staticmethod
+    def check_license_data(data: Dict, host_info: Optional[Dict] = None) -> Tuple[bool, str]:
+        """Check the expiration and host binding of already signature-verified license data
+
+        Args:
+            data: Verified license data
+            host_info: Current host identifiers (collected if not given)
+        """
+        # Verify expiration
+        exp_date = datetime.fromisoformat(data['license']['expiration_date'])
+        if exp_date < datetime.now():
+            return False, "License has expired"
+
+        # Verify host binding if applicable (generators store the license kind in 'type')
+        if data.get('type') == 'node_locked':
+            current_host = host_info if host_info is not None else HostIdentifier.get_host_identifiers()
+            if not all(current_host.get(k) == v for k, v in data.get('host', {}).items()):
+                return False, "License is not valid for this machine"
+
+        return True, "License is valid"
+
     @staticmethod
     def verify_license_file(license_path: str, public_key_path: str) -> Tuple[bool, str, Optional[Dict]]:
-        """Verify a license file's signature and return its contents"""
+        """Verify a license file's signature and return its contents
+        JSON and compact binary licenses are detected automatically
+        """
         try:
-            with open(license_path, 'r') as f:
-                license_data = json.loads(f.read())
+            with open(license_path, 'rb') as f:
+                raw = f.read()
 
-            # Verify signature
+            # Verify signature (works on the stored payload - no re-serialization)
             signer = LicenseSigner(KeyManager(Path(public_key_path).parent))
-            if not signer.verify_license(json.dumps(license_data)):
+            data = signer.verify_license_bytes(raw)
+            if data is None:
                 return False, "Invalid license signature", None
 
-            # Verify expiration
-            exp_date = datetime.fromisoformat(license_data['data']['license']['expiration_date'])
-            if exp_date < datetime.now():
-                return False, "License has expired", license_data['data']
-
-            # Verify host binding if applicable
-            if license_data['data']['license']['type'] == 'node_locked':
-                current_host = HostIdentifier.get_host_identifiers()
-                if not all(current_host.get(k) == v for k, v in license_data['data']['host'].items()):
-                    return False, "License is not valid for this machine", license_data['data']
-
-            return True, "License is valid", license_data['data']
+            valid, message = LicenseVerifier.check_license_data(data)
+            return valid, message, data
 
         except Exception as e:
             return False, f"Error verifying license: {str(e)}", None
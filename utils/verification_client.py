@@ -0,0 +1,98 @@
+"""Client for the local license verification server (tools/verification_server.py)
+
+The protocol is JSON lines over a Unix domain socket: one request object per
+line and one response per line, in request order. Requests:
+
+    {"id": 1, "path": "/opt/app/license.lic"}
+    {"id": 2, "license": "<license file text>"}
+    {"id": 3, "license_b64": "<base64 of a binary license>"}
+    {"id": 4, "batch": [{"path": ...}, {"license": ...}]}
+    {"id": 5, "op": "stats"}
+
+Add "include_data": true to get the verified license data back. This module
+doesn't need cryptography, so launchers can import it cheaply.
+"""
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from utils.file_operations import owned_by_current_user, user_runtime_dir
+
+def default_verification_socket() -> Path:
+    """Socket used by the verification server (LICENSE_VERIFY_SOCKET overrides the default)
+
+    Like the signing daemon's, the default is in the per-user runtime directory
+    so another local user can't answer in the server's place.
+    """
+    return Path(os.environ.get('LICENSE_VERIFY_SOCKET') or user_runtime_dir() / 'license_verifier.sock')
+
+class VerificationClient:
+    """Synchronous, thread-safe client holding one connection to the verification server"""
+
+    def __init__(self, socket_path: Path = None, timeout: float = 5.0):
+        self.socket_path = Path(socket_path) if socket_path else default_verification_socket()
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _connect(self):
+        if not owned_by_current_user(self.socket_path):
+            raise PermissionError(f"Verification socket {self.socket_path} belongs to another user")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(str(self.socket_path))
+        self._sock = sock
+        self._file = sock.makefile('rb')
+
+    def request(self, request: Dict) -> Dict:
+        """Send one request and return its response"""
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            self._next_id += 1
+            request = dict(request, id=self._next_id)
+            try:
+                self._sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+                line = self._file.readline()
+            except OSError:
+                self._close()
+                raise
+            if not line:
+                self._close()
+                raise ConnectionError("Verification server closed the connection")
+            return json.loads(line)
+
+    def verify(self, path: str = None, license: str = None, include_data: bool = False) -> Dict:
+        """Verify a license file by path, or license text; returns {'valid', 'message'[, 'data']}"""
+        request = {'path': str(path)} if path is not None else {'license': license}
+        if include_data:
+            request['include_data'] = True
+        return self.request(request)
+
+    def verify_batch(self, requests: List[Dict]) -> List[Dict]:
+        """Verify several licenses in one round trip"""
+        return self.request({'batch': requests})['results']
+
+    def stats(self) -> Dict:
+        """Server counters and latency percentiles"""
+        return self.request({'op': 'stats'})
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def close(self):
+        """Close the connection"""
+        with self._lock:
+            self._close()
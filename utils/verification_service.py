@@ -0,0 +1,153 @@
+import base64
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from core.revocation_manager import RevocationManager
+from encryption.key_management import KeyManager
+from encryption.license_signing import LicenseSigner
+from utils.host_identifier import HostIdentifier
+from utils.validation import LicenseVerifier
+
+logger = logging.getLogger(__name__)
+
+def license_id_for(data: Dict, license_path: Optional[str] = None) -> Optional[str]:
+    """
+    ID a license is revoked under: its 'license_id' field if it has one,
+    otherwise the license file name without extension (e.g. license_20241205_122730)
+    """
+    license_id = data.get('license_id') or data.get('license', {}).get('license_id')
+    if license_id:
+        return license_id
+    return Path(license_path).stem if license_path else None
+
+class LicenseVerificationService:
+    """
+    Verifies licenses with everything expensive kept warm: the parsed public keyring,
+    the revocation set and this host's identifiers.
+
+    Signature results are cached by a hash of the license bytes, so re-verifying
+    an unchanged license only costs a hash, a dictionary lookup and the
+    expiration/host/revocation checks. Used by tools/verification_server.py.
+    """
+
+    def __init__(self, key_dir: Path, revocation_db: Optional[Path] = None,
+                 cache_size: int = 4096, revocation_refresh: float = 1.0):
+        """
+        Args:
+            key_dir: Directory containing public_key.pem
+            revocation_db: Optional revocation database to check licenses against
+            cache_size: Number of license signature results to keep
+            revocation_refresh: Minimum seconds between checks for revocation changes
+        """
+        self.signer = LicenseSigner(KeyManager(Path(key_dir)))
+        self.revocation_manager = RevocationManager(revocation_db) if revocation_db else None
+        self.cache_size = cache_size
+        self.revocation_refresh = revocation_refresh
+        self.host_info: Optional[Dict] = None
+        self.requests = 0
+        self.cache_hits = 0
+
+        self._cache: OrderedDict = OrderedDict()  # digest -> verified data, or None if invalid
+        self._lock = threading.Lock()
+        self._revoked: Set[str] = set()
+        self._revocation_mtime = None
+        self._revocation_checked = 0.0
+
+    def warm_up(self):
+        """Load the public keyring, host identifiers and revocation set"""
+        self.signer._get_public_key()
+        self.signer._get_keyring().load()
+        self.host_info = HostIdentifier.get_host_identifiers()
+        self._refresh_revocations(force=True)
+        logger.info(f"Verification service ready ({len(self._revoked)} revoked licenses)")
+
+    def _refresh_revocations(self, force: bool = False):
+        """Reload the revoked IDs when the revocation database has changed"""
+        if self.revocation_manager is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._revocation_checked < self.revocation_refresh:
+            return
+        self._revocation_checked = now
+        try:
+            mtime = Path(self.revocation_manager.db_path).stat().st_mtime
+        except OSError:
+            return
+        if force or mtime != self._revocation_mtime:
+            self._revoked = self.revocation_manager.get_revoked_ids()
+            self._revocation_mtime = mtime
+
+    def _verified_data(self, raw: bytes) -> Optional[Dict]:
+        """Signature-verified license data, from the cache when possible"""
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        with self._lock:
+            self.requests += 1
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                self.cache_hits += 1
+                return self._cache[digest]
+
+        data = self.signer.verify_license_bytes(raw)
+
+        with self._lock:
+            self._cache[digest] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def verify_bytes(self, raw: bytes, license_path: Optional[str] = None,
+                     include_data: bool = False) -> Dict:
+        """
+        Verify raw license contents
+
+        Returns:
+            Dict with 'valid' and 'message' (and 'data' if requested and verified)
+        """
+        if self.host_info is None:
+            self.warm_up()
+        data = self._verified_data(raw)
+        if data is None:
+            return {'valid': False, 'message': "Invalid license signature"}
+
+        try:
+            valid, message = LicenseVerifier.check_license_data(data, self.host_info)
+            if valid and self.revocation_manager is not None:
+                self._refresh_revocations()
+                if license_id_for(data, license_path) in self._revoked:
+                    valid, message = False, "License has been revoked"
+        except Exception as e:
+            valid, message = False, f"Error verifying license: {str(e)}"
+
+        result = {'valid': valid, 'message': message}
+        if include_data:
+            result['data'] = data
+        return result
+
+    def verify_request(self, request: Dict) -> Dict:
+        """
+        Verify one request: {'path': ...}, {'license': <text>} or {'license_b64': <base64>}
+        Set 'include_data' to get the license data back.
+        """
+        include_data = bool(request.get('include_data'))
+        try:
+            if 'path' in request:
+                with open(request['path'], 'rb') as f:
+                    raw = f.read()
+                return self.verify_bytes(raw, request['path'], include_data)
+            if 'license' in request:
+                return self.verify_bytes(request['license'].encode('utf-8'), include_data=include_data)
+            if 'license_b64' in request:
+                return self.verify_bytes(base64.b64decode(request['license_b64']),
+                                         include_data=include_data)
+            return {'valid': False, 'message': "Request needs 'path', 'license' or 'license_b64'"}
+        except Exception as e:
+            return {'valid': False, 'message': f"Error verifying license: {str(e)}"}
+
+    def verify_many(self, requests: List[Dict]) -> List[Dict]:
+        """Verify a batch of requests"""
+        return [self.verify_request(request) for request in requests]